@@ -1 +1,2 @@
-from .ai_engine import AIEngine
\ No newline at end of file
+from .ai_engine import AIEngine, register_scorer
+from .registry import ModelRegistry
@@ -1,10 +1,47 @@
 import random
+import logging
+import threading
+
+logger = logging.getLogger("ghostnet.ai")
+
+# Fonctions de scoring par type de modèle (metadata["type"]) : scorer(modèle, événement) -> score 0-100
+SCORERS = {}
+
+
+def register_scorer(model_type, scorer):
+    """Associe une fonction de scoring à un type de modèle du registre."""
+    SCORERS[model_type] = scorer
+    return scorer
+
 
 class AIEngine:
     """Moteur d'IA pour l'analyse avancée et le scoring des événements."""
 
-    def __init__(self):
-        pass
+    def __init__(self, registry=None, model_name=None, online_model=None, learn_batch=256,
+                 checkpoint=None, checkpoint_every=100000):
+        # Registre de modèles (ai_engine.registry.ModelRegistry) et modèle utilisé pour le scoring
+        self.registry = registry
+        self.model_name = model_name
+        # Modèle appris en continu sur le flux (ai_engine.hst.HalfSpaceTrees), par mini-lots
+        self.online_model = online_model
+        self.learn_batch = learn_batch
+        # Point de contrôle périodique : checkpoint(modèle) tous les checkpoint_every événements appris
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.learned = 0
+        self._last_checkpoint = 0
+        self._pending = []
+        self._learn_lock = threading.Lock()
+
+    def current_model(self):
+        """Version courante du modèle de scoring (chargée au premier appel), ou None."""
+        if self.registry is None or not self.model_name:
+            return None
+        try:
+            return self.registry.get(self.model_name)
+        except Exception as e:
+            logger.error("Modèle %s indisponible : %s", self.model_name, e)
+            return None
 
     def score_event(self, event):
         """
@@ -14,8 +51,19 @@ class AIEngine:
         Returns:
             dict: Résultat avec score et niveau de risque.
         """
-        # Exemple simple : score aléatoire
-        score = random.randint(1, 100)
+        # La référence au modèle est prise une fois : un remplacement à chaud
+        # pendant le scoring n'affecte pas cet événement
+        model = self.current_model()
+        scorer = SCORERS.get(model.metadata.get("type")) if model is not None else None
+        online = self.online_model
+        features = online.features(event) if online is not None else None
+        if scorer is not None:
+            score = int(round(scorer(model, event)))
+        elif online is not None and online.ready:
+            score = int(round(float(online.risk(features)[0])))
+        else:
+            # Exemple simple : score aléatoire
+            score = random.randint(1, 100)
         if score > 80:
             niveau = "critique"
         elif score > 50:
@@ -24,7 +72,30 @@ class AIEngine:
             niveau = "moyen"
         else:
             niveau = "faible"
-        return {"event": event, "score": score, "niveau": niveau}
+        result = {"event": event, "score": score, "niveau": niveau}
+        if model is not None and scorer is not None:
+            result["model"] = {"name": model.name, "version": model.version}
+        if features is not None:
+            self._learn(features)
+        return result
+
+    def _learn(self, features):
+        """Accumule l'événement et entraîne le modèle en ligne par mini-lots."""
+        with self._learn_lock:
+            self._pending.append(features)
+            if len(self._pending) < self.learn_batch:
+                return
+            batch, self._pending = self._pending, []
+            self.online_model.learn(batch)
+            self.learned += len(batch)
+            if self.checkpoint is None or self.learned - self._last_checkpoint < self.checkpoint_every:
+                return
+            self._last_checkpoint = self.learned
+            # Sous le verrou : l'état sauvegardé n'est pas modifié pendant l'écriture
+            try:
+                self.checkpoint(self.online_model)
+            except Exception:
+                logger.exception("Échec du point de contrôle du modèle en ligne")
 
     def correlate_events(self, events):
         """
@@ -34,9 +105,9 @@ class AIEngine:
         Returns:
             dict: Résultat de la corrélation.
         """
-        # Exemple : si plus de 3 événements du même type, alerte corrélée
+        # Exemple : si plus de 3 événements du même type, alerte corrélée
         types = [e.get("type") for e in events]
         for t in set(types):
             if types.count(t) > 3:
                 return {"correlated": True, "type": t, "message": "Alerte corrélée détectée"}
-        return {"correlated": False}
\ No newline at end of file
+        return {"correlated": False}
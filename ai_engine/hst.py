@@ -0,0 +1,216 @@
+import string
+
+import numpy as np
+
+MODEL_TYPE = "half_space_trees"
+
+_PUNCTUATION = set(string.punctuation)
+_SHELL = set("/\\'\";|&$`<>%(){}")
+N_FEATURES = 8
+
+
+def event_features(event):
+    """Projette un événement sur N_FEATURES caractéristiques numériques dans [0, 1]."""
+    text = str(event.get("log", "")) if isinstance(event, dict) else str(event)
+    n = len(text)
+    if not n:
+        return np.zeros(N_FEATURES)
+    digits = alpha = upper = spaces = punct = shell = other = 0
+    for c in text:
+        if c.isdigit():
+            digits += 1
+        elif c.isalpha():
+            alpha += 1
+            upper += c.isupper()
+        elif c.isspace():
+            spaces += 1
+        if c in _PUNCTUATION:
+            punct += 1
+        if c in _SHELL:
+            shell += 1
+        if ord(c) > 127:
+            other += 1
+    return np.array([n / (n + 200.0), digits / n, alpha / n, upper / max(1, alpha), spaces / n,
+                     punct / n, shell / n, other / n])
+
+
+def flat_layout(feature, threshold):
+    """Disposition à plat de tous les arbres, indexée par nœud global (arbre * n_nœuds + nœud).
+
+    Retourne (dimension, seuil, enfant gauche) par nœud global ; les feuilles
+    ont des valeurs neutres et ne sont jamais descendues. Le parcours n'a ainsi
+    besoin que de lectures à plat (np.take), bien moins coûteuses que
+    l'indexation avancée 2D : c'est ce qui compte pour un événement isolé.
+    """
+    n_trees, n_internal = feature.shape
+    n_nodes = 2 * n_internal + 1
+    base = (np.arange(n_trees) * n_nodes)[:, None]
+    dims = np.zeros((n_trees, n_nodes), dtype=np.int64)
+    cuts = np.full((n_trees, n_nodes), np.inf)
+    left = np.zeros((n_trees, n_nodes), dtype=np.int64)
+    dims[:, :n_internal] = feature
+    cuts[:, :n_internal] = threshold
+    # Nœuds numérotés en largeur : enfants de i en 2i+1 (gauche) et 2i+2 (droite)
+    left[:, :n_internal] = base + 2 * np.arange(n_internal) + 1
+    return dims.ravel(), cuts.ravel(), left.ravel()
+
+
+def _descend(layout, n_trees, n_nodes, depth, X):
+    """Parcourt tous les arbres pour toutes les lignes de X ; produit, niveau par niveau,
+    les nœuds globaux atteints (tableau à plat arbre-majeur de taille arbres * échantillons)."""
+    dims, cuts, left = layout
+    n, d = X.shape
+    values = X.ravel()
+    node = np.repeat(np.arange(n_trees) * n_nodes, n)
+    rows = np.tile(np.arange(n) * d, n_trees) if n > 1 else None
+    yield node
+    for _ in range(depth):
+        columns = dims.take(node)
+        if rows is not None:
+            columns += rows
+        node = left.take(node) + (values.take(columns) > cuts.take(node))
+        yield node
+
+
+def hst_score(layout, mass, depth, size_limit, X):
+    """Score de masse HST de chaque ligne de X (plus bas = plus anormal).
+
+    Pour chaque arbre, la descente s'arrête au premier nœud dont la masse de
+    référence est inférieure ou égale à ``size_limit`` (ou à la feuille) ; le
+    score est la somme sur les arbres de masse * 2^profondeur.
+    """
+    n_trees, n_nodes = mass.shape
+    flat = mass.ravel()
+    masses = np.empty((depth + 1, n_trees * len(X)))
+    for level, node in enumerate(_descend(layout, n_trees, n_nodes, depth, X)):
+        masses[level] = flat.take(node)
+    small = masses <= size_limit
+    stop = np.where(small.any(axis=0), small.argmax(axis=0), depth)
+    terminal = masses[stop, np.arange(masses.shape[1])]
+    return (terminal * np.exp2(stop)).reshape(n_trees, len(X)).sum(axis=0)
+
+
+class HalfSpaceTrees:
+    """Détection d'anomalies en flux par Half-Space Trees (Tan, Ting et Liu, 2011).
+
+    Chaque arbre partitionne l'espace [0, 1]^d en demi-espaces aléatoires fixés
+    à la création. L'apprentissage ne fait que compter les événements passant par
+    chaque nœud : les masses de la fenêtre courante deviennent la référence à la
+    fin de chaque fenêtre de ``window`` événements. La mémoire est donc fixe
+    (deux compteurs par nœud), et le score est un simple parcours vectorisé.
+    """
+
+    def __init__(self, n_features=N_FEATURES, n_trees=25, depth=10, window=250, seed=None):
+        self.n_features = n_features
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window = window
+        self.size_limit = 0.1 * window
+        self.count = 0
+        self.windows = 0
+        n_internal = 2 ** depth - 1
+        n_nodes = 2 ** (depth + 1) - 1
+        rng = np.random.default_rng(seed)
+        # Espace de travail perturbé par arbre et par dimension, puis coupes au milieu
+        # de l'intervalle courant de la dimension tirée pour chaque nœud
+        self.feature = rng.integers(0, n_features, size=(n_trees, n_internal))
+        self.threshold = np.empty((n_trees, n_internal))
+        s = rng.random((n_trees, n_features))
+        span = 2 * np.maximum(s, 1 - s)
+        low, high = s - span, s + span
+        for t in range(n_trees):
+            self._build(t, 0, low[t].copy(), high[t].copy())
+        self.reference = np.zeros((n_trees, n_nodes))
+        self.latest = np.zeros((n_trees, n_nodes))
+        self.layout = flat_layout(self.feature, self.threshold)
+
+    def _build(self, t, node, low, high):
+        if node >= self.feature.shape[1]:
+            return
+        q = self.feature[t, node]
+        middle = (low[q] + high[q]) / 2
+        self.threshold[t, node] = middle
+        saved = high[q]
+        high[q] = middle
+        self._build(t, 2 * node + 1, low, high)
+        high[q] = saved
+        saved = low[q]
+        low[q] = middle
+        self._build(t, 2 * node + 2, low, high)
+        low[q] = saved
+
+    features = staticmethod(event_features)
+
+    @property
+    def ready(self):
+        """Vrai dès qu'une fenêtre complète sert de référence."""
+        return self.windows > 0
+
+    def score(self, X):
+        """Scores de masse d'un lot (n, d) ; plus bas = plus anormal."""
+        return hst_score(self.layout, self.reference, self.depth, self.size_limit, np.atleast_2d(X))
+
+    def risk(self, X):
+        """Risque 0-100 d'un lot : 100 pour une masse nulle, 0 à partir de la masse moyenne attendue."""
+        return risk_from_scores(self.score(X), self.n_trees, self.window)
+
+    def learn(self, X):
+        """Ajoute un lot (n, d) à la fenêtre courante ; bascule la référence à chaque fenêtre pleine."""
+        X = np.atleast_2d(X)
+        n_nodes = self.latest.shape[1]
+        start = 0
+        while start < len(X):
+            take = min(len(X) - start, self.window - self.count)
+            paths = np.concatenate(list(_descend(self.layout, self.n_trees, n_nodes, self.depth,
+                                                 X[start:start + take])))
+            self.latest += np.bincount(paths, minlength=self.latest.size).reshape(self.latest.shape)
+            self.count += take
+            start += take
+            if self.count == self.window:
+                self.reference, self.latest = self.latest, self.reference
+                self.latest[:] = 0
+                self.count = 0
+                self.windows += 1
+
+    def to_tensors(self):
+        """État complet (tenseurs, métadonnées) pour un point de contrôle via ModelManager."""
+        dims, cuts, left = self.layout
+        # La disposition à plat est incluse pour que le scorer du registre l'utilise sans la recalculer
+        tensors = {"feature": self.feature, "threshold": self.threshold,
+                   "reference": self.reference, "latest": self.latest,
+                   "layout.dims": dims, "layout.cuts": cuts, "layout.left": left}
+        metadata = {"type": MODEL_TYPE, "n_features": self.n_features, "n_trees": self.n_trees,
+                    "depth": self.depth, "window": self.window, "count": self.count, "windows": self.windows}
+        return tensors, metadata
+
+    @classmethod
+    def from_tensors(cls, tensors, metadata):
+        """Restaure un modèle depuis un point de contrôle (copie : les tenseurs chargés sont en lecture seule)."""
+        model = cls.__new__(cls)
+        model.n_features = int(metadata["n_features"])
+        model.n_trees = int(metadata["n_trees"])
+        model.depth = int(metadata["depth"])
+        model.window = int(metadata["window"])
+        model.size_limit = 0.1 * model.window
+        model.count = int(metadata.get("count", 0))
+        model.windows = int(metadata.get("windows", 0))
+        model.feature = np.array(tensors["feature"], dtype=np.int64)
+        model.threshold = np.array(tensors["threshold"])
+        model.reference = np.array(tensors["reference"])
+        model.latest = np.array(tensors["latest"])
+        model.layout = flat_layout(model.feature, model.threshold)
+        return model
+
+
+def risk_from_scores(scores, n_trees, window):
+    return 100.0 * np.clip(1.0 - scores / (n_trees * window), 0.0, 1.0)
+
+
+def score_loaded_model(model, event):
+    """Scorer du registre pour un point de contrôle HST (tenseurs projetés, non modifiés)."""
+    tensors, metadata = model.tensors, model.metadata
+    window = int(metadata["window"])
+    layout = (tensors["layout.dims"], tensors["layout.cuts"], tensors["layout.left"])
+    scores = hst_score(layout, tensors["reference"], int(metadata["depth"]), 0.1 * window,
+                       event_features(event)[None, :])
+    return float(risk_from_scores(scores, int(metadata["n_trees"]), window)[0])
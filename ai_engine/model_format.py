@@ -0,0 +1,168 @@
+import os
+import json
+import struct
+
+import numpy as np
+
+# Format de stockage des modèles, compatible safetensors :
+#   [8 octets : taille N de l'en-tête, entier non signé little-endian]
+#   [N octets : en-tête JSON, complété par des espaces jusqu'à un multiple de 8]
+#   [données brutes des tenseurs, contiguës, little-endian]
+# L'en-tête associe à chaque tenseur {"dtype", "shape", "data_offsets": [début, fin]}
+# (positions relatives au début des données) ; "__metadata__" porte des chaînes libres.
+# Le chargement ne fait qu'interpréter des octets : aucun code n'est exécuté,
+# contrairement à pickle, et les tableaux sont projetés en mémoire (mmap) en lecture seule.
+
+EXTENSION = ".safetensors"
+MAX_HEADER_SIZE = 100 * 1024 * 1024
+
+DTYPES = {
+    "F64": np.dtype("<f8"), "F32": np.dtype("<f4"), "F16": np.dtype("<f2"),
+    "I64": np.dtype("<i8"), "I32": np.dtype("<i4"), "I16": np.dtype("<i2"), "I8": np.dtype("i1"),
+    "U64": np.dtype("<u8"), "U32": np.dtype("<u4"), "U16": np.dtype("<u2"), "U8": np.dtype("u1"),
+    "BOOL": np.dtype("?"),
+}
+_CODES = {dtype: code for code, dtype in DTYPES.items()}
+
+
+class ModelFormatError(ValueError):
+    """Fichier de modèle invalide ou corrompu."""
+
+
+def _dtype_code(array):
+    dtype = array.dtype.newbyteorder("<") if array.dtype.byteorder == ">" else array.dtype
+    code = _CODES.get(dtype)
+    if code is None:
+        raise ModelFormatError(f"Type de tenseur non supporté : {array.dtype}")
+    return code
+
+
+def save_model(path, tensors, metadata=None):
+    """Écrit des tableaux numériques (nom -> tableau) et des métadonnées dans ``path``.
+
+    L'écriture passe par un fichier temporaire renommé à la fin : un lecteur ne
+    voit jamais un fichier partiellement écrit. Les métadonnées doivent être
+    sérialisables en JSON ; elles sont stockées dans l'en-tête.
+    Retourne la taille du fichier écrit.
+    """
+    arrays = {}
+    header = {}
+    offset = 0
+    for name in sorted(tensors):
+        array = np.require(tensors[name], requirements="C")
+        code = _dtype_code(array)
+        array = array.astype(DTYPES[code], copy=False)
+        header[name] = {"dtype": code, "shape": list(array.shape),
+                        "data_offsets": [offset, offset + array.nbytes]}
+        arrays[name] = array
+        offset += array.nbytes
+    if metadata:
+        header["__metadata__"] = {"ghostnet": json.dumps(metadata, sort_keys=True)}
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-len(encoded) % 8)
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for name in sorted(arrays):
+            # Écriture sans copie : vue à plat du tableau contigu
+            f.write(memoryview(arrays[name].reshape(-1)).cast("B"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return 8 + len(encoded) + offset
+
+
+def read_header(path):
+    """Lit et valide l'en-tête sans charger les données.
+
+    Retourne (tenseurs, métadonnées, position du début des données).
+    Lève ModelFormatError si les positions sont incohérentes avec la taille du fichier.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) < 8:
+            raise ModelFormatError(f"Fichier de modèle tronqué : {path}")
+        (length,) = struct.unpack("<Q", prefix)
+        if length > MAX_HEADER_SIZE or 8 + length > size:
+            raise ModelFormatError(f"Taille d'en-tête invalide ({length}) : {path}")
+        try:
+            header = json.loads(f.read(length))
+        except ValueError as e:
+            raise ModelFormatError(f"En-tête JSON invalide : {e}")
+    if not isinstance(header, dict):
+        raise ModelFormatError("L'en-tête doit être un objet JSON")
+
+    raw_metadata = header.pop("__metadata__", None) or {}
+    try:
+        metadata = json.loads(raw_metadata["ghostnet"]) if "ghostnet" in raw_metadata else dict(raw_metadata)
+    except (TypeError, ValueError) as e:
+        raise ModelFormatError(f"Métadonnées invalides : {e}")
+
+    data_start = 8 + length
+    data_size = size - data_start
+    spans = []
+    for name, info in header.items():
+        try:
+            dtype = DTYPES[info["dtype"]]
+            shape = tuple(int(d) for d in info["shape"])
+            begin, end = (int(o) for o in info["data_offsets"])
+        except (KeyError, TypeError, ValueError):
+            raise ModelFormatError(f"Description du tenseur '{name}' invalide")
+        if min(shape, default=0) < 0 or not 0 <= begin <= end <= data_size:
+            raise ModelFormatError(f"Positions du tenseur '{name}' hors du fichier")
+        if end - begin != int(np.prod(shape, dtype=np.int64)) * dtype.itemsize:
+            raise ModelFormatError(f"Taille du tenseur '{name}' incohérente avec sa forme")
+        spans.append((begin, end, name))
+    spans.sort()
+    for (_, end, name), (begin, _, other) in zip(spans, spans[1:]):
+        if begin < end:
+            raise ModelFormatError(f"Les tenseurs '{name}' et '{other}' se chevauchent")
+    return header, metadata, data_start
+
+
+def load_model(path, mmap=True):
+    """Charge un modèle ; retourne (tenseurs, métadonnées).
+
+    Avec ``mmap=True`` (défaut), le fichier est projeté en mémoire en lecture
+    seule : le chargement est immédiat quelle que soit la taille du modèle, et
+    plusieurs processus qui chargent le même fichier partagent les mêmes pages
+    du cache disque. Les tableaux retournés ne sont pas modifiables.
+    """
+    header, metadata, data_start = read_header(path)
+    if mmap:
+        if os.path.getsize(path) > data_start:
+            buffer = np.memmap(path, dtype=np.uint8, mode="r", offset=data_start)
+        else:
+            buffer = np.zeros(0, dtype=np.uint8)
+    else:
+        with open(path, "rb") as f:
+            f.seek(data_start)
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        array = buffer[begin:end].view(DTYPES[info["dtype"]]).reshape(info["shape"])
+        array.flags.writeable = False
+        tensors[name] = array
+    return tensors, metadata
+
+
+def from_object(model_data):
+    """Convertit des données de modèle en tenseurs : tableau seul, ou dictionnaire de tableaux.
+
+    Les valeurs non numériques sont refusées plutôt que sérialisées par pickle.
+    """
+    if isinstance(model_data, dict):
+        items = model_data.items()
+    else:
+        items = [("model", model_data)]
+    tensors = {}
+    for name, value in items:
+        array = np.asarray(value)
+        if array.dtype == object or array.dtype.kind in "USV":
+            raise ModelFormatError(f"'{name}' n'est pas un tableau numérique")
+        tensors[str(name)] = array
+    return tensors
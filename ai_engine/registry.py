@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger("ghostnet.models")
+
+METADATA_FILE = "metadata.json"
+MODEL_FILE = "model.safetensors"
+
+
+def load_model_dir(path):
+    """Chargeur par défaut : métadonnées JSON et tenseurs projetés en mémoire (voir model_format)."""
+    with open(os.path.join(path, METADATA_FILE), "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    tensors = {}
+    model_file = os.path.join(path, MODEL_FILE)
+    if os.path.exists(model_file):
+        from .model_format import load_model
+        tensors, _ = load_model(model_file)
+    return tensors, metadata
+
+
+class LoadedModel:
+    """Version chargée d'un modèle ; immuable une fois publiée dans le registre."""
+    __slots__ = ("name", "version", "tensors", "metadata", "nbytes", "signature", "loaded_at")
+
+    def __init__(self, name, tensors, metadata, signature):
+        self.name = name
+        self.tensors = tensors
+        self.metadata = metadata
+        self.version = metadata.get("version")
+        self.nbytes = sum(getattr(t, "nbytes", 0) for t in tensors.values())
+        self.signature = signature
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """Registre des modèles chargés en mémoire, consulté par AIEngine.
+
+    Les modèles sont chargés au premier accès et conservés dans un LRU borné
+    par ``memory_budget`` (octets). Quand le ``metadata.json`` d'un modèle chargé
+    change (import ou mise à jour par ModelManager), la nouvelle version est
+    chargée à côté de l'ancienne puis publiée d'un bloc : les analyses en cours
+    terminent sur la référence qu'elles détiennent déjà, les suivantes voient la
+    nouvelle version, sans pause.
+    """
+
+    def __init__(self, models_dir="models", memory_budget=512 * 1024 * 1024, loader=load_model_dir,
+                 poll_interval=2.0):
+        self.models_dir = models_dir
+        self.memory_budget = memory_budget
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.swaps = 0
+        self.evictions = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._failed = {}
+        self._listeners = []
+        self._thread = None
+        self._running = False
+
+    def _path(self, name):
+        return os.path.join(self.models_dir, name)
+
+    def _signature(self, name):
+        try:
+            st = os.stat(os.path.join(self._path(name), METADATA_FILE))
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self, name):
+        signature = self._signature(name)
+        if signature is None:
+            raise KeyError(f"Modèle introuvable : {name}")
+        tensors, metadata = self.loader(self._path(name))
+        return LoadedModel(name, tensors, metadata, signature)
+
+    def get(self, name):
+        """Retourne la version courante d'un modèle (chargée au besoin) ; lève KeyError s'il n'existe pas.
+
+        Conserver la référence retournée pendant toute l'analyse : un
+        remplacement concurrent ne la modifie pas.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+            return model
+        # Un seul chargement par modèle, même si plusieurs threads le demandent en même temps
+        with self._lock:
+            name_lock = self._loading.setdefault(name, threading.Lock())
+        with name_lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+                self._publish(model)
+        return model
+
+    def _publish(self, model):
+        with self._lock:
+            old = self._models.get(model.name)
+            self._models[model.name] = model
+            self._models.move_to_end(model.name)
+            self._evict()
+        if old is not None:
+            self.swaps += 1
+            logger.warning("Modèle %s remplacé à chaud : version %s -> %s", model.name, old.version, model.version)
+        for listener in list(self._listeners):
+            try:
+                listener(model, old)
+            except Exception:
+                logger.exception("Erreur dans un abonné au registre de modèles")
+
+    def _evict(self):
+        # Les modèles les moins récemment utilisés sortent jusqu'à revenir sous le budget ;
+        # le dernier publié (en fin de LRU) reste toujours chargé
+        while self.memory_usage() > self.memory_budget and len(self._models) > 1:
+            name = next(iter(self._models))
+            del self._models[name]
+            self.evictions += 1
+            logger.info("Modèle %s retiré du cache (budget mémoire)", name)
+
+    def memory_usage(self):
+        return sum(model.nbytes for model in list(self._models.values()))
+
+    def loaded(self):
+        """Noms et versions des modèles en mémoire, du moins au plus récemment utilisé."""
+        return [(model.name, model.version) for model in list(self._models.values())]
+
+    def subscribe(self, callback):
+        """Abonne ``callback(nouveau, ancien)`` aux chargements et remplacements."""
+        self._listeners.append(callback)
+        return callback
+
+    def unload(self, name):
+        with self._lock:
+            self._models.pop(name, None)
+
+    def check(self):
+        """Recharge les modèles dont le metadata.json a changé ; retourne les noms remplacés."""
+        swapped = []
+        for name, model in list(self._models.items()):
+            signature = self._signature(name)
+            if signature is None or signature in (model.signature, self._failed.get(name)):
+                continue
+            try:
+                new = self._load(name)
+            except Exception:
+                # Version incomplète ou invalide : l'ancienne reste en service jusqu'au prochain changement
+                self._failed[name] = signature
+                logger.exception("Échec du rechargement du modèle %s, version %s conservée", name, model.version)
+                continue
+            self._failed.pop(name, None)
+            self._publish(new)
+            swapped.append(name)
+        return swapped
+
+    def _watch_loop(self):
+        while self._running:
+            time.sleep(self.poll_interval)
+            self.check()
+
+    def watch(self):
+        """Surveille les modèles chargés dans un thread d'arrière-plan."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._watch_loop, name="ghostnet-models", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare deux fichiers de résultats de ``benchmarks/run.py``.
+
+Usage : python benchmarks/compare.py reference.json actuel.json [--threshold 0.10]
+
+Le code de retour vaut 1 si une mesure se dégrade de plus du seuil (relatif),
+ce qui permet de l'utiliser tel quel en intégration continue.
+"""
+
+import sys
+import json
+import argparse
+
+
+def compare(baseline, current, threshold=0.10):
+    """Compare les mesures communes aux deux exécutions.
+
+    Returns:
+        list: Dictionnaires ``name``, ``baseline``, ``current``, ``change``
+            (variation relative, positive = amélioration) et ``status``
+            (``regression``, ``improvement`` ou ``ok``).
+    """
+    rows = []
+    for name in sorted(set(baseline["results"]) & set(current["results"])):
+        before, after = baseline["results"][name], current["results"][name]
+        if not before["value"]:
+            continue
+        change = (after["value"] - before["value"]) / before["value"]
+        if not before.get("higher_is_better", True):
+            change = -change
+        status = "regression" if change < -threshold else "improvement" if change > threshold else "ok"
+        rows.append({"name": name, "baseline": before["value"], "current": after["value"],
+                     "unit": after.get("unit", ""), "change": change, "status": status})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison de résultats de benchmarks GhostNet")
+    parser.add_argument("baseline", help="Résultats de référence")
+    parser.add_argument("current", help="Résultats à évaluer")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Dégradation relative tolérée")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    else:
+        for row in rows:
+            marker = {"regression": "!!", "improvement": "++", "ok": "  "}[row["status"]]
+            print(f"{marker} {row['name']:<40} {row['baseline']:>14,.1f} -> {row['current']:>14,.1f} "
+                  f"{row['unit']:<12} {row['change']:+.1%}")
+        missing = sorted(set(baseline["results"]) - set(current["results"]))
+        if missing:
+            print(f"Mesures absentes de l'exécution actuelle : {', '.join(missing)}")
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
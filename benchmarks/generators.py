@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Générateurs de données synthétiques pour les benchmarks : lignes de logs
+(sshd, nginx, leurres), événements utilisateur et alertes.
+
+Toutes les fonctions sont déterministes pour une graine donnée, afin que deux
+exécutions comparées portent sur exactement les mêmes données.
+"""
+
+import random
+
+ATTACK_LINES = [
+    "sshd[{pid}]: Failed password for root from {ip} port {port} ssh2",
+    "sshd[{pid}]: Failed password for invalid user admin from {ip} port {port} ssh2",
+    '{ip} - - "GET /index.php?id=1%27%20OR%201=1 HTTP/1.1" 200 512 "-" "sqlmap" SQL injection',
+]
+BENIGN_LINES = [
+    "sshd[{pid}]: Accepted publickey for deploy from {ip} port {port} ssh2",
+    "sshd[{pid}]: pam_unix(sshd:session): session opened for user deploy",
+    '{ip} - - "GET /static/app.js HTTP/1.1" 200 48213 "-" "Mozilla/5.0"',
+    '{ip} - - "POST /api/login HTTP/1.1" 302 0 "-" "Mozilla/5.0"',
+    "CRON[{pid}]: (root) CMD (run-parts /etc/cron.hourly)",
+]
+USERS_ACTIONS = ["login", "logout", "read", "write", "delete", "sudo", "download", "upload"]
+
+
+def random_ip(rng):
+    return f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def log_lines(count, attack_ratio=0.05, seed=0):
+    """Génère ``count`` lignes de logs horodatées, dont une proportion d'attaques."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        template = rng.choice(ATTACK_LINES if rng.random() < attack_ratio else BENIGN_LINES)
+        line = template.format(pid=rng.randint(100, 65000), ip=random_ip(rng), port=rng.randint(1024, 65535))
+        lines.append(f"Apr 14 12:{(i // 60) % 60:02d}:{i % 60:02d} ghostnet {line}")
+    return lines
+
+
+def user_events(count, users=1000, seed=0):
+    """Génère des couples (utilisateur, action) pour le détecteur comportemental."""
+    rng = random.Random(seed)
+    return [(f"user{rng.randrange(users)}", rng.choice(USERS_ACTIONS)) for _ in range(count)]
+
+
+def alerts(count, seed=0):
+    """Génère des alertes au format des détecteurs, avec adresse source."""
+    rng = random.Random(seed)
+    kinds = [("signature", "élevé"), ("behavioral", "moyen"), ("anomaly", "faible"), ("honeytoken", "critique")]
+    result = []
+    for i in range(count):
+        kind, severity = rng.choice(kinds)
+        result.append({
+            "detected": True,
+            "type": kind,
+            "severity": severity,
+            "description": f"Alerte synthétique {i}",
+            "src_ip": random_ip(rng),
+        })
+    return result
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lance la suite de benchmarks et écrit les résultats au format JSON.
+
+Usage : python benchmarks/run.py [--only signature,database] [--scale 0.5] [--output FICHIER]
+
+Le fichier produit se compare à une exécution de référence avec
+``python benchmarks/compare.py reference.json resultats.json``.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import platform
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, "..")))
+sys.path.insert(0, BENCH_DIR)
+
+from scenarios import SCENARIOS, Skip
+
+
+def environment():
+    """Décrit la machine et la révision mesurées (pour interpréter une comparaison)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "hostname": socket.gethostname(),
+        "commit": commit,
+    }
+
+
+def run(names, scale=1.0, repeat=1):
+    """Exécute les scénarios demandés ; garde la meilleure valeur sur ``repeat`` essais."""
+    report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "scale": scale, "repeat": repeat,
+              "environment": environment(), "results": {}, "skipped": {}}
+    for name in names:
+        best = {}
+        try:
+            for _ in range(repeat):
+                for m in SCENARIOS[name](scale):
+                    current = best.get(m["name"])
+                    better = current is None or (
+                        m["value"] > current["value"] if m["higher_is_better"] else m["value"] < current["value"])
+                    if better:
+                        best[m["name"]] = m
+        except Skip as e:
+            report["skipped"][name] = str(e)
+            print(f"[ignoré] {name} : {e}", file=sys.stderr)
+            continue
+        for metric in best.values():
+            report["results"][metric["name"]] = {k: metric[k] for k in ("value", "unit", "higher_is_better")}
+            print(f"{metric['name']:<40} {metric['value']:>16,.1f} {metric['unit']}", file=sys.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks GhostNet")
+    parser.add_argument("--only", help=f"Scénarios à lancer, séparés par des virgules ({', '.join(SCENARIOS)})")
+    parser.add_argument("--scale", type=float, default=1.0, help="Facteur de taille des données synthétiques")
+    parser.add_argument("--repeat", type=int, default=1, help="Nombre d'essais par scénario")
+    parser.add_argument("--output", "-o", help="Fichier JSON de sortie (sortie standard sinon)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"Scénarios inconnus : {', '.join(unknown)}")
+
+    report = run(names, args.scale, args.repeat)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scénarios de benchmark de GhostNet.
+
+Chaque scénario reçoit un facteur d'échelle et retourne une liste de mesures
+``{"name", "value", "unit", "higher_is_better"}``. Un scénario dont une
+dépendance manque lève ``Skip`` : il est signalé comme ignoré dans les
+résultats au lieu d'interrompre la série.
+"""
+
+import os
+import gc
+import json
+import time
+import shutil
+import tempfile
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import generators
+
+
+class Skip(Exception):
+    """Scénario impossible dans cet environnement (dépendance absente...)."""
+
+
+def measure(name, value, unit, higher_is_better=True):
+    return {"name": name, "value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def signature_throughput(scale):
+    """Débit du détecteur de signatures : ligne par ligne, puis par blocs (rejeu)."""
+    from detection.signature_detector import SignatureDetector
+    from detection.replay import CompiledRules
+
+    lines = generators.log_lines(int(200000 * scale))
+    detector = SignatureDetector()
+    analyze = detector.analyze
+    elapsed, _ = timed(lambda: [analyze(line) for line in lines])
+    results = [measure("signature.analyze_lines_per_s", len(lines) / elapsed, "lignes/s")]
+
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    rules = CompiledRules(detector.signatures)
+    elapsed, (count, _) = timed(rules.scan, data)
+    results.append(measure("signature.block_scan_lines_per_s", count / elapsed, "lignes/s"))
+    return results
+
+
+def behavioral_memory(scale):
+    """Croissance mémoire de l'état du détecteur comportemental."""
+    from detection.behavioral_detector import BehavioralDetector
+
+    events = generators.user_events(int(100000 * scale), users=int(5000 * scale) or 1)
+    detector = BehavioralDetector()
+    gc.collect()
+    tracemalloc.start()
+    half = len(events) // 2
+    start = time.perf_counter()
+    for user, action in events[:half]:
+        detector.analyze(user, action)
+    first, _ = tracemalloc.get_traced_memory()
+    for user, action in events[half:]:
+        detector.analyze(user, action)
+    elapsed = time.perf_counter() - start
+    second, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return [
+        measure("behavioral.events_per_s", len(events) / elapsed, "événements/s"),
+        measure("behavioral.bytes_per_event", (second - first) / max(1, len(events) - half), "octets",
+                higher_is_better=False),
+        measure("behavioral.peak_bytes", peak, "octets", higher_is_better=False),
+    ]
+
+
+def database_inserts(scale):
+    """Débit d'écriture de DatabaseManager : alertes unitaires et fiches attaquants par lot."""
+    from database.database import DatabaseManager
+
+    tmp = tempfile.mkdtemp()
+    try:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        count = int(2000 * scale) or 1
+        elapsed, _ = timed(lambda: [db.insert_alerte("signature", "élevé", f"alerte {i}") for i in range(count)])
+        results = [measure("database.insert_alerte_per_s", count / elapsed, "insertions/s")]
+
+        batch = generators.alerts(int(20000 * scale) or 1)
+        elapsed, _ = timed(db.record_attackers, batch)
+        results.append(measure("database.record_attackers_per_s", len(batch) / elapsed, "détections/s"))
+        return results
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+class _StubSIEMHandler(BaseHTTPRequestHandler):
+    """Serveur SIEM local : accepte tout POST JSON et compte les alertes reçues."""
+    protocol_version = "HTTP/1.1"
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.loads(body or b"null")
+        with self.lock:
+            type(self).received += len(payload) if isinstance(payload, list) else 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def siem_batching(scale):
+    """Alertes/s vers un SIEM local : un POST par alerte contre des POST groupés."""
+    try:
+        import requests
+    except ImportError:
+        raise Skip("requests n'est pas installé")
+    from integrations.siem import SIEMIntegration
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSIEMHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/siem"
+    try:
+        batch = generators.alerts(int(1000 * scale) or 1)
+        siem = SIEMIntegration(endpoint)
+        elapsed, _ = timed(lambda: [siem.send_alert(alert) for alert in batch])
+        results = [measure("siem.unbatched_alerts_per_s", len(batch) / elapsed, "alertes/s")]
+
+        session = requests.Session()
+        size = 100
+
+        def send_batches():
+            for i in range(0, len(batch), size):
+                session.post(endpoint, json=batch[i:i + size], timeout=5)
+
+        elapsed, _ = timed(send_batches)
+        results.append(measure("siem.batched_alerts_per_s", len(batch) / elapsed, "alertes/s"))
+        return results
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def api_requests(scale):
+    """Requêtes/s sur l'API REST via le client de test Flask (sans réseau)."""
+    try:
+        from ghostnet.api.app import app
+    except ImportError as e:
+        raise Skip(f"API indisponible : {e}")
+
+    client = app.test_client()
+    count = int(2000 * scale) or 1
+    results = []
+    for endpoint in ("/api/status", "/api/lures", "/metrics"):
+        elapsed, _ = timed(lambda: [client.get(endpoint) for _ in range(count)])
+        results.append(measure(f"api.{endpoint.strip('/').replace('/', '_')}_rps", count / elapsed, "requêtes/s"))
+    return results
+
+
+def capture_throughput(scale):
+    """Débit de l'étape de capture (décodage et agrégation) sur un pcap synthétique."""
+    from bench_capture import synthetic_frames
+    from network_manager.capture import CaptureStage, write_pcap
+
+    fd, path = tempfile.mkstemp(suffix=".pcap")
+    os.close(fd)
+    try:
+        write_pcap(path, synthetic_frames(int(100000 * scale) or 1))
+        stage = CaptureStage()
+        elapsed, _ = timed(stage.replay, path)
+        return [measure("capture.packets_per_s", stage.packets / elapsed, "paquets/s")]
+    finally:
+        os.unlink(path)
+
+
+def _evict(path):
+    """Retire le fichier du cache de pages pour mesurer un chargement à froid (au mieux)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def model_load(scale):
+    """Chargement à froid d'un modèle : pickle contre tenseurs projetés en mémoire."""
+    try:
+        import numpy as np
+    except ImportError:
+        raise Skip("numpy n'est pas installé")
+    import pickle
+    from ai_engine.model_format import save_model, load_model
+
+    rng = np.random.default_rng(0)
+    # Modèle synthétique de ~64 Mo (à l'échelle 1) : quelques grandes matrices de poids
+    tensors = {f"layer{i}.weight": rng.standard_normal((1024, int(2048 * scale) or 1), dtype=np.float32)
+               for i in range(8)}
+    tmp = tempfile.mkdtemp()
+    try:
+        pkl_path = os.path.join(tmp, "model.pkl")
+        st_path = os.path.join(tmp, "model.safetensors")
+        with open(pkl_path, "wb") as f:
+            pickle.dump(tensors, f, protocol=pickle.HIGHEST_PROTOCOL)
+        save_model(st_path, tensors)
+        del tensors
+        gc.collect()
+
+        def load_pickle():
+            with open(pkl_path, "rb") as f:
+                return pickle.load(f)
+
+        _evict(pkl_path)
+        pickle_s, _ = timed(load_pickle)
+        _evict(st_path)
+        mmap_s, (loaded, _) = timed(load_model, st_path)
+        # Premier accès complet aux poids projetés (lecture effective des pages)
+        touch_s, _ = timed(lambda: [float(a.sum()) for a in loaded.values()])
+        return [
+            measure("model.pickle_cold_load_ms", pickle_s * 1000, "ms", higher_is_better=False),
+            measure("model.mmap_cold_load_ms", mmap_s * 1000, "ms", higher_is_better=False),
+            measure("model.mmap_first_touch_ms", touch_s * 1000, "ms", higher_is_better=False),
+        ]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def online_anomaly(scale):
+    """Débit du modèle d'anomalies en ligne (Half-Space Trees) : extraction, scoring et apprentissage."""
+    try:
+        import numpy as np
+    except ImportError:
+        raise Skip("numpy n'est pas installé")
+    from ai_engine.hst import HalfSpaceTrees, event_features
+
+    lines = generators.log_lines(int(50000 * scale) or 1)
+    elapsed, features = timed(lambda: np.array([event_features({"log": line}) for line in lines]))
+    results = [measure("hst.features_per_s", len(lines) / elapsed, "événements/s")]
+
+    model = HalfSpaceTrees(seed=0)
+    elapsed, _ = timed(model.learn, features)
+    results.append(measure("hst.learn_per_s", len(features) / elapsed, "événements/s"))
+    elapsed, _ = timed(model.risk, features)
+    results.append(measure("hst.batch_score_per_s", len(features) / elapsed, "événements/s"))
+    single = features[:int(2000 * scale) or 1]
+    elapsed, _ = timed(lambda: [model.risk(row) for row in single])
+    results.append(measure("hst.single_score_us", elapsed / len(single) * 1e6, "µs", higher_is_better=False))
+    return results
+
+
+class _SlowSIEMHandler(_StubSIEMHandler):
+    """SIEM local répondant en ``delay`` secondes, pour mesurer l'effet d'un puits lent."""
+    delay = 0.005
+    # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, l'ACK retardé du client
+    # ajouterait ~40 ms par réponse sur une connexion persistante
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        time.sleep(self.delay)
+        super().do_POST()
+
+
+def async_pipeline(scale):
+    """Alertes/s émises (base puis SIEM lent) : chemin synchrone contre chemin asyncio concurrent.
+
+    Mesure l'étape d'émission de core (insert_alerte puis send_alert contre
+    AsyncDatabase et AsyncSIEMIntegration en parallèle) ; l'analyse, identique
+    sur les deux chemins, n'est pas incluse.
+    """
+    try:
+        import asyncio
+        import aiohttp  # noqa: F401
+        import requests  # noqa: F401
+    except ImportError as e:
+        raise Skip(f"dépendance absente : {e.name}")
+    from database.database import DatabaseManager
+    from database.async_database import AsyncDatabase
+    from integrations.siem import SIEMIntegration
+    from integrations.async_siem import AsyncSIEMIntegration
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowSIEMHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/siem"
+    tmp = tempfile.mkdtemp()
+    try:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        batch = generators.alerts(int(2000 * scale) or 1)
+        sync_batch = batch[:max(1, len(batch) // 10)]
+        siem = SIEMIntegration(endpoint)
+
+        def sync_path():
+            for alert in sync_batch:
+                db.insert_alerte(alert["type"], alert["severity"], alert["description"])
+                siem.send_alert(alert)
+
+        elapsed, _ = timed(sync_path)
+        results = [measure("async.sync_alerts_per_s", len(sync_batch) / elapsed, "alertes/s")]
+
+        async def async_path():
+            base = AsyncDatabase(db)
+            siem_async = AsyncSIEMIntegration(endpoint, max_concurrency=50)
+
+            async def emit(alert):
+                await asyncio.gather(base.insert_alerte(alert["type"], alert["severity"], alert["description"]),
+                                     siem_async.send_alert(alert))
+
+            try:
+                start = time.perf_counter()
+                await asyncio.gather(*(emit(alert) for alert in batch))
+                return time.perf_counter() - start
+            finally:
+                await base.close()
+                await siem_async.close()
+
+        elapsed = asyncio.run(async_path())
+        results.append(measure("async.concurrent_alerts_per_s", len(batch) / elapsed, "alertes/s"))
+        return results
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+SCENARIOS = {
+    "signature": signature_throughput,
+    "behavioral": behavioral_memory,
+    "database": database_inserts,
+    "siem": siem_batching,
+    "api": api_requests,
+    "capture": capture_throughput,
+    "model_load": model_load,
+    "hst": online_anomaly,
+    "async": async_pipeline,
+}
@@ -1 +1,2 @@
-from .config import load_default_config
\ No newline at end of file
+from .config import load_default_config
+from .service import ConfigService, get_config_service
@@ -1,12 +1,12 @@
 import os
-import json
+
+from .service import get_config_service, validate_core_config
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "default_config.json")
 
 def load_default_config():
-    """Charge la configuration par défaut du projet."""
-    try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+    """Retourne l'instantané de la configuration par défaut du projet (lu une seule fois)."""
+    service = get_config_service(CONFIG_PATH, [validate_core_config])
+    if service.version == 0 and service.last_error:
+        return {"error": service.last_error}
+    return service.snapshot
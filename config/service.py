@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger("ghostnet.config")
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+class FrozenDict(dict):
+    """Dictionnaire en lecture seule (reste sérialisable tel quel en JSON)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("La configuration est immuable : modifier le fichier source")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def thaw(self):
+        """Copie profonde modifiable (dict et listes ordinaires)."""
+        return thaw(self)
+
+
+def freeze(value):
+    """Convertit récursivement dicts et listes en FrozenDict et tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def parse_file(path):
+    """Lit un fichier de configuration JSON ou YAML (selon l'extension)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError(f"La configuration doit être un dictionnaire : {path}")
+    return data
+
+
+def validate_core_config(cfg):
+    """Validateur de config/default_config.json ; retourne la liste des erreurs."""
+    errors = []
+    threshold = cfg.get("alert_threshold", 0)
+    if not isinstance(threshold, (int, float)) or isinstance(threshold, bool) or threshold < 0:
+        errors.append("alert_threshold doit être un nombre positif")
+    if str(cfg.get("log_level", "INFO")).upper() not in LOG_LEVELS:
+        errors.append(f"log_level doit valoir l'un de {', '.join(LOG_LEVELS)}")
+    sample = cfg.get("log_sample_every", 1)
+    if not isinstance(sample, int) or sample < 1:
+        errors.append("log_sample_every doit être un entier >= 1")
+    budget = cfg.get("model_memory_budget_mb", 512)
+    if not isinstance(budget, (int, float)) or isinstance(budget, bool) or budget <= 0:
+        errors.append("model_memory_budget_mb doit être un nombre strictement positif")
+    for key in ("alert_ttl", "alert_flush_interval"):
+        value = cfg.get(key, 1)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            errors.append(f"{key} doit être un nombre strictement positif")
+    for key in ("async_db_pending", "async_siem_concurrency"):
+        value = cfg.get(key, 1)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            errors.append(f"{key} doit être un entier >= 1")
+    return errors
+
+
+def validate_api_config(cfg):
+    """Validateur de config/config.yaml ; retourne la liste des erreurs."""
+    errors = []
+    general = cfg.get("general") or {}
+    port = general.get("api_port", 8080)
+    if not isinstance(port, int) or not 0 < port < 65536:
+        errors.append("general.api_port doit être un port valide")
+    if str(general.get("log_level", "INFO")).upper() not in LOG_LEVELS:
+        errors.append(f"general.log_level doit valoir l'un de {', '.join(LOG_LEVELS)}")
+    sensitivity = (cfg.get("detection") or {}).get("sensitivity", 0.5)
+    if not isinstance(sensitivity, (int, float)) or not 0 <= sensitivity <= 1:
+        errors.append("detection.sensitivity doit être compris entre 0 et 1")
+    return errors
+
+
+class ConfigService:
+    """Configuration lue une fois, servie depuis un instantané immuable.
+
+    Les lecteurs accèdent à ``snapshot`` (une simple référence, jamais de
+    lecture disque). Quand le fichier change, le nouveau contenu est parsé et
+    validé ; s'il est valide, l'instantané est remplacé d'un bloc et les
+    abonnés sont notifiés, sinon l'ancien reste en place.
+    """
+
+    def __init__(self, path, validators=(), poll_interval=1.0):
+        """
+        Args:
+            path (str): Fichier JSON ou YAML.
+            validators (iterable): Fonctions recevant la configuration brute et
+                retournant une liste d'erreurs (vide si valide).
+            poll_interval (float): Période de vérification du fichier.
+        """
+        self.path = os.path.abspath(path)
+        self.validators = list(validators)
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.last_error = None
+        self._snapshot = FrozenDict()
+        self._signature = None
+        self._subscribers = []
+        self._reload_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self.reload()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, key, default=None):
+        return self._snapshot.get(key, default)
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def add_validator(self, validator):
+        """Ajoute un validateur et revalide l'instantané courant."""
+        errors = validator(self._snapshot)
+        if errors:
+            raise ValueError(f"Configuration invalide ({self.path}) : {'; '.join(errors)}")
+        self.validators.append(validator)
+
+    def subscribe(self, callback, sections=None):
+        """Abonne ``callback(nouvelle, ancienne)`` aux changements.
+
+        Args:
+            sections (iterable): Clés de premier niveau surveillées ; le rappel
+                n'est appelé que si l'une d'elles change (toutes par défaut).
+        """
+        self._subscribers.append((callback, tuple(sections) if sections else None))
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, s) for cb, s in self._subscribers if cb is not callback]
+
+    def reload(self):
+        """Relit le fichier ; retourne True si un nouvel instantané a été installé."""
+        with self._reload_lock:
+            signature = self._file_signature()
+            try:
+                raw = parse_file(self.path)
+                errors = [e for validator in self.validators for e in (validator(raw) or [])]
+                if errors:
+                    raise ValueError("; ".join(errors))
+            except Exception as e:  # fichier absent, JSON/YAML mal formé ou refusé par un validateur
+                self.last_error = str(e)
+                self._signature = signature
+                logger.error("Configuration %s rejetée, instantané précédent conservé : %s", self.path, e)
+                return False
+            old, new = self._snapshot, freeze(raw)
+            self._signature = signature
+            self.last_error = None
+            if new == old and self.version:
+                return False
+            self._snapshot = new
+            self.version += 1
+        for callback, sections in list(self._subscribers):
+            if sections is not None and all(old.get(s) == new.get(s) for s in sections):
+                continue
+            try:
+                callback(new, old)
+            except Exception:
+                logger.exception("Erreur dans un abonné à la configuration %s", self.path)
+        return True
+
+    def check(self):
+        """Recharge si le fichier a changé depuis la dernière lecture (inode, mtime, taille)."""
+        if self._file_signature() != self._signature:
+            return self.reload()
+        return False
+
+    def _watch_loop(self):
+        from utils import inotify
+
+        notifier = None
+        if inotify.available():
+            try:
+                notifier = inotify.Inotify()
+                notifier.add_watch(os.path.dirname(self.path),
+                                   inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_CREATE)
+            except OSError:
+                notifier = None
+        try:
+            while self._running:
+                if notifier is not None:
+                    # L'attente se termine à la première écriture ; check() sert aussi de filet
+                    notifier.read_events(self.poll_interval)
+                else:
+                    time.sleep(self.poll_interval)
+                self.check()
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+    def watch(self):
+        """Démarre la surveillance du fichier dans un thread d'arrière-plan."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._watch_loop, name="ghostnet-config", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def get_config_service(path, validators=(), watch=False):
+    """Retourne le service partagé d'un fichier (créé et parsé une seule fois par processus)."""
+    key = os.path.abspath(path)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = ConfigService(key, validators)
+        else:
+            for validator in validators:
+                if validator not in service.validators:
+                    service.add_validator(validator)
+    if watch:
+        service.watch()
+    return service
@@ -1,48 +1,285 @@
-from detection import SignatureDetector, AnomalyDetector, BehavioralDetector
+import asyncio
+from time import perf_counter
+from detection import SignatureDetector, AnomalyDetector, BehavioralDetector, LogTailer, ProfileEngine
+from detection import AlertAggregator, source_of
 from lure_generator import LureGenerator
 from network_manager import NetworkManager
-from ai_engine import AIEngine
+from ai_engine import AIEngine, ModelRegistry, register_scorer
+from ai_engine import hst
+from scripts.model_manager import ModelManager
 from integrations import SIEMIntegration
-from utils import setup_logger, load_config
-from database import DatabaseManager
+from utils import setup_logger, GeoEnricher, metrics
+from utils.profiling import SLOW_EVENTS, PROFILER, CONTROL_SOCKET, ControlServer, register_rule_source
+from config.service import get_config_service, validate_core_config
+from database import DatabaseManager, LureRegistry, AsyncDatabase
 
-logger = setup_logger()
-config = load_config("config/default_config.json")
+# Configuration lue une fois puis surveillée : les changements sont appliqués sans redémarrage
+config_service = get_config_service("config/default_config.json", [validate_core_config], watch=True)
+config = config_service.snapshot
+# Les messages INFO par événement sont échantillonnés ; avertissements et erreurs passent tous
+logger = setup_logger(level=config.get("log_level", "INFO"), sample_every=config.get("log_sample_every", 100))
 db = DatabaseManager()
-ai_engine = AIEngine()
-lure_gen = LureGenerator()
-network_mgr = NetworkManager()
+# Modèles chargés à la demande, remplacés à chaud quand ModelManager publie une nouvelle version
+model_registry = ModelRegistry(config.get("models_dir", "models"),
+                               config.get("model_memory_budget_mb", 512) * 1024 * 1024).watch()
+model_manager = ModelManager()
+register_scorer(hst.MODEL_TYPE, hst.score_loaded_model)
+
+def charger_modele_en_ligne():
+    """Reprend le modèle d'anomalies en ligne depuis son dernier point de contrôle, sinon en crée un."""
+    nom = config.get("ai_online_model", "anomaly/online_hst")
+    if model_manager.model_exists(nom):
+        try:
+            tenseurs, metadonnees = model_manager.load_model(nom)
+            return hst.HalfSpaceTrees.from_tensors(tenseurs, metadonnees)
+        except Exception:
+            logger.exception("Point de contrôle %s illisible, nouveau modèle en ligne", nom)
+    return hst.HalfSpaceTrees()
+
+def sauvegarder_modele_en_ligne(modele):
+    tenseurs, metadonnees = modele.to_tensors()
+    model_manager.save_checkpoint(config.get("ai_online_model", "anomaly/online_hst"), tenseurs, metadonnees)
+
+ai_engine = AIEngine(model_registry, config.get("ai_model"),
+                     online_model=charger_modele_en_ligne() if config.get("ai_online_learning", True) else None,
+                     checkpoint=sauvegarder_modele_en_ligne,
+                     checkpoint_every=config.get("ai_checkpoint_every", 100000))
+lure_registry = LureRegistry()
+lure_gen = LureGenerator(registry=lure_registry)
+network_mgr = NetworkManager(registry=lure_registry)
 siem = SIEMIntegration(config.get("siem_endpoint", ""), None)
+anomaly_detector = AnomalyDetector(config.get("alert_threshold", 10))
+geo = GeoEnricher(config.get("geoip_city_db"), config.get("geoip_asn_db"))
+# Instance unique : les temps de correspondance par règle s'accumulent d'un événement à l'autre
+signature_detector = SignatureDetector(lure_gen.honeytokens)
+register_rule_source("signature", signature_detector.rule_stats)
+
+def profil_termine(profil):
+    logger.info("Profil de session %s : %s actions, groupe %s, outils %s", profil["source"], profil["events"],
+                profil["cluster"], ", ".join(profil["tools"]) or "aucun")
+
+# Profils d'attaquants par session (séquences d'actions, rythme, outils), regroupés au fil de l'eau
+profils = ProfileEngine(session_timeout=config.get("profile_session_timeout", 1800), on_profile=profil_termine)
+
+def _preparer(alerte):
+    # Champs de la base et corps envoyé au SIEM ; un résumé porte le décompte des répétitions
+    message, details = alerte["message"], alerte["alerte"]
+    if alerte.get("aggregated"):
+        message = f"{message} (x{alerte['repeats']} supplémentaires, {alerte['count']} au total)"
+        details = dict(details, aggregated=True, count=alerte["count"],
+                       first_seen=alerte["first_seen"], last_seen=alerte["last_seen"])
+    return alerte["type"], alerte["niveau"], message, details
+
+def emettre_alerte(alerte):
+    """Écrit une alerte (ou le résumé d'alertes regroupées) en base et l'envoie au SIEM."""
+    type_, niveau, message, details = _preparer(alerte)
+    db.insert_alerte(type_, niveau, message)
+    siem.send_alert(details)
+
+# Les alertes répétées (même règle, source et leurre) sont regroupées avant la base et le SIEM
+alertes = AlertAggregator(emettre_alerte, ttl=config.get("alert_ttl", 300),
+                          flush_interval=config.get("alert_flush_interval", 60))
+if config.get("alert_aggregation", True):
+    alertes.start()
+
+def _signalement(type_, niveau, message, alerte, regle, source=None, leurre=None):
+    return {"type": type_, "niveau": niveau, "message": message, "alerte": alerte,
+            "regle": regle, "source": source, "leurre": leurre}
+
+def signaler(signalement):
+    """Émet une alerte, regroupée avec ses répétitions récentes si l'agrégation est active."""
+    if signalement["alerte"].get("src_ip"):
+        enregistrer_attaquants([dict(signalement["alerte"], severity=signalement["niveau"])])
+    if config.get("alert_aggregation", True):
+        alertes.submit(signalement, signalement["regle"], signalement["source"], signalement["leurre"])
+    else:
+        emettre_alerte(signalement)
+
+EVENTS = metrics.counter("ghostnet_events_total", "Événements analysés, par résultat", ["result"])
+EVENT_SECONDS = metrics.histogram("ghostnet_event_seconds", "Durée totale d'analyse d'un événement")
+STAGE_SECONDS = metrics.histogram("ghostnet_event_stage_seconds", "Durée de chaque étape d'analyse", ["stage"])
+SIGNATURE_STAGE = STAGE_SECONDS.labels("signature")
+BEHAVIORAL_STAGE = STAGE_SECONDS.labels("behavioral")
+AI_STAGE = STAGE_SECONDS.labels("ai")
+
+def appliquer_config(nouvelle, ancienne):
+    """Applique une nouvelle configuration validée aux composants déjà créés."""
+    global config
+    config = nouvelle
+    logger.setLevel(nouvelle.get("log_level", "INFO"))
+    anomaly_detector.threshold = nouvelle.get("alert_threshold", anomaly_detector.threshold)
+    alertes.ttl = nouvelle.get("alert_ttl", alertes.ttl)
+    alertes.flush_interval = nouvelle.get("alert_flush_interval", alertes.flush_interval)
+    if nouvelle.get("alert_aggregation", True):
+        alertes.start()
+    else:
+        alertes.stop()
+    ai_engine.model_name = nouvelle.get("ai_model")
+    model_registry.memory_budget = nouvelle.get("model_memory_budget_mb", 512) * 1024 * 1024
+    logger.warning("Configuration rechargée (version %s)", config_service.version)
+
+config_service.subscribe(appliquer_config)
+
+def enregistrer_attaquants(detections):
+    """Attache en lot les détections (et leur géolocalisation) aux fiches attaquants."""
+    return db.record_attackers(detections, geo if geo.available else None)
+
+def _mesurer(log_entry, resultat, temps, duree):
+    EVENT_SECONDS.observe(duree)
+    type_resultat = resultat.get("type") or resultat.get("niveau") or "none"
+    EVENTS.labels(type_resultat).inc()
+    # Réservoir des événements les plus lents, consultable via /api/profiling
+    SLOW_EVENTS.offer(duree, {"event": log_entry[:500], "result": type_resultat,
+                              "rule": resultat.get("rule_id"), "stages": temps})
 
 # Exemple d'orchestration
 def traiter_evenement(log_entry, user=None, action=None):
-    logger.info("Analyse de l'événement : %s", log_entry)
-    signature = SignatureDetector().analyze(log_entry)
+    temps = {}
+    debut = perf_counter()
+    resultat = PROFILER.call(_analyser_evenement, log_entry, user, action, temps)
+    _mesurer(log_entry, resultat, temps, perf_counter() - debut)
+    return resultat
+
+def _analyser_evenement(log_entry, user=None, action=None, temps=None):
+    resultat, signalement = _detecter(log_entry, user, action, temps)
+    if signalement is not None:
+        signaler(signalement)
+    return resultat
+
+def _detecter(log_entry, user=None, action=None, temps=None):
+    """Analyse seule (sans écriture ni envoi) ; retourne (résultat, alerte à émettre ou None)."""
+    temps = {} if temps is None else temps
+    logger.debug("Analyse de l'événement : %s", log_entry)
+    debut = perf_counter()
+    signature = signature_detector.analyze(log_entry)
+    temps["signature"] = perf_counter() - debut
+    SIGNATURE_STAGE.observe(temps["signature"])
     if signature["detected"]:
         logger.warning("Détection par signature : %s", signature["description"])
-        db.insert_alerte("signature", "élevé", signature["description"])
-        siem.send_alert(signature)
-        return signature
+        return signature, _signalement("signature", "élevé", signature["description"], signature,
+                                       signature.get("rule_id"),
+                                       signature.get("src_ip") or source_of(log_entry) or user,
+                                       signature.get("lure_id"))
 
+    if user:
+        lure_registry.attackers.record(username=user)
     if user and action:
+        profils.observe(user, action)
+        debut = perf_counter()
         comportement = BehavioralDetector().analyze(user, action)
+        temps["behavioral"] = perf_counter() - debut
+        BEHAVIORAL_STAGE.observe(temps["behavioral"])
         if comportement["detected"]:
             logger.warning("Détection comportementale : %s", comportement["description"])
-            db.insert_alerte("behavioral", "moyen", comportement["description"])
-            siem.send_alert(comportement)
-            return comportement
+            return comportement, _signalement("behavioral", "moyen", comportement["description"], comportement,
+                                              "behavioral", user)
 
     # Exemple d'analyse IA
+    debut = perf_counter()
     score = ai_engine.score_event({"log": log_entry})
+    temps["ai"] = perf_counter() - debut
+    AI_STAGE.observe(temps["ai"])
     logger.info("Score IA : %s", score)
     if score["niveau"] in ["élevé", "critique"]:
-        db.insert_alerte("ai", score["niveau"], "Score IA élevé")
-        siem.send_alert(score)
-        return score
+        return score, _signalement("ai", score["niveau"], "Score IA élevé", score, "ai",
+                                   source_of(log_entry) or user)
 
     logger.info("Aucune menace détectée.")
-    return {"detected": False}
+    return {"detected": False}, None
+
+# Chemin asynchrone : même analyse, émissions (base, SIEM) attendues sans bloquer la boucle.
+# Les puits sont liés à la boucle qui les a créés ; fermer_puits_asynchrones() avant de la quitter.
+_puits = None
+
+def _puits_asynchrones():
+    global _puits
+    boucle = asyncio.get_running_loop()
+    if _puits is None or _puits[0] is not boucle:
+        # aiohttp n'est requis que par le chemin asynchrone
+        from integrations.async_siem import AsyncSIEMIntegration
+        _puits = (boucle,
+                  AsyncDatabase(db, max_pending=config.get("async_db_pending", 1000)),
+                  AsyncSIEMIntegration(config.get("siem_endpoint", ""), None,
+                                       max_concurrency=config.get("async_siem_concurrency", 20)))
+    return _puits[1], _puits[2]
+
+async def fermer_puits_asynchrones():
+    """Termine les écritures en cours et ferme les connexions du chemin asynchrone."""
+    global _puits
+    if _puits is not None:
+        _, base, siem_async = _puits
+        _puits = None
+        await base.close()
+        await siem_async.close()
+
+async def emettre_alerte_async(alerte):
+    type_, niveau, message, details = _preparer(alerte)
+    base, siem_async = _puits_asynchrones()
+    # Base et SIEM en parallèle, chacun borné par sa propre limite de concurrence
+    await asyncio.gather(base.insert_alerte(type_, niveau, message), siem_async.send_alert(details))
+
+async def signaler_async(signalement):
+    base, _ = _puits_asynchrones()
+    envois = []
+    if signalement["alerte"].get("src_ip"):
+        envois.append(base.record_attackers([dict(signalement["alerte"], severity=signalement["niveau"])],
+                                            geo if geo.available else None))
+    if config.get("alert_aggregation", True):
+        emettre, resumes = alertes.admit(signalement, signalement["regle"], signalement["source"],
+                                         signalement["leurre"])
+        envois.extend(emettre_alerte_async(resume) for resume in resumes)
+        if emettre:
+            envois.append(emettre_alerte_async(signalement))
+    else:
+        envois.append(emettre_alerte_async(signalement))
+    await asyncio.gather(*envois)
+
+async def process_event(log_entry, user=None, action=None):
+    """Variante asynchrone de traiter_evenement, pour traiter de nombreux événements en parallèle.
+
+    L'analyse reste synchrone (quelques microsecondes, sans entrée/sortie) ;
+    seules les émissions sont attendues : un SIEM ou un disque lent ne retient
+    que les événements qui produisent une alerte, jamais la boucle entière.
+    Les résumés périodiques de l'agrégation restent émis par son thread.
+    """
+    temps = {}
+    debut = perf_counter()
+    resultat, signalement = PROFILER.call(_detecter, log_entry, user, action, temps)
+    if signalement is not None:
+        await signaler_async(signalement)
+    _mesurer(log_entry, resultat, temps, perf_counter() - debut)
+    return resultat
+
+async def process_events(lignes):
+    """Traite un lot de lignes concurremment ; retourne les résultats dans l'ordre."""
+    return await asyncio.gather(*(process_event(ligne) for ligne in lignes))
+
+def traiter_lot(entrees):
+    """Analyse un lot de lignes (chemin, ligne) issu du suivi des journaux."""
+    return [traiter_evenement(ligne) for _, ligne in entrees]
+
+def suivre_journaux(chemins, point_de_reprise="logs/ingestion_offsets.json"):
+    """Suit les fichiers de logs en continu et alimente la détection par lots (bloquant)."""
+    tailer = LogTailer(chemins, traiter_lot, checkpoint_path=point_de_reprise,
+                       batch_size=config.get("ingestion_batch_size", 1000))
+    try:
+        tailer.run()
+    finally:
+        tailer.close()
+        # Derniers résumés d'alertes regroupées avant l'arrêt
+        alertes.flush(force=True)
+    return tailer
+
+def demarrer_controle():
+    """Ouvre le socket de contrôle par lequel l'API pilote l'instrumentation de ce processus."""
+    return ControlServer(config.get("control_socket", CONTROL_SOCKET)).start()
 
 if __name__ == "__main__":
+    import sys
+    controle = demarrer_controle()
+    if len(sys.argv) > 1:
+        # python core.py /var/log/auth.log /var/log/nginx/access.log ...
+        suivre_journaux(sys.argv[1:])
+        sys.exit(0)
     # Exemple d'utilisation
     traiter_evenement("Tentative de connexion SSH échouée: Failed password", user="alice", action="login")
\ No newline at end of file
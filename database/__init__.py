@@ -1 +1,3 @@
-from .database import DatabaseManager
\ No newline at end of file
+from .database import DatabaseManager
+from .lure_registry import LureRegistry
+from .async_database import AsyncDatabase
@@ -0,0 +1,60 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncDatabase:
+    """Accès asynchrone à un DatabaseManager, pour le chemin de traitement asyncio.
+
+    Comme aiosqlite, les opérations SQLite s'exécutent dans un thread dédié :
+    la boucle d'événements n'est jamais bloquée par le disque, et SQLite, qui
+    sérialise de toute façon les écritures, ne voit qu'un seul écrivain. Les
+    alertes soumises pendant une écriture sont regroupées dans la transaction
+    suivante (``insert_alertes``). Au plus ``max_pending`` opérations sont en
+    attente : au-delà, les appelants attendent (contre-pression).
+    """
+
+    def __init__(self, db, max_pending=1000, batch_size=500):
+        self.db = db
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="ghostnet-db")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._queue = []
+        self._writer = None
+
+    async def run(self, function, *args):
+        """Exécute ``function(*args)`` dans le thread de la base."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+    async def insert_alerte(self, type_, niveau, message):
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.append(((type_, niveau, message), future))
+            if self._writer is None or self._writer.done():
+                self._writer = asyncio.create_task(self._write_alerts())
+            return await future
+
+    async def _write_alerts(self):
+        while self._queue:
+            batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+            try:
+                ids = await self.run(self.db.insert_alertes, [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), id_ in zip(batch, ids):
+                if not future.done():
+                    future.set_result(id_)
+
+    async def record_attackers(self, detections, enricher=None):
+        async with self._slots:
+            return await self.run(self.db.record_attackers, detections, enricher)
+
+    async def close(self):
+        """Attend les écritures en cours puis arrête le thread de la base."""
+        if self._writer is not None:
+            await self._writer
+        self._executor.shutdown(wait=True)
@@ -1,8 +1,19 @@
 import sqlite3
+import json
+import datetime
 import os
 
+from utils import metrics
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "ghostnet.db")
 
+DB_WRITE_SECONDS = metrics.histogram(
+    "ghostnet_db_write_seconds", "Durée des écritures en base", ["operation"])
+
+# Ordre des niveaux de gravité, pour ne conserver que le plus élevé par attaquant
+SEVERITY_ORDER = {"faible": 0, "low": 0, "moyen": 1, "medium": 1, "élevé": 2, "high": 2,
+                  "critique": 3, "critical": 3}
+
 class DatabaseManager:
     """Gestionnaire de base de données SQLite pour GhostNet."""
 
@@ -23,11 +34,22 @@ class DatabaseManager:
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS attackers (
+                    ip TEXT PRIMARY KEY,
+                    first_seen TEXT,
+                    last_seen TEXT,
+                    attacks INTEGER,
+                    types TEXT,
+                    severity TEXT,
+                    geo TEXT
+                )
+            """)
             conn.commit()
 
     def insert_alerte(self, type_, niveau, message):
         """Insère une alerte dans la base."""
-        with sqlite3.connect(self.db_path) as conn:
+        with DB_WRITE_SECONDS.labels("insert_alerte").time(), sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO alertes (type, niveau, message) VALUES (?, ?, ?)",
@@ -36,6 +58,17 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid
 
+    def insert_alertes(self, rows):
+        """Insère un lot d'alertes (type, niveau, message) en une transaction ; retourne leurs identifiants."""
+        with DB_WRITE_SECONDS.labels("insert_alertes").time(), sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            ids = []
+            for row in rows:
+                cursor.execute("INSERT INTO alertes (type, niveau, message) VALUES (?, ?, ?)", row)
+                ids.append(cursor.lastrowid)
+            conn.commit()
+            return ids
+
     def get_alertes(self, limit=100):
         """Récupère les alertes les plus récentes."""
         with sqlite3.connect(self.db_path) as conn:
@@ -44,4 +77,104 @@ class DatabaseManager:
                 "SELECT id, type, niveau, message, timestamp FROM alertes ORDER BY timestamp DESC LIMIT ?",
                 (limit,)
             )
-            return cursor.fetchall()
\ No newline at end of file
+            return cursor.fetchall()
+
+    def record_attackers(self, detections, enricher=None):
+        """Met à jour les fiches attaquants à partir d'un lot de détections.
+
+        Seules les adresses inconnues sont géolocalisées, en un seul passage sur
+        ``enricher`` (voir ``utils.geoip.GeoEnricher``) : l'information est
+        attachée une fois à la fiche, jamais recalculée par requête.
+
+        Args:
+            detections (list): Dictionnaires portant ``src_ip`` et, si connus,
+                ``type``, ``severity`` et ``timestamp``.
+
+        Returns:
+            int: Nombre d'attaquants mis à jour.
+        """
+        now = datetime.datetime.now().isoformat()
+        batch = {}
+        for detection in detections:
+            ip = detection.get("src_ip")
+            if not ip:
+                continue
+            entry = batch.setdefault(ip, {"attacks": 0, "types": set(), "severity": None,
+                                          "first_seen": None, "last_seen": None})
+            ts = detection.get("timestamp") or now
+            entry["attacks"] += 1
+            entry["first_seen"] = min(entry["first_seen"] or ts, ts)
+            entry["last_seen"] = max(entry["last_seen"] or ts, ts)
+            if detection.get("type"):
+                entry["types"].add(detection["type"])
+            entry["severity"] = _max_severity(entry["severity"], detection.get("severity"))
+        if not batch:
+            return 0
+
+        with DB_WRITE_SECONDS.labels("record_attackers").time(), sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            ips, known = list(batch), {}
+            for i in range(0, len(ips), 500):  # limite de paramètres des anciennes versions de SQLite
+                chunk = ips[i:i + 500]
+                cursor.execute(
+                    "SELECT ip, first_seen, last_seen, attacks, types, severity FROM attackers "
+                    f"WHERE ip IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                known.update((row[0], row[1:]) for row in cursor.fetchall())
+            new_ips = [ip for ip in batch if ip not in known]
+            geo = enricher.enrich_batch(new_ips) if enricher is not None and new_ips else {}
+
+            for ip, entry in batch.items():
+                types = sorted(entry["types"])
+                if ip in known:
+                    first_seen, last_seen, attacks, old_types, severity = known[ip]
+                    cursor.execute(
+                        "UPDATE attackers SET first_seen = ?, last_seen = ?, attacks = ?, types = ?, severity = ? "
+                        "WHERE ip = ?",
+                        (min(first_seen, entry["first_seen"]), max(last_seen, entry["last_seen"]),
+                         attacks + entry["attacks"], json.dumps(sorted(set(json.loads(old_types)) | entry["types"])),
+                         _max_severity(severity, entry["severity"]), ip)
+                    )
+                else:
+                    cursor.execute(
+                        "INSERT INTO attackers (ip, first_seen, last_seen, attacks, types, severity, geo) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (ip, entry["first_seen"], entry["last_seen"], entry["attacks"], json.dumps(types),
+                         entry["severity"], json.dumps(geo.get(ip)) if ip in geo else None)
+                    )
+            conn.commit()
+        return len(batch)
+
+    def get_attackers(self, limit=10, offset=0):
+        """Récupère les attaquants les plus récents.
+
+        Returns:
+            tuple: (liste de dictionnaires, nombre total d'attaquants).
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            total = cursor.execute("SELECT COUNT(*) FROM attackers").fetchone()[0]
+            cursor.execute(
+                "SELECT ip, first_seen, last_seen, attacks, types, severity, geo FROM attackers "
+                "ORDER BY last_seen DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            )
+            attackers = [
+                {
+                    "ip": ip, "first_seen": first_seen, "last_seen": last_seen, "attacks": attacks,
+                    "types": json.loads(types), "severity": severity,
+                    "geo": json.loads(geo) if geo else None,
+                }
+                for ip, first_seen, last_seen, attacks, types, severity, geo in cursor.fetchall()
+            ]
+        return attackers, total
+
+
+def _max_severity(a, b):
+    """Retourne le plus grave de deux niveaux (None est ignoré)."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return b if SEVERITY_ORDER.get(b, -1) > SEVERITY_ORDER.get(a, -1) else a
@@ -0,0 +1,319 @@
+import json
+import time
+import struct
+import sqlite3
+import datetime
+import threading
+
+from .database import DB_PATH
+from utils import metrics
+from utils.sketches import hash128, HyperLogLog, TopK, TimeBuckets
+
+LURE_CONNECTIONS = metrics.counter("ghostnet_lure_connections_total", "Connexions reçues par les leurres",
+                                   ["lure_id"])
+
+
+# Précision des HyperLogLog : 4 Kio par leurre, erreur typique de 1,6 %
+HLL_PRECISION = 12
+TOP_K = 10
+TOP_WIDTH = 1024
+# Fenêtre glissante des sources distinctes : 24 tranches d'une heure
+WINDOW_BUCKET = 3600
+WINDOW_BUCKETS = 24
+
+
+def _pack(*blobs):
+    return b"".join(struct.pack("<I", len(blob)) + blob for blob in blobs)
+
+
+def _unpack(data):
+    blobs, offset = [], 0
+    while offset < len(data):
+        (size,) = struct.unpack_from("<I", data, offset)
+        blobs.append(bytes(data[offset + 4:offset + 4 + size]))
+        offset += 4 + size
+    return blobs
+
+
+class LureStats:
+    """Compteurs en direct d'un leurre, en mémoire fixe quel que soit le trafic.
+
+    Les sources distinctes sont estimées par HyperLogLog (total et par heure sur
+    24 h), les sources les plus actives par un TopK : aucun ensemble d'adresses
+    n'est conservé. Mis à jour sans verrou : un seul écrivain (le thread qui
+    reçoit les événements de connexion) les modifie, les lecteurs tolèrent une
+    valeur légèrement en retard. ``merge`` additionne les compteurs d'un autre
+    processus.
+    """
+    __slots__ = ("connections", "ips", "hourly", "top_ips", "last_connection")
+
+    def __init__(self, connections=0, ips=(), last_connection=None):
+        self.connections = connections
+        self.ips = HyperLogLog(HLL_PRECISION)
+        self.hourly = TimeBuckets(lambda: HyperLogLog(HLL_PRECISION), WINDOW_BUCKET, WINDOW_BUCKETS)
+        self.top_ips = TopK(TOP_K, TOP_WIDTH)
+        for ip in ips:
+            self.ips.add(ip)
+        self.last_connection = last_connection
+
+    def record(self, src_ip, ts):
+        digest = hash128(src_ip)
+        self.ips.add_digest(digest)
+        self.hourly.get(ts).add_digest(digest)
+        self.top_ips.add(src_ip)
+
+    def merge(self, other):
+        self.connections += other.connections
+        self.ips.merge(other.ips)
+        self.top_ips.merge(other.top_ips)
+        for key, sketch in other.hourly.buckets.items():
+            self.hourly.get(key * WINDOW_BUCKET).merge(sketch)
+        if other.last_connection and (self.last_connection or 0) < other.last_connection:
+            self.last_connection = other.last_connection
+        return self
+
+    def to_bytes(self):
+        """Sketches persistés (les tranches horaires restent en mémoire)."""
+        return _pack(self.ips.to_bytes(), self.top_ips.to_bytes())
+
+    def load_sketches(self, data):
+        ips, top_ips = _unpack(data)
+        self.ips = HyperLogLog.from_bytes(ips)
+        self.top_ips = TopK.from_bytes(top_ips)
+
+    def to_dict(self, top=5):
+        last = self.last_connection
+        recent = self.hourly.window(WINDOW_BUCKET * WINDOW_BUCKETS)
+        return {
+            "connections": self.connections,
+            "unique_ips": len(self.ips),
+            "unique_ips_24h": len(recent) if recent is not None else 0,
+            "top_ips": [{"ip": ip, "connections": count} for ip, count in self.top_ips.top(top)],
+            "last_connection": datetime.datetime.fromtimestamp(last).isoformat() if last else None,
+        }
+
+
+class AttackerStats:
+    """Statistiques globales des attaquants sur tous les leurres : sources distinctes
+    et éléments les plus fréquents (adresses, ports, identifiants), en mémoire fixe."""
+
+    def __init__(self, k=TOP_K):
+        self.sources = HyperLogLog(14)
+        self.ips = TopK(k)
+        self.ports = TopK(k)
+        self.usernames = TopK(k)
+
+    def record(self, src_ip=None, port=None, username=None):
+        if src_ip:
+            self.sources.add(src_ip)
+            self.ips.add(src_ip)
+        if port is not None:
+            self.ports.add(port)
+        if username:
+            self.usernames.add(username)
+
+    def merge(self, other):
+        self.sources.merge(other.sources)
+        self.ips.merge(other.ips)
+        self.ports.merge(other.ports)
+        self.usernames.merge(other.usernames)
+        return self
+
+    def to_dict(self, top=10):
+        return {
+            "unique_ips": len(self.sources),
+            "top_ips": self.ips.top(top),
+            "top_ports": [(int(port), count) for port, count in self.ports.top(top)],
+            "top_usernames": self.usernames.top(top),
+        }
+
+
+class LureRegistry:
+    """Inventaire unique des leurres, persisté dans SQLite.
+
+    Les leurres sont rechargés au démarrage dans des index en mémoire (par
+    identifiant, port et type) : les lectures ne touchent jamais la base.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._id_lock = threading.Lock()
+        self._by_id = {}
+        self._by_port = {}
+        self._by_type = {}
+        self.stats = {}
+        self.attackers = AttackerStats()
+        self._last_number = 0
+        self._init_db()
+        self._load()
+
+    def _init_db(self):
+        """Crée les tables si elles n'existent pas."""
+        with self._write_lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lures (
+                    id TEXT PRIMARY KEY,
+                    type TEXT,
+                    port INTEGER,
+                    data TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lure_stats (
+                    lure_id TEXT PRIMARY KEY,
+                    connections INTEGER,
+                    ips TEXT,
+                    last_connection REAL
+                )
+            """)
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(lure_stats)")]
+            if "sketches" not in columns:
+                # Bases antérieures aux sketches : la colonne ips (liste JSON) est relue une dernière fois
+                self._conn.execute("ALTER TABLE lure_stats ADD COLUMN sketches BLOB")
+
+    def _load(self):
+        """Recharge l'inventaire et les statistiques depuis la base."""
+        for (data,) in self._conn.execute("SELECT data FROM lures"):
+            self._index(json.loads(data))
+        for lure_id, connections, ips, last, sketches in self._conn.execute(
+                "SELECT lure_id, connections, ips, last_connection, sketches FROM lure_stats"):
+            if lure_id not in self._by_id:
+                continue
+            stats = LureStats(connections, json.loads(ips) if ips else (), last)
+            if sketches:
+                stats.load_sketches(sketches)
+            self.stats[lure_id] = stats
+
+    def _index(self, lure):
+        lure_id = lure["id"]
+        suffix = lure_id.rsplit("-", 1)[-1]
+        if suffix.isdigit():
+            self._last_number = max(self._last_number, int(suffix))
+        self._by_id[lure_id] = lure
+        self._by_type.setdefault(lure["type"], {})[lure_id] = lure
+        if lure.get("port") is not None:
+            self._by_port[lure["port"]] = lure_id
+        self.stats.setdefault(lure_id, LureStats())
+
+    def _unindex(self, lure):
+        self._by_type.get(lure["type"], {}).pop(lure["id"], None)
+        if self._by_port.get(lure.get("port")) == lure["id"]:
+            del self._by_port[lure["port"]]
+
+    def _save(self, lure):
+        with self._write_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lures (id, type, port, data) VALUES (?, ?, ?, ?)",
+                (lure["id"], lure["type"], lure.get("port"), json.dumps(lure))
+            )
+
+    def next_id(self):
+        """Réserve le prochain identifiant libre au format lure-NNN."""
+        with self._id_lock:
+            self._last_number += 1
+            return f"lure-{self._last_number:03d}"
+
+    def add(self, lure):
+        """Ajoute (ou remplace) un leurre et retourne l'enregistrement stocké."""
+        lure = dict(lure)
+        if "id" not in lure:
+            lure["id"] = self.next_id()
+        with self._write_lock:
+            lure.setdefault("status", "active")
+            lure.setdefault("created_at", datetime.datetime.now().isoformat())
+            if lure["id"] in self._by_id:
+                self._unindex(self._by_id[lure["id"]])
+            self._index(lure)
+        self._save(lure)
+        return lure
+
+    def update(self, lure_id, **fields):
+        """Met à jour les champs d'un leurre ; retourne None s'il est inconnu."""
+        lure = self._by_id.get(lure_id)
+        if lure is None:
+            return None
+        updated = dict(lure, **fields)
+        updated["id"] = lure_id
+        updated["updated_at"] = datetime.datetime.now().isoformat()
+        with self._write_lock:
+            self._unindex(lure)
+            self._index(updated)
+        self._save(updated)
+        return updated
+
+    def remove(self, lure_id):
+        """Supprime un leurre ; retourne False s'il est inconnu."""
+        with self._write_lock:
+            lure = self._by_id.pop(lure_id, None)
+            if lure is None:
+                return False
+            self._unindex(lure)
+            self.stats.pop(lure_id, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM lures WHERE id = ?", (lure_id,))
+                self._conn.execute("DELETE FROM lure_stats WHERE lure_id = ?", (lure_id,))
+        return True
+
+    def get(self, lure_id):
+        return self._by_id.get(lure_id)
+
+    def get_by_port(self, port):
+        lure_id = self._by_port.get(port)
+        return self._by_id.get(lure_id) if lure_id else None
+
+    def list(self, type_=None):
+        if type_ is not None:
+            return list(self._by_type.get(type_, {}).values())
+        return list(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def record_connection(self, port, src_ip, ts=None, username=None):
+        """Chemin critique : comptabilise une connexion sur le leurre d'un port.
+
+        Aucun verrou ni écriture disque ; ``flush_stats`` persiste les compteurs.
+        """
+        self.attackers.record(src_ip, port, username)
+        lure_id = self._by_port.get(port)
+        if lure_id is None:
+            return None
+        stats = self.stats.get(lure_id)
+        if stats is None:
+            return None
+        stats.connections += 1
+        LURE_CONNECTIONS.labels(lure_id).inc()
+        stats.last_connection = ts or time.time()
+        stats.record(src_ip, stats.last_connection)
+        return lure_id
+
+    def get_stats(self, lure_id):
+        stats = self.stats.get(lure_id)
+        return stats.to_dict() if stats else None
+
+    def merge_stats(self, lure_id, other):
+        """Ajoute les compteurs ``other`` (LureStats d'un autre processus) à ceux d'un leurre."""
+        stats = self.stats.get(lure_id)
+        if stats is not None:
+            stats.merge(other)
+        return stats
+
+    def attacker_stats(self, top=10):
+        return self.attackers.to_dict(top)
+
+    def flush_stats(self):
+        """Persiste les compteurs de tous les leurres en une transaction."""
+        rows = [(lure_id, s.connections, None, s.last_connection, s.to_bytes())
+                for lure_id, s in list(self.stats.items())]
+        with self._write_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lure_stats (lure_id, connections, ips, last_connection, sketches) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def close(self):
+        self.flush_stats()
+        self._conn.close()
@@ -1,3 +1,6 @@
 from .signature_detector import SignatureDetector
 from .anomaly_detector import AnomalyDetector
-from .behavioral_detector import BehavioralDetector
\ No newline at end of file
+from .behavioral_detector import BehavioralDetector
+from .log_tailer import LogTailer
+from .profiles import ProfileEngine
+from .alert_aggregator import AlertAggregator, source_of
@@ -0,0 +1,158 @@
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from utils import metrics
+
+logger = logging.getLogger("ghostnet.alerts")
+
+ALERTS = metrics.counter("ghostnet_alerts_total", "Alertes par issue de l'agrégation (émise, regroupée, résumé)",
+                         ["outcome"])
+EMITTED = ALERTS.labels("emitted")
+SUPPRESSED = ALERTS.labels("suppressed")
+SUMMARIES = ALERTS.labels("summary")
+
+_IPV4 = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+
+
+def source_of(text):
+    """Première adresse IPv4 d'une ligne de log (source de l'alerte), None sinon."""
+    match = _IPV4.search(text)
+    return match.group(0) if match else None
+
+
+class _Entry:
+    __slots__ = ("alert", "count", "reported", "first_seen", "last_seen", "last_flush")
+
+    def __init__(self, alert, ts):
+        self.alert = alert
+        self.count = 1
+        self.reported = 1
+        self.first_seen = self.last_seen = self.last_flush = ts
+
+
+class AlertAggregator:
+    """Regroupe les alertes répétées avant leur émission (base, SIEM).
+
+    Les alertes sont indexées par (règle, source, leurre) dans un cache à durée
+    de vie : la première occurrence est émise aussitôt, les suivantes ne font
+    qu'incrémenter un compteur. Toutes les ``flush_interval`` secondes, chaque
+    clé ayant reçu des répétitions émet une alerte de synthèse (nombre, premier
+    et dernier horodatage) ; une clé sans activité depuis ``ttl`` secondes est
+    close après un dernier résumé. Pendant une attaque par force brute, une
+    alerte par ligne de log devient une alerte par intervalle.
+    """
+
+    def __init__(self, emit, ttl=300.0, flush_interval=60.0, max_entries=10000, clock=time.time):
+        self.emit = emit
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self.clock = clock
+        # Clés de la moins à la plus récemment active
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def submit(self, alert, rule, source=None, lure=None):
+        """Soumet une alerte ; retourne True si elle est émise, False si elle est regroupée."""
+        emit, summaries = self.admit(alert, rule, source, lure)
+        self._emit_all(summaries)
+        if emit:
+            self._send(alert)
+        return emit
+
+    def admit(self, alert, rule, source=None, lure=None):
+        """Comme ``submit``, sans rien émettre : retourne (émettre l'alerte ?, résumés à émettre).
+
+        Pour un appelant qui émet lui-même, par exemple le chemin asynchrone.
+        """
+        key = (rule, source, lure)
+        now = self.clock()
+        summaries = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.last_seen <= self.ttl:
+                entry.count += 1
+                entry.last_seen = now
+                self._entries.move_to_end(key)
+                SUPPRESSED.inc()
+                return False, summaries
+            if entry is not None:
+                summaries.append(self._close(key))
+            self._entries[key] = _Entry(alert, now)
+            while len(self._entries) > self.max_entries:
+                summaries.append(self._close(next(iter(self._entries))))
+        EMITTED.inc()
+        return True, [summary for summary in summaries if summary is not None]
+
+    def _close(self, key):
+        entry = self._entries.pop(key)
+        return self._summary(key, entry)
+
+    def _summary(self, key, entry):
+        # Résumé des répétitions regroupées depuis la dernière émission (None s'il n'y en a pas)
+        if entry.count == entry.reported:
+            return None
+        summary = dict(entry.alert, aggregated=True, count=entry.count, repeats=entry.count - entry.reported,
+                       first_seen=entry.first_seen, last_seen=entry.last_seen,
+                       rule=key[0], source=key[1], lure=key[2])
+        entry.reported = entry.count
+        SUMMARIES.inc()
+        return summary
+
+    def flush(self, force=False):
+        """Émet les résumés dus et clôt les clés expirées ; ``force`` résume et clôt tout.
+
+        Retourne le nombre de résumés émis.
+        """
+        now = self.clock()
+        pending = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if force or now - entry.last_seen > self.ttl:
+                    pending.append(self._close(key))
+                elif now - entry.last_flush >= self.flush_interval:
+                    entry.last_flush = now
+                    pending.append(self._summary(key, entry))
+        return self._emit_all(pending)
+
+    def _emit_all(self, summaries):
+        emitted = 0
+        for summary in summaries:
+            if summary is not None:
+                self._send(summary)
+                emitted += 1
+        return emitted
+
+    def _send(self, alert):
+        try:
+            self.emit(alert)
+        except Exception:
+            logger.exception("Échec de l'émission d'une alerte")
+
+    def _flush_loop(self):
+        while not self._stop.wait(min(self.flush_interval, self.ttl)):
+            self.flush()
+
+    def start(self):
+        """Émet les résumés périodiques dans un thread d'arrière-plan."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._flush_loop, name="ghostnet-alerts", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le thread périodique et émet les derniers résumés."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(force=True)
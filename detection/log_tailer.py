@@ -0,0 +1,243 @@
+import os
+import glob
+import json
+import time
+
+from utils import inotify
+
+DIR_EVENTS = (inotify.IN_MODIFY | inotify.IN_CLOSE_WRITE | inotify.IN_CREATE | inotify.IN_MOVED_TO
+              | inotify.IN_MOVED_FROM | inotify.IN_DELETE | inotify.IN_ATTRIB)
+
+
+class TailedFile:
+    """État de lecture d'un fichier suivi : descripteur ouvert, inode et position."""
+    __slots__ = ("path", "fd", "dev", "inode", "offset", "partial", "committed")
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+        self.dev = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+        # Position juste après la dernière ligne livrée : c'est elle qui est persistée
+        self.committed = 0
+
+    def open(self, offset=0):
+        """Ouvre le fichier courant à ``path`` ; retourne False s'il n'existe pas."""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        self.close()
+        st = os.fstat(fd)
+        self.fd, self.dev, self.inode = fd, st.st_dev, st.st_ino
+        self.offset = self.committed = offset if offset <= st.st_size else 0
+        self.partial = b""
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class LogTailer:
+    """Suivi de nombreux fichiers de logs, alimentant le pipeline de détection par lots.
+
+    Les répertoires parents sont surveillés par inotify (repli sur une
+    scrutation périodique si inotify est indisponible). Les fichiers sont lus
+    par gros blocs et découpés en lignes en mémoire. La rotation (nouvel inode
+    à ``path``) est gérée en vidant d'abord l'ancien descripteur, la troncature
+    en repartant du début. Les positions sont enregistrées dans un point de
+    reprise JSON après chaque lot livré : au redémarrage, la lecture reprend
+    exactement après la dernière ligne transmise.
+    """
+
+    def __init__(self, paths, on_batch, checkpoint_path=None, batch_size=1000, chunk_size=1024 * 1024,
+                 poll_interval=1.0, from_end=False):
+        """
+        Args:
+            paths (list): Fichiers à suivre (ex : /var/log/auth.log).
+            on_batch (callable): Reçoit une liste de (chemin, ligne).
+            checkpoint_path (str): Fichier JSON des positions, None pour ne pas persister.
+            batch_size (int): Nombre maximal de lignes par lot.
+            chunk_size (int): Taille des lectures.
+            poll_interval (float): Délai maximal entre deux vérifications complètes.
+            from_end (bool): Pour un fichier sans point de reprise, ignorer le contenu existant.
+        """
+        self.on_batch = on_batch
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.from_end = from_end
+        self.files = {os.path.abspath(p): TailedFile(os.path.abspath(p)) for p in paths}
+        self.stats = {"lines": 0, "batches": 0, "rotations": 0, "truncations": 0}
+        self._batch = []
+        self._pending = {}
+        self._running = False
+        self._notifier = None
+        self._restore()
+
+    def _restore(self):
+        state = {}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        for path, tailed in self.files.items():
+            saved = state.get(path)
+            if not tailed.open():
+                continue
+            if saved is None:
+                if self.from_end:
+                    tailed.offset = tailed.committed = os.fstat(tailed.fd).st_size
+                continue
+            if (saved["dev"], saved["inode"]) == (tailed.dev, tailed.inode):
+                tailed.open(saved["offset"])
+                continue
+            # Rotation pendant l'arrêt : on termine l'ancien fichier s'il est encore présent
+            rotated = self._find_rotated(path, saved["dev"], saved["inode"])
+            if rotated is not None:
+                old = TailedFile(rotated)
+                if old.open(saved["offset"]):
+                    self._drain(old, source=path)
+                    self._emit_partial(old, path)
+                    old.close()
+
+    @staticmethod
+    def _find_rotated(path, dev, inode):
+        for candidate in sorted(glob.glob(glob.escape(path) + ".*")):
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == (dev, inode):
+                return candidate
+        return None
+
+    def checkpoint(self):
+        """Écrit les positions de manière atomique (fichier temporaire puis renommage)."""
+        if not self.checkpoint_path:
+            return
+        state = {
+            path: {"dev": t.dev, "inode": t.inode, "offset": t.committed}
+            for path, t in self.files.items() if t.inode is not None
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _flush(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        pending, self._pending = self._pending, {}
+        self.on_batch(batch)
+        for tailed, position in pending.items():
+            tailed.committed = position
+        self.stats["batches"] += 1
+        self.stats["lines"] += len(batch)
+        self.checkpoint()
+
+    def _drain(self, tailed, source=None):
+        """Lit ``tailed`` jusqu'à la fin par blocs et découpe les lignes complètes en mémoire."""
+        source = source or tailed.path
+        batch_size = self.batch_size
+        while True:
+            chunk = os.pread(tailed.fd, self.chunk_size, tailed.offset)
+            if not chunk:
+                return
+            position = tailed.offset - len(tailed.partial)
+            tailed.offset += len(chunk)
+            lines = (tailed.partial + chunk).split(b"\n")
+            tailed.partial = lines.pop()
+            start = 0
+            while start < len(lines):
+                part = lines[start:start + batch_size - len(self._batch)]
+                start += len(part)
+                self._batch.extend((source, line.rstrip(b"\r").decode("utf-8", "replace")) for line in part)
+                position += sum(map(len, part)) + len(part)
+                self._pending[tailed] = position
+                if len(self._batch) >= batch_size:
+                    self._flush()
+            if len(chunk) < self.chunk_size:
+                return
+
+    def _emit_partial(self, tailed, source):
+        """Livre la dernière ligne sans saut de ligne d'un fichier abandonné (rotation)."""
+        if tailed.partial:
+            self._batch.append((source, tailed.partial.rstrip(b"\r").decode("utf-8", "replace")))
+            tailed.partial = b""
+
+    def poll(self, paths=None):
+        """Lit les nouvelles données des fichiers (tous par défaut) et livre les lots."""
+        for path in paths or list(self.files):
+            tailed = self.files[path]
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if tailed.fd is not None:
+                if st is not None and (st.st_dev, st.st_ino) != (tailed.dev, tailed.inode):
+                    # Rotation : l'ancien inode reste lisible par notre descripteur
+                    self._drain(tailed)
+                    self._emit_partial(tailed, path)
+                    self._flush()
+                    tailed.close()
+                    self.stats["rotations"] += 1
+                elif os.fstat(tailed.fd).st_size < tailed.offset:
+                    tailed.offset = tailed.committed = 0
+                    tailed.partial = b""
+                    self.stats["truncations"] += 1
+            if tailed.fd is None and (st is None or not tailed.open()):
+                continue
+            self._drain(tailed)
+        self._flush()
+
+    def _watch(self):
+        if not inotify.available():
+            return None
+        notifier = inotify.Inotify()
+        for directory in {os.path.dirname(p) for p in self.files}:
+            try:
+                notifier.add_watch(directory, DIR_EVENTS)
+            except OSError:
+                pass
+        return notifier
+
+    def run(self):
+        """Boucle de suivi jusqu'à ``stop`` (bloquant)."""
+        self._running = True
+        self._notifier = self._watch()
+        try:
+            self.poll()
+            last_full = time.monotonic()
+            while self._running:
+                if self._notifier is None:
+                    time.sleep(self.poll_interval)
+                    self.poll()
+                    continue
+                events = self._notifier.read_events(self.poll_interval)
+                changed = {os.path.join(d, name) for d, _, name in events if d and name}
+                targets = [p for p in self.files if p in changed]
+                if any(mask & inotify.IN_Q_OVERFLOW for _, mask, _ in events) \
+                        or time.monotonic() - last_full >= self.poll_interval:
+                    targets = None
+                    last_full = time.monotonic()
+                if targets is None or targets:
+                    self.poll(targets)
+        finally:
+            if self._notifier is not None:
+                self._notifier.close()
+                self._notifier = None
+            self._flush()
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        self._flush()
+        for tailed in self.files.values():
+            tailed.close()
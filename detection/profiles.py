@@ -0,0 +1,219 @@
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Dimensions des caractéristiques d'un profil
+NGRAM_BUCKETS = 256
+TIMING_BINS = 20
+NGRAM_ORDERS = (1, 2, 3)
+
+# Empreintes d'outils : sous-chaînes (en minuscules) reconnues dans les commandes,
+# agents utilisateurs ou bannières clients
+TOOL_SIGNATURES = [
+    ("nmap", ("nmap", "nse/")),
+    ("masscan", ("masscan",)),
+    ("zgrab", ("zgrab",)),
+    ("hydra", ("hydra",)),
+    ("medusa", ("medusa",)),
+    ("sqlmap", ("sqlmap",)),
+    ("nikto", ("nikto",)),
+    ("gobuster", ("gobuster", "dirbuster", "dirb/", "ffuf", "wfuzz")),
+    ("metasploit", ("metasploit", "meterpreter", "msf")),
+    ("curl", ("curl",)),
+    ("wget", ("wget",)),
+    ("python", ("python-requests", "python-urllib", "paramiko", "aiohttp")),
+    ("libssh", ("libssh", "go-http-client", "ssh-2.0-go")),
+    ("busybox", ("busybox", "/bin/busybox", "mirai")),
+    ("netcat", ("nc -e", "ncat", "netcat")),
+    ("miner", ("xmrig", "minerd", "stratum+tcp")),
+]
+N_TOOLS = len(TOOL_SIGNATURES)
+
+# Poids des blocs dans le vecteur de comparaison (séquences, rythme, outils)
+WEIGHTS = (1.0, 0.5, 0.5)
+
+
+def _bucket(token):
+    # crc32 : stable d'un processus à l'autre (contrairement à hash()), donc comparable entre exécutions
+    return zlib.crc32(token.encode("utf-8")) % NGRAM_BUCKETS
+
+
+def timing_bin(gap):
+    """Case logarithmique d'un intervalle (en secondes) : < 1 ms, puis doublement jusqu'à ~9 min."""
+    if gap < 0.001:
+        return 0
+    return min(TIMING_BINS - 1, int(np.log2(gap * 1000)) + 1)
+
+
+def tool_flags(text):
+    """Indices des outils reconnus dans un texte."""
+    lowered = text.lower()
+    return [i for i, (_, patterns) in enumerate(TOOL_SIGNATURES) if any(p in lowered for p in patterns)]
+
+
+class ProfileEngine:
+    """Profils d'attaquants par session, en tableaux NumPy de taille fixe, et regroupement incrémental.
+
+    Chaque session (source, identifiant) occupe une ligne de tableaux préalloués
+    (struct-of-arrays, comme la FlowTable) : compteurs de n-grammes d'actions
+    hachés, histogramme des intervalles entre actions et outils reconnus. Une
+    session inactive depuis ``session_timeout`` est close ; son profil est alors
+    rattaché au centroïde le plus proche (similarité cosinus, un seul produit
+    matrice-vecteur) ou fonde un nouveau groupe s'il n'est proche d'aucun.
+    Aucune comparaison deux à deux entre profils n'est faite.
+    """
+
+    def __init__(self, capacity=10000, session_timeout=1800.0, max_clusters=256, similarity=0.6,
+                 on_profile=None):
+        self.capacity = capacity
+        self.session_timeout = session_timeout
+        self.max_clusters = max_clusters
+        self.similarity = similarity
+        self.on_profile = on_profile
+        self.dimension = NGRAM_BUCKETS + TIMING_BINS + N_TOOLS
+
+        self.ngrams = np.zeros((capacity, NGRAM_BUCKETS), dtype=np.float32)
+        self.timing = np.zeros((capacity, TIMING_BINS), dtype=np.float32)
+        self.tools = np.zeros((capacity, N_TOOLS), dtype=np.float32)
+        self.events = np.zeros(capacity, dtype=np.int64)
+        self.first_seen = np.zeros(capacity)
+        self.last_seen = np.zeros(capacity)
+        self.history = [()] * capacity
+        self.keys = [None] * capacity
+        # Sessions ouvertes, de la moins à la plus récemment active
+        self.index = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+
+        self.centroids = np.zeros((max_clusters, self.dimension), dtype=np.float32)
+        self.cluster_sizes = np.zeros(max_clusters, dtype=np.int64)
+        self.cluster_tools = np.zeros((max_clusters, N_TOOLS), dtype=np.int64)
+        self.n_clusters = 0
+        self.profiles = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def observe(self, source, action, ts=None, session=None):
+        """Ajoute une action (commande, requête...) à la session courante de ``source``.
+
+        Retourne l'emplacement du profil de session.
+        """
+        ts = time.time() if ts is None else ts
+        self.expire(ts)
+        key = (source, session)
+        slot = self.index.get(key)
+        if slot is None:
+            slot = self._open(key, ts)
+        else:
+            self.index.move_to_end(key)
+            self.timing[slot, timing_bin(ts - self.last_seen[slot])] += 1
+
+        action = str(action)
+        # Jeton d'action : premier mot (nom de commande), n-grammes sur les derniers jetons
+        token = action.split(None, 1)[0].lower() if action.strip() else ""
+        history = self.history[slot][-(max(NGRAM_ORDERS) - 1):] + (token,)
+        row = self.ngrams[slot]
+        for order in NGRAM_ORDERS:
+            if len(history) >= order:
+                row[_bucket(" ".join(history[-order:]))] += 1
+        self.history[slot] = history
+        for tool in tool_flags(action):
+            self.tools[slot, tool] = 1
+        self.events[slot] += 1
+        self.last_seen[slot] = ts
+        return slot
+
+    def _open(self, key, ts):
+        if not self._free:
+            # Capacité atteinte : la session la moins récemment active est close
+            self.close(next(iter(self.index)))
+        slot = self._free.pop()
+        self.ngrams[slot] = 0
+        self.timing[slot] = 0
+        self.tools[slot] = 0
+        self.events[slot] = 0
+        self.first_seen[slot] = self.last_seen[slot] = ts
+        self.history[slot] = ()
+        self.keys[slot] = key
+        self.index[key] = slot
+        return slot
+
+    def vectors(self, slots):
+        """Vecteurs de comparaison (normés) d'un ensemble d'emplacements."""
+        slots = np.asarray(slots)
+        ngrams = np.sqrt(self.ngrams[slots])
+        timing = self.timing[slots]
+        blocks = []
+        for block, weight in zip((ngrams, timing, self.tools[slots]), WEIGHTS):
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            blocks.append(weight * block / np.maximum(norms, 1e-12))
+        matrix = np.hstack(blocks)
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    def assign(self, vector):
+        """Rattache un vecteur au groupe le plus proche (ou en crée un) ; retourne (groupe, similarité)."""
+        if self.n_clusters:
+            centroids = self.centroids[:self.n_clusters]
+            similarities = centroids @ vector / np.maximum(np.linalg.norm(centroids, axis=1), 1e-12)
+            best = int(similarities.argmax())
+            best_similarity = float(similarities[best])
+            if best_similarity >= self.similarity or self.n_clusters == self.max_clusters:
+                # Moyenne glissante du centroïde
+                self.cluster_sizes[best] += 1
+                self.centroids[best] += (vector - self.centroids[best]) / self.cluster_sizes[best]
+                return best, best_similarity
+        cluster = self.n_clusters
+        self.centroids[cluster] = vector
+        self.cluster_sizes[cluster] = 1
+        self.n_clusters += 1
+        return cluster, 1.0
+
+    def close(self, key):
+        """Clôt une session : son profil est regroupé, transmis à ``on_profile`` puis libéré."""
+        slot = self.index.pop(key)
+        cluster, similarity = self.assign(self.vectors([slot])[0])
+        tools = [TOOL_SIGNATURES[i][0] for i in np.flatnonzero(self.tools[slot])]
+        self.cluster_tools[cluster] += self.tools[slot].astype(np.int64)
+        profile = {
+            "source": key[0],
+            "session": key[1],
+            "events": int(self.events[slot]),
+            "first_seen": float(self.first_seen[slot]),
+            "last_seen": float(self.last_seen[slot]),
+            "tools": tools,
+            "cluster": cluster,
+            "similarity": similarity,
+        }
+        self.keys[slot] = None
+        self.history[slot] = ()
+        self._free.append(slot)
+        self.profiles += 1
+        if self.on_profile is not None:
+            self.on_profile(profile)
+        return profile
+
+    def expire(self, now):
+        """Clôt les sessions inactives depuis plus de ``session_timeout`` ; retourne leurs profils."""
+        closed = []
+        limit = now - self.session_timeout
+        while self.index:
+            key, slot = next(iter(self.index.items()))
+            if self.last_seen[slot] > limit:
+                break
+            closed.append(self.close(key))
+        return closed
+
+    def flush(self):
+        """Clôt toutes les sessions ouvertes (arrêt, rejeu terminé)."""
+        return [self.close(key) for key in list(self.index)]
+
+    def clusters(self):
+        """Résumé des groupes : taille et outils les plus fréquents."""
+        result = []
+        for cluster in range(self.n_clusters):
+            counts = self.cluster_tools[cluster]
+            top = [TOOL_SIGNATURES[i][0] for i in np.argsort(-counts)[:3] if counts[i]]
+            result.append({"cluster": cluster, "profiles": int(self.cluster_sizes[cluster]), "tools": top})
+        return sorted(result, key=lambda c: -c["profiles"])
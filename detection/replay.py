@@ -0,0 +1,217 @@
+import os
+import re
+import gzip
+import time
+from multiprocessing import Pool
+
+from .signature_detector import SignatureDetector
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Jeu de règles compilé, installé une seule fois par processus de travail
+_rules = None
+
+
+class CompiledRules:
+    """Jeu de signatures compilé pour l'analyse de gros volumes.
+
+    Les règles sont appliquées à un bloc entier de logs plutôt qu'à chaque
+    ligne : les motifs littéraux sont cherchés par ``bytes.find`` dans le bloc
+    passé en minuscules (casse ASCII), les expressions régulières par
+    ``finditer``. Chaque ligne retient la première règle, dans l'ordre du jeu,
+    comme ``SignatureDetector.analyze``.
+    """
+
+    def __init__(self, signatures):
+        """
+        Args:
+            signatures (list): Dictionnaires ``id``, ``pattern``, ``description`` et,
+                optionnellement, ``regex`` (True si le motif est une expression régulière).
+        """
+        self.signatures = list(signatures)
+        self.matchers = []
+        for sig in self.signatures:
+            pattern = sig["pattern"].encode("utf-8")
+            if sig.get("regex"):
+                self.matchers.append((False, re.compile(pattern, re.IGNORECASE)))
+            else:
+                self.matchers.append((True, pattern.lower()))
+        self.has_literals = any(literal for literal, _ in self.matchers)
+
+    def __getstate__(self):
+        return self.signatures
+
+    def __setstate__(self, signatures):
+        self.__init__(signatures)
+
+    def _hits(self, data):
+        """Associe le début de chaque ligne détectée à l'indice de sa première règle."""
+        hits = {}
+        lowered = data.lower() if self.has_literals else None
+        for index, (literal, matcher) in enumerate(self.matchers):
+            if literal:
+                pos = lowered.find(matcher)
+                while pos != -1:
+                    hits.setdefault(data.rfind(b"\n", 0, pos) + 1, index)
+                    line_end = data.find(b"\n", pos)
+                    if line_end == -1:
+                        break
+                    pos = lowered.find(matcher, line_end + 1)
+            else:
+                next_line = 0
+                for m in matcher.finditer(data):
+                    pos = m.start()
+                    if pos < next_line:
+                        continue
+                    hits.setdefault(data.rfind(b"\n", 0, pos) + 1, index)
+                    line_end = data.find(b"\n", pos)
+                    if line_end == -1:
+                        break
+                    next_line = line_end + 1
+        return hits
+
+    def scan(self, data):
+        """Analyse un bloc de lignes complètes.
+
+        Returns:
+            tuple: (nombre de lignes, liste de (numéro de ligne relatif, signature, ligne)).
+        """
+        hits = self._hits(data)
+        matches = []
+        line_no = counted = 0
+        for line_start in sorted(hits):
+            line_no += data.count(b"\n", counted, line_start)
+            counted = line_start
+            line_end = data.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = len(data)
+            line = data[line_start:line_end].rstrip(b"\r")
+            matches.append((line_no, self.signatures[hits[line_start]], line.decode("utf-8", "replace")))
+        lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+        return lines, matches
+
+
+def _init_worker(rules):
+    global _rules
+    _rules = rules
+
+
+def plan_chunks(paths, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Découpe les fichiers en tâches (chemin, début, fin).
+
+    Les fichiers texte sont découpés en plages d'octets ; un fichier gzip ne se
+    découpe pas et forme une seule tâche (fin = None).
+    """
+    tasks = []
+    for path in paths:
+        if path.endswith(".gz"):
+            tasks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_size):
+            tasks.append((path, start, min(start + chunk_size, size)))
+    return tasks
+
+
+def _read_range(path, start, end):
+    """Lit les lignes qui commencent dans [start, end)."""
+    with open(path, "rb") as f:
+        if start:
+            # La ligne à cheval sur la frontière appartient au bloc précédent
+            f.seek(start - 1)
+            f.readline()
+            start = f.tell()
+        if start >= end:
+            return b""
+        data = f.read(end - start)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+        return data
+
+
+def _run_task(task):
+    path, start, end = task
+    cpu = time.process_time()
+    if end is not None:
+        lines, matches = _rules.scan(_read_range(path, start, end))
+    else:
+        lines, matches, tail = 0, [], b""
+        with gzip.open(path, "rb") as f:
+            while True:
+                block = f.read(DEFAULT_CHUNK_SIZE)
+                data = tail + block
+                if block:
+                    cut = data.rfind(b"\n") + 1
+                    data, tail = data[:cut], data[cut:]
+                count, found = _rules.scan(data)
+                matches.extend((lines + n, sig, line) for n, sig, line in found)
+                lines += count
+                if not block:
+                    break
+    return lines, matches, time.process_time() - cpu
+
+
+def replay(paths, signatures=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, on_match=None):
+    """Rejoue la détection par signatures sur des journaux archivés.
+
+    Les blocs sont analysés en parallèle, puis les résultats sont fusionnés dans
+    l'ordre des fichiers et des lignes.
+
+    Args:
+        paths (list): Fichiers texte ou .gz.
+        signatures (list): Règles au format de ``SignatureDetector.signatures``
+            (règles par défaut si None).
+        workers (int): Nombre de processus (nombre de cœurs par défaut, 0 pour
+            tout traiter dans le processus courant).
+        on_match (callable): Reçoit chaque détection, dans l'ordre.
+
+    Returns:
+        dict: Statistiques : lignes, détections, durée, débit global et par cœur.
+    """
+    rules = CompiledRules(signatures if signatures is not None else SignatureDetector().signatures)
+    tasks = plan_chunks(paths, chunk_size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    started = time.perf_counter()
+    if workers:
+        pool = Pool(workers, initializer=_init_worker, initargs=(rules,))
+        results = pool.imap(_run_task, tasks)
+    else:
+        pool = None
+        _init_worker(rules)
+        results = map(_run_task, tasks)
+
+    total_lines = detections = 0
+    cpu_time = 0.0
+    file_lines = {}
+    try:
+        for (path, _, _), (lines, matches, cpu) in zip(tasks, results):
+            base = file_lines.get(path, 0)
+            for line_no, sig, line in matches:
+                detections += 1
+                if on_match:
+                    on_match({
+                        "file": path, "line": base + line_no + 1, "rule": sig["id"],
+                        "description": sig["description"], "log": line,
+                    })
+            file_lines[path] = base + lines
+            total_lines += lines
+            cpu_time += cpu
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(paths),
+        "chunks": len(tasks),
+        "workers": workers or 1,
+        "lines": total_lines,
+        "detections": detections,
+        "seconds": elapsed,
+        "lines_per_second": total_lines / elapsed if elapsed else 0.0,
+        # Débit rapporté au temps CPU réellement consommé par les processus d'analyse
+        "lines_per_second_per_core": total_lines / cpu_time if cpu_time else 0.0,
+    }
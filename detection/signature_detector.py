@@ -1,19 +1,59 @@
+from time import perf_counter
+
+
 class SignatureDetector:
     """Détecteur par signature pour identifier des attaques connues."""
-    def __init__(self):
+    def __init__(self, honeytokens=None):
         # Exemple de signatures connues
         self.signatures = [
             {"id": 1, "pattern": "Failed password", "description": "Tentative de connexion SSH échouée"},
             {"id": 2, "pattern": "SQL injection", "description": "Tentative d'injection SQL"}
         ]
+        # Registre des honeytokens émis (lure_generator.HoneytokenRegistry), optionnel
+        self.honeytokens = honeytokens
+        # Temps de correspondance par règle : id -> [évaluations, secondes, correspondances]
+        self.rule_timings = {}
+
+    def _record(self, rule_id, elapsed, matched):
+        stats = self.rule_timings.get(rule_id)
+        if stats is None:
+            stats = self.rule_timings.setdefault(rule_id, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += matched
+
+    def rule_stats(self):
+        """Temps cumulé et moyen par règle, de la plus coûteuse à la moins coûteuse."""
+        result = []
+        for rule_id, (count, seconds, matches) in self.rule_timings.items():
+            result.append({"rule": rule_id, "evaluations": count, "matches": matches,
+                           "total_seconds": seconds, "mean_seconds": seconds / count if count else 0.0})
+        return sorted(result, key=lambda r: r["total_seconds"], reverse=True)
 
     def analyze(self, log_entry):
         """Analyse une entrée de log et retourne une alerte si une signature est détectée."""
+        if self.honeytokens is not None:
+            start = perf_counter()
+            token = self.honeytokens.match_line(log_entry)
+            self._record("honeytokens", perf_counter() - start, token is not None)
+            if token is not None:
+                return {
+                    "detected": True,
+                    "type": "honeytoken",
+                    "description": f"Utilisation d'un honeytoken ({token['kind']}) du leurre {token['lure_id']}",
+                    "lure_id": token["lure_id"],
+                    "rule_id": "honeytokens"
+                }
+        lowered = log_entry.lower()
         for sig in self.signatures:
-            if sig["pattern"].lower() in log_entry.lower():
+            start = perf_counter()
+            matched = sig["pattern"].lower() in lowered
+            self._record(sig["id"], perf_counter() - start, matched)
+            if matched:
                 return {
                     "detected": True,
                     "type": "signature",
-                    "description": sig["description"]
+                    "description": sig["description"],
+                    "rule_id": sig["id"]
                 }
-        return {"detected": False}
\ No newline at end of file
+        return {"detected": False}
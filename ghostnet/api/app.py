@@ -8,7 +8,7 @@ permettant de contrôler les honeypots, récupérer les données de détection
 et gérer la configuration.
 """
 
-from flask import Flask, jsonify, request, abort
+from flask import Flask, Response, jsonify, request, abort, g
 from flask_restful import Api, Resource
 from flask_cors import CORS
 import os
@@ -17,17 +17,16 @@ import yaml
 import logging
 import datetime
 import json
+import time
 from typing import Dict, List, Any, Optional, Union
 
-# Configuration des logs
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
-    handlers=[
-        logging.FileHandler("logs/api.log"),
-        logging.StreamHandler()
-    ]
-)
+from database import DatabaseManager, LureRegistry
+from lure_generator import LureGenerator
+from utils import setup_logger, metrics, profiling
+from config.service import get_config_service, validate_api_config
+
+# Configuration des logs : écriture console et fichier déportée dans un thread (JSON lines)
+setup_logger("ghostnet", level=logging.INFO, log_file="logs/api.log")
 logger = logging.getLogger("ghostnet.api")
 
 # Initialisation de l'application Flask
@@ -38,27 +37,42 @@ api = Api(app)
 # Charger la configuration
 def load_config(config_path: str) -> dict:
     """
-    Charge la configuration depuis un fichier YAML.
+    Retourne l'instantané de configuration partagé pour un fichier YAML.
+    
+    Le fichier n'est parsé qu'une fois par processus ; il est ensuite surveillé
+    et chaque version valide remplace l'instantané (voir ``config.service``).
     
     Args:
         config_path: Chemin vers le fichier de configuration
         
     Returns:
-        Dictionnaire de configuration
+        Dictionnaire de configuration (immuable)
     """
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+    service = get_config_service(config_path, [validate_api_config], watch=True)
+    if service.version:
         logger.info(f"Configuration chargée depuis {config_path}")
-        return config
-    except Exception as e:
-        logger.error(f"Erreur lors du chargement de la configuration: {e}")
-        return {}
+    return service.snapshot
 
 # Configuration par défaut
 DEFAULT_CONFIG_PATH = os.environ.get("GHOSTNET_CONFIG", "config/config.yaml")
 config = load_config(DEFAULT_CONFIG_PATH)
 
+def _on_config_change(new_config: dict, old_config: dict) -> None:
+    """Remplace la configuration servie par l'API par le nouvel instantané."""
+    global config
+    config = new_config
+    logger.info(f"Configuration rechargée depuis {DEFAULT_CONFIG_PATH}")
+
+get_config_service(DEFAULT_CONFIG_PATH).subscribe(_on_config_change)
+
+# Inventaire des leurres partagé avec le générateur (persisté dans SQLite)
+lure_registry = LureRegistry()
+lure_generator = LureGenerator(registry=lure_registry)
+db = DatabaseManager()
+
+LURE_SUMMARY_FIELDS = ["id", "name", "status", "type", "service", "port", "created_at"]
+LURE_UPDATABLE_FIELDS = ["name", "status", "port"]
+
 # Fonctions utilitaires pour l'API
 def get_api_config() -> dict:
     """
@@ -106,12 +120,13 @@ class StatusResource(Resource):
         return jsonify({
             "status": "online",
             "version": config.get("general", {}).get("version", "1.0.0"),
-            "uptime": "TODO",  # À implémenter
+            "uptime": round(metrics.REGISTRY.uptime(), 1),
             "modules": {
                 "detection": config.get("detection", {}).get("enabled", True),
                 "lure_generator": config.get("lure_generator", {}).get("enabled", True),
                 "ai_engine": config.get("ai_engine", {}).get("enabled", True),
             },
+            "metrics": metrics.REGISTRY.summary(),
             "timestamp": datetime.datetime.now().isoformat()
         })
 
@@ -166,7 +181,7 @@ class ConfigResource(Resource):
             
         # On ne renvoie pas les informations sensibles
         safe_config = {
-            "general": config.get("general", {}),
+            "general": dict(config.get("general", {})),
             "detection": config.get("detection", {}),
             "lure_generator": config.get("lure_generator", {}),
             "network_manager": config.get("network_manager", {}),
@@ -193,30 +208,13 @@ class LuresResource(Resource):
         if not validate_auth(request):
             abort(401, description="Non autorisé")
             
-        # TODO: Récupérer les leurres depuis le générateur de leurres
-        # Pour l'instant, on retourne un exemple
+        lures = [
+            {field: lure.get(field) for field in LURE_SUMMARY_FIELDS}
+            for lure in lure_registry.list()
+        ]
         return jsonify({
-            "lures": [
-                {
-                    "id": "lure-001",
-                    "name": "SSH Server",
-                    "status": "active",
-                    "type": "service",
-                    "service": "ssh",
-                    "port": 22,
-                    "created_at": "2025-04-14T10:00:00Z"
-                },
-                {
-                    "id": "lure-002",
-                    "name": "Web Server",
-                    "status": "active",
-                    "type": "service",
-                    "service": "http",
-                    "port": 80,
-                    "created_at": "2025-04-14T10:05:00Z"
-                }
-            ],
-            "total": 2
+            "lures": lures,
+            "total": len(lures)
         })
     
     def post(self):
@@ -239,17 +237,19 @@ class LuresResource(Resource):
             if field not in data:
                 abort(400, description=f"Champ requis manquant: {field}")
         
-        # TODO: Créer le leurre via le générateur de leurres
-        # Pour l'instant, on retourne un exemple
-        new_lure = {
-            "id": "lure-003",
-            "name": data["name"],
-            "status": "active",
-            "type": data["type"],
-            "service": data["service"],
-            "port": data.get("port", 0),
-            "created_at": datetime.datetime.now().isoformat()
-        }
+        if data["type"] == "service":
+            created = lure_generator.generate_service_lure(
+                port=data.get("port"), name=data["name"], service=data["service"]
+            )
+            lure = lure_registry.get(created["id"])
+        else:
+            lure = lure_registry.add({
+                "name": data["name"],
+                "type": data["type"],
+                "service": data["service"],
+                "port": data.get("port"),
+            })
+        new_lure = {field: lure.get(field) for field in LURE_SUMMARY_FIELDS}
         
         logger.info(f"Nouveau leurre créé: {new_lure['id']}")
         return jsonify(new_lure), 201
@@ -270,32 +270,11 @@ class LureDetailResource(Resource):
         if not validate_auth(request):
             abort(401, description="Non autorisé")
             
-        # TODO: Récupérer le leurre depuis le générateur de leurres
-        # Pour l'instant, on retourne un exemple
-        if lure_id == "lure-001":
-            return jsonify({
-                "id": "lure-001",
-                "name": "SSH Server",
-                "status": "active",
-                "type": "service",
-                "service": "ssh",
-                "port": 22,
-                "created_at": "2025-04-14T10:00:00Z",
-                "stats": {
-                    "connections": 15,
-                    "last_connection": "2025-04-14T15:30:00Z",
-                    "unique_ips": 3
-                },
-                "configuration": {
-                    "banner": "OpenSSH 8.2p1 Ubuntu",
-                    "credentials": [
-                        {"username": "root", "password": "password123"},
-                        {"username": "admin", "password": "admin123"}
-                    ]
-                }
-            })
-        else:
+        lure = lure_registry.get(lure_id)
+        if lure is None:
             abort(404, description="Leurre non trouvé")
+        
+        return jsonify(dict(lure, stats=lure_registry.get_stats(lure_id)))
     
     def put(self, lure_id):
         """
@@ -314,23 +293,13 @@ class LureDetailResource(Resource):
         if not data:
             abort(400, description="Données JSON requises")
             
-        # TODO: Mettre à jour le leurre via le générateur de leurres
-        # Pour l'instant, on retourne un exemple
-        if lure_id == "lure-001":
-            updated_lure = {
-                "id": "lure-001",
-                "name": data.get("name", "SSH Server"),
-                "status": data.get("status", "active"),
-                "type": "service",
-                "service": "ssh",
-                "port": data.get("port", 22),
-                "created_at": "2025-04-14T10:00:00Z",
-                "updated_at": datetime.datetime.now().isoformat()
-            }
-            logger.info(f"Leurre mis à jour: {lure_id}")
-            return jsonify(updated_lure)
-        else:
+        fields = {field: data[field] for field in LURE_UPDATABLE_FIELDS if field in data}
+        updated_lure = lure_registry.update(lure_id, **fields)
+        if updated_lure is None:
             abort(404, description="Leurre non trouvé")
+        
+        logger.info(f"Leurre mis à jour: {lure_id}")
+        return jsonify(updated_lure)
     
     def delete(self, lure_id):
         """
@@ -345,13 +314,11 @@ class LureDetailResource(Resource):
         if not validate_auth(request):
             abort(401, description="Non autorisé")
             
-        # TODO: Supprimer le leurre via le générateur de leurres
-        # Pour l'instant, on retourne un exemple
-        if lure_id in ["lure-001", "lure-002"]:
-            logger.info(f"Leurre supprimé: {lure_id}")
-            return jsonify({"message": f"Leurre {lure_id} supprimé avec succès"}), 200
-        else:
+        if not lure_registry.remove(lure_id):
             abort(404, description="Leurre non trouvé")
+        
+        logger.info(f"Leurre supprimé: {lure_id}")
+        return jsonify({"message": f"Leurre {lure_id} supprimé avec succès"}), 200
 
 class AttackersResource(Resource):
     """Ressource pour accéder aux informations sur les attaquants."""
@@ -366,27 +333,15 @@ class AttackersResource(Resource):
         if not validate_auth(request):
             abort(401, description="Non autorisé")
             
-        # TODO: Récupérer les attaquants depuis le système de stockage
-        # Pour l'instant, on retourne un exemple
+        page = max(1, request.args.get("page", 1, type=int))
+        page_size = min(100, max(1, request.args.get("page_size", 10, type=int)))
+        # La géolocalisation est attachée à la fiche lors de l'enregistrement de l'alerte
+        attackers, total = db.get_attackers(limit=page_size, offset=(page - 1) * page_size)
         return jsonify({
-            "attackers": [
-                {
-                    "ip": "192.168.1.100",
-                    "first_seen": "2025-04-14T12:00:00Z",
-                    "last_seen": "2025-04-14T15:30:00Z",
-                    "attacks": 15,
-                    "types": ["ssh_bruteforce", "port_scan"],
-                    "severity": "high",
-                    "geo": {
-                        "country": "Unknown",
-                        "city": "Unknown",
-                        "coordinates": [0, 0]
-                    }
-                }
-            ],
-            "total": 1,
-            "page": 1,
-            "page_size": 10
+            "attackers": attackers,
+            "total": total,
+            "page": page,
+            "page_size": page_size
         })
 
 class ReportsResource(Resource):
@@ -453,7 +408,91 @@ class ReportsResource(Resource):
         logger.info(f"Nouveau rapport généré: {new_report['id']}")
         return jsonify(new_report), 202  # Accepted
 
+class ProfilingResource(Resource):
+    """Ressource pour l'instrumentation à la demande (profil, événements lents, temps par règle).
+    
+    Les mesures vivent dans le processus de traitement (``python core.py``) :
+    chaque requête lui est transmise par son socket de contrôle.
+    """
+    
+    def _forward(self, command: Dict[str, Any]):
+        path = config.get("general", {}).get("control_socket", profiling.CONTROL_SOCKET)
+        try:
+            status, body = profiling.send_command(command, path=path)
+        except OSError as e:
+            return jsonify({"error": f"Processus de traitement injoignable ({path}) : {e}"}), 503
+        return jsonify(body), status
+    
+    def get(self):
+        """
+        Récupère l'état de la capture et les mesures d'instrumentation.
+        
+        Returns:
+            Capture en cours ou dernière capture, événements les plus lents et
+            temps de correspondance par règle
+        """
+        if not validate_auth(request):
+            abort(401, description="Non autorisé")
+        return self._forward({"op": "report", "limit": request.args.get("limit", 20, type=int)})
+    
+    def post(self):
+        """
+        Démarre une capture de profil pour une durée fixe, sans redémarrage.
+        
+        Corps JSON optionnel : ``mode`` (``sampling`` ou ``cprofile``) et
+        ``duration`` en secondes (1 à 300). Le fichier est écrit à la fin de
+        la capture ; son chemin figure dans la réponse.
+        
+        Returns:
+            État de la capture démarrée
+        """
+        if not validate_auth(request):
+            abort(401, description="Non autorisé")
+        data = request.get_json(silent=True) or {}
+        response, status = self._forward({"op": "start", "duration": data.get("duration", 30),
+                                          "mode": data.get("mode", "sampling")})
+        if status == 202:
+            logger.warning("Capture de profil démarrée : %s", response.get_json()["path"])
+        return response, status
+    
+    def delete(self):
+        """
+        Arrête la capture en cours et écrit le fichier immédiatement.
+        
+        Returns:
+            Description de la dernière capture
+        """
+        if not validate_auth(request):
+            abort(401, description="Non autorisé")
+        return self._forward({"op": "stop"})
+
 # Enregistrement des routes
+# Métriques au format texte Prometheus et durée des requêtes de l'API
+API_REQUEST_SECONDS = metrics.histogram(
+    "ghostnet_api_request_seconds", "Durée des requêtes de l'API", ["endpoint", "method"])
+
+@app.before_request
+def _start_timer() -> None:
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_duration(response: Response) -> Response:
+    start = g.pop("request_start", None)
+    if start is not None:
+        API_REQUEST_SECONDS.labels(request.endpoint or "unknown", request.method).observe(
+            time.perf_counter() - start)
+    return response
+
+@app.route("/metrics")
+def metrics_endpoint() -> Response:
+    """
+    Expose les métriques du processus au format texte Prometheus.
+    
+    Returns:
+        Réponse text/plain (version 0.0.4 du format d'exposition)
+    """
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
 api.add_resource(StatusResource, "/api/status")
 api.add_resource(AlertsResource, "/api/alerts")
 api.add_resource(ConfigResource, "/api/config")
@@ -461,6 +500,7 @@ api.add_resource(LuresResource, "/api/lures")
 api.add_resource(LureDetailResource, "/api/lures/<string:lure_id>")
 api.add_resource(AttackersResource, "/api/attackers")
 api.add_resource(ReportsResource, "/api/reports")
+api.add_resource(ProfilingResource, "/api/profiling")
 
 # Point d'entrée principal pour servir l'API
 def main():
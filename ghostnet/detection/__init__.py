@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de détection pour GhostNet.
+
+Ce package expose les outils en ligne de commande de détection, notamment le
+rejeu des règles de signatures sur des journaux archivés (``ghostnet-detect``).
+"""
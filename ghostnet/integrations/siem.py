@@ -13,13 +13,48 @@ import json
 import logging
 import datetime
 import socket
-from typing import Dict, List, Any, Optional, Union
+import time
+import functools
+from typing import Dict, List, Any, Optional, Union, Callable
 import requests
 from abc import ABC, abstractmethod
 
+from utils import metrics
+
 # Configuration des logs
 logger = logging.getLogger("ghostnet.integrations.siem")
 
+SIEM_SENDS = metrics.counter(
+    "ghostnet_siem_sends_total", "Envois au SIEM, par statut", ["sink", "kind", "status"])
+SIEM_SEND_SECONDS = metrics.histogram(
+    "ghostnet_siem_send_seconds", "Durée des envois au SIEM", ["sink", "kind"])
+
+
+def instrumented(kind: str) -> Callable:
+    """
+    Décore une méthode d'envoi pour mesurer sa durée et compter ses succès/échecs.
+    
+    Args:
+        kind: Nature de l'envoi ("event" ou "alert")
+        
+    Returns:
+        Décorateur
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            sink = type(self).__name__
+            start = time.perf_counter()
+            ok = False
+            try:
+                ok = method(self, *args, **kwargs)
+                return ok
+            finally:
+                SIEM_SEND_SECONDS.labels(sink, kind).observe(time.perf_counter() - start)
+                SIEM_SENDS.labels(sink, kind, "ok" if ok else "error").inc()
+        return wrapper
+    return decorator
+
 class SIEMIntegration(ABC):
     """
     Classe abstraite pour l'intégration avec un SIEM.
@@ -91,6 +126,7 @@ class ElasticSIEM(SIEMIntegration):
         
         logger.info(f"Intégration Elasticsearch initialisée: {host}:{port}/{index}")
     
+    @instrumented("event")
     def send_event(self, event: Dict[str, Any]) -> bool:
         """
         Envoie un événement à Elasticsearch.
@@ -124,6 +160,7 @@ class ElasticSIEM(SIEMIntegration):
             logger.error(f"Exception lors de l'envoi de l'événement à Elasticsearch: {e}")
             return False
     
+    @instrumented("alert")
     def send_alert(self, alert: Dict[str, Any]) -> bool:
         """
         Envoie une alerte à Elasticsearch.
@@ -201,6 +238,7 @@ class SplunkSIEM(SIEMIntegration):
         
         logger.info(f"Intégration Splunk initialisée: {host}:{port}")
     
+    @instrumented("event")
     def send_event(self, event: Dict[str, Any]) -> bool:
         """
         Envoie un événement à Splunk.
@@ -245,6 +283,7 @@ class SplunkSIEM(SIEMIntegration):
             logger.error(f"Exception lors de l'envoi de l'événement à Splunk: {e}")
             return False
     
+    @instrumented("alert")
     def send_alert(self, alert: Dict[str, Any]) -> bool:
         """
         Envoie une alerte à Splunk.
@@ -408,6 +447,7 @@ class SyslogSIEM(SIEMIntegration):
             logger.error(f"Exception lors de l'envoi du message à Syslog: {e}")
             return False
     
+    @instrumented("event")
     def send_event(self, event: Dict[str, Any]) -> bool:
         """
         Envoie un événement au serveur Syslog.
@@ -443,6 +483,7 @@ class SyslogSIEM(SIEMIntegration):
             logger.error(f"Exception lors de l'envoi de l'événement à Syslog: {e}")
             return False
     
+    @instrumented("alert")
     def send_alert(self, alert: Dict[str, Any]) -> bool:
         """
         Envoie une alerte au serveur Syslog.
@@ -0,0 +1,67 @@
+import time
+import asyncio
+
+import aiohttp
+
+from .siem import SIEM_SENDS, SIEM_SEND_SECONDS
+
+ALERTS_OK = SIEM_SENDS.labels("rest_async", "alert", "ok")
+ALERTS_HTTP_ERROR = SIEM_SENDS.labels("rest_async", "alert", "http_error")
+ALERTS_ERROR = SIEM_SENDS.labels("rest_async", "alert", "error")
+ALERT_SECONDS = SIEM_SEND_SECONDS.labels("rest_async", "alert")
+
+
+class AsyncSIEMIntegration:
+    """Variante asynchrone de SIEMIntegration (aiohttp), pour le chemin de traitement asyncio.
+
+    Les envois partagent une session et son pool de connexions persistantes
+    (keep-alive) ; au plus ``max_concurrency`` requêtes sont en cours, les
+    suivantes attendent leur tour sans bloquer la boucle. Un SIEM lent ne
+    retient donc que les alertes qui lui sont destinées.
+    """
+
+    def __init__(self, endpoint, api_key=None, max_concurrency=20, timeout=5):
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._session = None
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    def _get_session(self):
+        # Créée au premier envoi, dans la boucle qui l'utilise
+        if self._session is None or self._session.closed:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def send_alert(self, alert):
+        """
+        Envoie une alerte au SIEM.
+        Args:
+            alert (dict): Dictionnaire représentant l'alerte à envoyer.
+        Returns:
+            dict: Résultat de l'envoi (même forme que SIEMIntegration.send_alert).
+        """
+        async with self._slots:
+            start = time.perf_counter()
+            try:
+                async with self._get_session().post(self.endpoint, json=alert) as response:
+                    text = await response.text()
+                    (ALERTS_OK if response.ok else ALERTS_HTTP_ERROR).inc()
+                    return {"status": response.status, "response": text}
+            except Exception as e:
+                ALERTS_ERROR.inc()
+                return {"status": "error", "message": str(e)}
+            finally:
+                ALERT_SECONDS.observe(time.perf_counter() - start)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,5 +1,16 @@
+import time
 import requests
 
+from utils import metrics
+
+# Mêmes séries que ghostnet.integrations.siem : cette intégration y apparaît comme le puits "rest"
+SIEM_SENDS = metrics.counter("ghostnet_siem_sends_total", "Envois au SIEM, par statut", ["sink", "kind", "status"])
+SIEM_SEND_SECONDS = metrics.histogram("ghostnet_siem_send_seconds", "Durée des envois au SIEM", ["sink", "kind"])
+ALERTS_OK = SIEM_SENDS.labels("rest", "alert", "ok")
+ALERTS_HTTP_ERROR = SIEM_SENDS.labels("rest", "alert", "http_error")
+ALERTS_ERROR = SIEM_SENDS.labels("rest", "alert", "error")
+ALERT_SECONDS = SIEM_SEND_SECONDS.labels("rest", "alert")
+
 class SIEMIntegration:
     """Intégration simple avec un SIEM via une API REST."""
 
@@ -18,8 +29,13 @@ class SIEMIntegration:
         headers = {"Content-Type": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
+        start = time.perf_counter()
         try:
             response = requests.post(self.endpoint, json=alert, headers=headers, timeout=5)
+            (ALERTS_OK if response.ok else ALERTS_HTTP_ERROR).inc()
             return {"status": response.status_code, "response": response.text}
         except Exception as e:
-            return {"status": "error", "message": str(e)}
\ No newline at end of file
+            ALERTS_ERROR.inc()
+            return {"status": "error", "message": str(e)}
+        finally:
+            ALERT_SECONDS.observe(time.perf_counter() - start)
\ No newline at end of file
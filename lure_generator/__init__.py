@@ -1 +1,3 @@
-from .lure_generator import LureGenerator
\ No newline at end of file
+from .lure_generator import LureGenerator
+from .content import ContentCache
+from .honeytokens import HoneytokenRegistry
\ No newline at end of file
@@ -0,0 +1,84 @@
+import re
+import secrets
+import string
+
+from utils.sketches import BloomFilter, hash128
+
+ALPHABET = string.ascii_letters + string.digits
+USERNAMES = ["admin", "root", "backup", "deploy", "svc_sync", "oracle", "postgres", "jenkins"]
+
+# Candidats extraits d'une ligne de log : les jetons émis font au moins
+# MIN_TOKEN_LENGTH caractères alphanumériques, ce qui écarte la plupart des mots.
+MIN_TOKEN_LENGTH = 16
+CANDIDATE_RE = re.compile(r"[A-Za-z0-9]{%d,}" % MIN_TOKEN_LENGTH)
+
+
+def _secret(length=20):
+    return "".join(secrets.choice(ALPHABET) for _ in range(length))
+
+
+class HoneytokenRegistry:
+    """Registre des honeytokens émis par les leurres.
+
+    Les jetons ne sont conservés que sous forme d'empreinte BLAKE2b dans un
+    dict ; un filtre de Bloom placé devant rejette les candidats inconnus sans
+    toucher à l'index. Le test d'une ligne coûte O(nombre de mots candidats),
+    indépendamment du nombre de jetons émis.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def register(self, token, lure_id, kind):
+        """Enregistre un jeton existant (ex : rechargé depuis l'inventaire)."""
+        if len(token) < MIN_TOKEN_LENGTH or not token.isalnum():
+            raise ValueError("honeytoken trop court ou non alphanumérique")
+        digest = hash128(token)
+        self.bloom.add_digest(digest)
+        self.index[digest] = (lure_id, kind)
+
+    def mint_credentials(self, lure_id, username=None):
+        """Génère un couple identifiant / mot de passe unique pour un leurre."""
+        password = _secret(MIN_TOKEN_LENGTH)
+        self.register(password, lure_id, "credentials")
+        return {"username": username or secrets.choice(USERNAMES), "password": password}
+
+    def mint_api_key(self, lure_id):
+        """Génère une clé d'API au format AWS (AKIA...)."""
+        key = "AKIA" + "".join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(16))
+        self.register(key, lure_id, "api_key")
+        return key
+
+    def mint_url(self, lure_id, base_url="https://files.corp.local/share/"):
+        """Génère une URL de partage piégée."""
+        token = _secret(24)
+        self.register(token, lure_id, "url")
+        return base_url + token
+
+    def lookup(self, token):
+        """Retourne les informations d'un jeton émis, ou None."""
+        digest = hash128(token)
+        if not self.bloom.contains_digest(digest):
+            return None
+        entry = self.index.get(digest)
+        if entry is None:
+            return None
+        return {"lure_id": entry[0], "kind": entry[1]}
+
+    def match_line(self, line):
+        """Recherche un honeytoken émis dans une ligne de log.
+
+        Returns:
+            dict: Informations du premier jeton trouvé (lure_id, kind), ou None.
+        """
+        if not self.index:
+            return None
+        for candidate in CANDIDATE_RE.findall(line):
+            found = self.lookup(candidate)
+            if found is not None:
+                return found
+        return None
@@ -1,24 +1,100 @@
+import os
 import random
 
+from database.lure_registry import LureRegistry
+from .content import ContentCache, template_for
+from .honeytokens import HoneytokenRegistry
+
 class LureGenerator:
     """Génère des leurres (fichiers, services, endpoints factices)."""
 
-    def __init__(self):
-        self.lures = []
+    def __init__(self, content_cache=None, seed=0, honeytokens=None, registry=None):
+        """
+        Args:
+            registry (LureRegistry): Inventaire partagé des leurres. Par défaut,
+                un inventaire en mémoire propre à ce générateur.
+        """
+        self.registry = registry if registry is not None else LureRegistry(":memory:")
+        self.seed = seed
+        self._content_cache = content_cache
+        self.honeytokens = honeytokens if honeytokens is not None else HoneytokenRegistry()
+        self._reload_honeytokens()
+
+    def _reload_honeytokens(self):
+        """Réenregistre les honeytokens des leurres rechargés depuis l'inventaire."""
+        for lure in self.registry.list("service"):
+            configuration = lure.get("configuration", {})
+            for cred in configuration.get("credentials", []):
+                self.honeytokens.register(cred["password"], lure["id"], "credentials")
+            if configuration.get("api_key"):
+                self.honeytokens.register(configuration["api_key"], lure["id"], "api_key")
+
+    @property
+    def lures(self):
+        return self.registry.list()
+
+    @property
+    def content_cache(self):
+        """Cache de contenus, créé à la première utilisation."""
+        if self._content_cache is None:
+            self._content_cache = ContentCache(seed=self.seed)
+        return self._content_cache
 
-    def generate_file_lure(self, filename="fake_document.txt"):
-        """Crée un fichier leurre factice."""
-        content = f"Ce fichier {filename} est un leurre généré automatiquement."
-        self.lures.append({"type": "file", "name": filename, "content": content})
+    def generate_file_lure(self, filename="fake_document.txt", template=None, output_dir=None):
+        """Crée un fichier leurre factice.
+
+        Le template (env, config, csv, ssh_key) est déduit de l'extension s'il
+        n'est pas précisé ; les fichiers sans template gardent un contenu générique.
+        """
+        template = template or template_for(filename)
+        if template is None:
+            content = f"Ce fichier {filename} est un leurre généré automatiquement."
+        else:
+            digest = self.content_cache.get(template, filename)
+            content = self.content_cache.read(digest)
+            if output_dir:
+                self.content_cache.materialize(digest, os.path.join(output_dir, filename))
+        self.registry.add({"type": "file", "name": filename, "template": template})
         return {"filename": filename, "content": content}
 
-    def generate_service_lure(self, port=None):
-        """Simule un service leurre sur un port donné."""
+    def generate_file_lures(self, filenames, output_dir, workers=None):
+        """Déploie en masse des fichiers leurres à partir du cache pré-généré.
+
+        Args:
+            filenames (list): Noms de fichiers (relatifs à output_dir).
+            output_dir (str): Répertoire de déploiement.
+            workers (int): Taille du pool de processus (défaut : nombre de cœurs).
+        Returns:
+            list: Chemins des fichiers déployés.
+        """
+        specs = [(template_for(name) or "config", name) for name in filenames]
+        digests = self.content_cache.bulk(specs, workers=workers)
+        paths = []
+        for (template, name), digest in zip(specs, digests):
+            path = os.path.join(output_dir, name)
+            self.content_cache.materialize(digest, path)
+            self.registry.add({"type": "file", "name": name, "template": template, "digest": digest})
+            paths.append(path)
+        return paths
+
+    def generate_service_lure(self, port=None, credentials=2, name=None, service="fake_service"):
+        """Simule un service leurre sur un port donné.
+
+        Chaque leurre reçoit ses propres honeytokens (identifiants, clé d'API)
+        enregistrés dans ``self.honeytokens`` pour détecter leur réutilisation.
+        """
         if port is None:
             port = random.randint(1024, 65535)
-        self.lures.append({"type": "service", "port": port})
-        return {"service": "fake_service", "port": port}
+        lure_id = self.registry.next_id()
+        configuration = {
+            "credentials": [self.honeytokens.mint_credentials(lure_id) for _ in range(credentials)],
+            "api_key": self.honeytokens.mint_api_key(lure_id),
+        }
+        lure = self.registry.add({"id": lure_id, "type": "service", "name": name or service,
+                                  "service": service, "port": port, "configuration": configuration})
+        return {"id": lure_id, "service": service, "port": port, "configuration": configuration,
+                "created_at": lure["created_at"]}
 
     def list_lures(self):
         """Retourne la liste des leurres générés."""
-        return self.lures
\ No newline at end of file
+        return self.registry.list()
@@ -1 +1,5 @@
-from .network_manager import NetworkManager
\ No newline at end of file
+from .network_manager import NetworkManager
+from .worker_pool import LureWorkerPool
+from .capture import CaptureStage
+from .flow_table import FlowTable
+from .redirection import RedirectionController
\ No newline at end of file
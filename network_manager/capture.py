@@ -0,0 +1,285 @@
+import os
+import mmap
+import time
+import socket
+import struct
+
+from detection import AnomalyDetector, SignatureDetector
+
+# Types de lien pcap supportés
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+
+ETH_P_ALL = 0x0003
+PROTO_TCP = 6
+PROTO_UDP = 17
+
+_u16 = struct.Struct("!H").unpack_from
+_ports = struct.Struct("!HH").unpack_from
+
+
+def read_pcap(path, batch_size=1024):
+    """Lit un fichier pcap par lots, sans dépendance externe.
+
+    Yields:
+        tuple: (linktype, liste de (timestamp, trame brute)).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 24:
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic = bytes(data[:4])
+        if magic not in PCAP_MAGIC:
+            raise ValueError(f"Format pcap non supporté (pcapng ?) : {path}")
+        endian, resolution = PCAP_MAGIC[magic]
+        linktype = struct.unpack_from(endian + "I", data, 20)[0]
+        record = struct.Struct(endian + "IIII")
+        offset, end = 24, len(data)
+        batch = []
+        while offset + 16 <= end:
+            sec, frac, incl_len, _ = record.unpack_from(data, offset)
+            offset += 16
+            batch.append((sec + frac * resolution, data[offset:offset + incl_len]))
+            offset += incl_len
+            if len(batch) >= batch_size:
+                yield linktype, batch
+                batch = []
+        if batch:
+            yield linktype, batch
+    finally:
+        data.close()
+
+
+def write_pcap(path, frames, linktype=LINKTYPE_ETHERNET, snaplen=65535):
+    """Écrit des trames (timestamp, bytes) dans un fichier pcap classique."""
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, snaplen, linktype))
+        for ts, frame in frames:
+            sec = int(ts)
+            f.write(struct.pack("<IIII", sec, int((ts - sec) * 1e6), len(frame), len(frame)))
+            f.write(frame)
+
+
+def live_capture(interface, bpf_filter=None, batch_size=256, timeout=0.1, snaplen=65535):
+    """Capture en direct via une socket AF_PACKET (Linux, droits root requis).
+
+    Le filtre BPF est compilé par scapy puis attaché à la socket : le tri se fait
+    dans le noyau. Les trames sont regroupées par lots de ``batch_size`` ou
+    après ``timeout`` secondes.
+
+    Yields:
+        tuple: (LINKTYPE_ETHERNET, liste de (timestamp, trame brute)).
+    """
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+    try:
+        sock.bind((interface, 0))
+        if bpf_filter:
+            from scapy.arch.linux import attach_filter
+            attach_filter(sock, bpf_filter, interface)
+        sock.settimeout(timeout)
+        buf = bytearray(snaplen)
+        view = memoryview(buf)
+        while True:
+            batch = []
+            deadline = time.monotonic() + timeout
+            while len(batch) < batch_size and time.monotonic() < deadline:
+                try:
+                    n = sock.recv_into(buf)
+                except socket.timeout:
+                    break
+                batch.append((time.time(), bytes(view[:n])))
+            if batch:
+                yield LINKTYPE_ETHERNET, batch
+    finally:
+        sock.close()
+
+
+def decode_batch(linktype, frames):
+    """Décode un lot de trames en paquets IP.
+
+    Returns:
+        list: Tuples (ts, src, dst, sport, dport, proto, length, tcp_flags, payload).
+            Les trames non IP sont ignorées.
+    """
+    packets = []
+    append = packets.append
+    ntop = socket.inet_ntop
+    for ts, frame in frames:
+        if len(frame) < 20:
+            continue
+        if linktype == LINKTYPE_ETHERNET:
+            ethertype = _u16(frame, 12)[0]
+            offset = 14
+            while ethertype in (0x8100, 0x88A8) and len(frame) >= offset + 4:  # VLAN
+                ethertype = _u16(frame, offset + 2)[0]
+                offset += 4
+        elif linktype == LINKTYPE_LINUX_SLL:
+            ethertype = _u16(frame, 14)[0]
+            offset = 16
+        elif linktype == LINKTYPE_RAW:
+            ethertype = 0x0800 if frame[0] >> 4 == 4 else 0x86DD
+            offset = 0
+        else:
+            continue
+
+        if ethertype == 0x0800 and len(frame) >= offset + 20:
+            ihl = (frame[offset] & 0x0F) * 4
+            length = _u16(frame, offset + 2)[0]
+            proto = frame[offset + 9]
+            src = ntop(socket.AF_INET, frame[offset + 12:offset + 16])
+            dst = ntop(socket.AF_INET, frame[offset + 16:offset + 20])
+            l4 = offset + ihl
+            end = offset + length
+        elif ethertype == 0x86DD and len(frame) >= offset + 40:
+            length = _u16(frame, offset + 4)[0] + 40
+            proto = frame[offset + 6]
+            src = ntop(socket.AF_INET6, frame[offset + 8:offset + 24])
+            dst = ntop(socket.AF_INET6, frame[offset + 24:offset + 40])
+            l4 = offset + 40
+            end = offset + length
+        else:
+            continue
+
+        sport = dport = flags = 0
+        payload = b""
+        if proto == PROTO_TCP and len(frame) >= l4 + 14:
+            sport, dport = _ports(frame, l4)
+            flags = frame[l4 + 13]
+            payload = frame[l4 + (frame[l4 + 12] >> 4) * 4:end]
+        elif proto == PROTO_UDP and len(frame) >= l4 + 8:
+            sport, dport = _ports(frame, l4)
+            payload = frame[l4 + 8:end]
+        append((ts, src, dst, sport, dport, proto, length, flags, payload))
+    return packets
+
+
+class FlowRecord:
+    """Agrégat d'un flux identifié par son 5-tuple."""
+    __slots__ = ("key", "first_seen", "last_seen", "packets", "bytes", "flags")
+
+    def __init__(self, key, ts):
+        self.key = key
+        self.first_seen = ts
+        self.last_seen = ts
+        self.packets = 0
+        self.bytes = 0
+        self.flags = 0
+
+    def to_dict(self):
+        src, dst, sport, dport, proto = self.key
+        return {
+            "src_ip": src, "dst_ip": dst, "src_port": sport, "dst_port": dport, "proto": proto,
+            "first_seen": self.first_seen, "last_seen": self.last_seen,
+            "packets": self.packets, "bytes": self.bytes, "tcp_flags": self.flags,
+        }
+
+
+class FlowAggregator:
+    """Agrège les paquets décodés en enregistrements de flux."""
+
+    def __init__(self):
+        self.flows = {}
+
+    def add_batch(self, packets):
+        flows = self.flows
+        for ts, src, dst, sport, dport, proto, length, flags, _ in packets:
+            key = (src, dst, sport, dport, proto)
+            flow = flows.get(key)
+            if flow is None:
+                flow = flows[key] = FlowRecord(key, ts)
+            flow.last_seen = ts
+            flow.packets += 1
+            flow.bytes += length
+            flow.flags |= flags
+
+    def flush(self):
+        """Retourne les flux agrégés et remet l'agrégateur à zéro."""
+        flows, self.flows = self.flows, {}
+        return list(flows.values())
+
+
+class CaptureStage:
+    """Étape d'ingestion de paquets : capture, décodage par lots, agrégation en flux.
+
+    Chaque lot décodé alimente le détecteur de signatures (charge utile des
+    paquets) ; à chaque fenêtre, le nombre de flux ouverts par source est soumis
+    au détecteur d'anomalies (balayages de ports, inondations).
+    """
+
+    def __init__(self, signature_detector=None, anomaly_detector=None, window=10.0, on_detection=None,
+                 flow_table=None):
+        """
+        Args:
+            flow_table (FlowTable): Table de sessions optionnelle, alimentée en
+                parallèle de l'agrégation par fenêtre pour suivre les sessions
+                des attaquants au-delà d'une fenêtre.
+        """
+        self.flow_table = flow_table
+        self.signature_detector = signature_detector or SignatureDetector()
+        self.anomaly_detector = anomaly_detector or AnomalyDetector()
+        self.window = window
+        self.on_detection = on_detection
+        self.aggregator = FlowAggregator()
+        self.packets = 0
+        self.detections = []
+        self._window_start = None
+
+    def _detect(self, result, **context):
+        if result["detected"]:
+            result = dict(result, **context)
+            self.detections.append(result)
+            if self.on_detection:
+                self.on_detection(result)
+
+    def process_batch(self, linktype, frames):
+        """Traite un lot de trames ; retourne les flux exportés si la fenêtre est close."""
+        packets = decode_batch(linktype, frames)
+        self.packets += len(packets)
+        self.aggregator.add_batch(packets)
+        if self.flow_table is not None:
+            self.flow_table.add_batch(packets)
+        for ts, src, dst, sport, dport, proto, length, flags, payload in packets:
+            if payload:
+                text = payload.decode("latin-1")
+                self._detect(self.signature_detector.analyze(text), src_ip=src, dst_port=dport)
+        if not packets:
+            return []
+        ts = packets[-1][0]
+        if self._window_start is None:
+            self._window_start = packets[0][0]
+        if ts - self._window_start >= self.window:
+            self._window_start = ts
+            return self.close_window()
+        return []
+
+    def close_window(self):
+        """Exporte les flux de la fenêtre courante et lance la détection d'anomalies."""
+        flows = self.aggregator.flush()
+        per_source = {}
+        for flow in flows:
+            per_source[flow.key[0]] = per_source.get(flow.key[0], 0) + 1
+        for src, count in per_source.items():
+            self._detect(self.anomaly_detector.analyze(count), src_ip=src)
+        return flows
+
+    def replay(self, path, batch_size=1024):
+        """Rejoue un fichier pcap hors ligne ; retourne tous les flux exportés."""
+        flows = []
+        for linktype, frames in read_pcap(path, batch_size):
+            flows.extend(self.process_batch(linktype, frames))
+        flows.extend(self.close_window())
+        return flows
+
+    def run_live(self, interface, bpf_filter=None, batch_size=256):
+        """Capture en continu sur une interface (bloquant)."""
+        for linktype, frames in live_capture(interface, bpf_filter, batch_size):
+            self.process_batch(linktype, frames)
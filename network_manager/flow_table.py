@@ -0,0 +1,171 @@
+import socket
+import struct
+from array import array
+
+TCP_FIN = 0x01
+TCP_RST = 0x04
+
+# Coût mémoire estimé d'un flux : colonnes des tableaux, entrée du dict et clé compacte
+BYTES_PER_FLOW = 200
+
+_key_tail = struct.Struct("!HHB").pack
+
+
+def pack_key(src, dst, sport, dport, proto):
+    """Encode un 5-tuple en clé binaire compacte (13 ou 37 octets)."""
+    family = socket.AF_INET6 if ":" in src else socket.AF_INET
+    return socket.inet_pton(family, src) + socket.inet_pton(family, dst) + _key_tail(sport, dport, proto)
+
+
+def unpack_key(key):
+    """Décode une clé produite par ``pack_key``."""
+    size, family = (4, socket.AF_INET) if len(key) == 13 else (16, socket.AF_INET6)
+    sport, dport, proto = struct.unpack("!HHB", key[2 * size:])
+    return (socket.inet_ntop(family, key[:size]), socket.inet_ntop(family, key[size:2 * size]),
+            sport, dport, proto)
+
+
+class FlowTable:
+    """Table de sessions à capacité fixe, stockée en colonnes (struct-of-arrays).
+
+    Chaque flux occupe un emplacement dans des ``array`` préalloués ; un dict
+    associe la clé compacte du 5-tuple à son emplacement. Les expirations
+    (inactivité et durée maximale) sont gérées par une roue temporelle : seuls
+    les flux rangés dans les cases échues sont examinés, jamais toute la table.
+    Un flux mis à jour depuis sa planification est simplement replanifié.
+    """
+
+    def __init__(self, capacity=None, max_memory=256 * 1024 * 1024, idle_timeout=60.0,
+                 active_timeout=1800.0, tick=1.0, on_expire=None):
+        self.capacity = capacity or max(1, max_memory // BYTES_PER_FLOW)
+        self.idle_timeout = idle_timeout
+        self.active_timeout = active_timeout
+        self.tick = tick
+        self.on_expire = on_expire
+        self.dropped = 0
+
+        n = self.capacity
+        self.first_seen = array("d", bytes(8 * n))
+        self.last_seen = array("d", bytes(8 * n))
+        self.packets = array("Q", bytes(8 * n))
+        self.bytes = array("Q", bytes(8 * n))
+        self.flags = array("B", bytes(n))
+        self.generation = array("I", bytes(4 * n))
+        self.keys = [None] * n
+        self.index = {}
+        self._free = list(range(n - 1, -1, -1))
+
+        # Roue temporelle : une case par tick, assez de cases pour le plus long délai
+        horizon = int(max(idle_timeout, active_timeout) / tick) + 2
+        self.wheel_size = 1 << (horizon - 1).bit_length()
+        self.wheel = [[] for _ in range(self.wheel_size)]
+        self.current_tick = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def _deadline(self, slot):
+        if self.flags[slot] & (TCP_FIN | TCP_RST):
+            return self.last_seen[slot]
+        return min(self.last_seen[slot] + self.idle_timeout, self.first_seen[slot] + self.active_timeout)
+
+    def _schedule(self, slot, deadline):
+        target = int(deadline / self.tick) + 1
+        if self.current_tick is not None:
+            # Au-delà de l'horizon de la roue : rangé dans la dernière case, replanifié à l'échéance
+            target = min(max(target, self.current_tick + 1), self.current_tick + self.wheel_size - 1)
+        # Entrée codée sur un seul entier (emplacement, génération) pour limiter la mémoire
+        self.wheel[target & (self.wheel_size - 1)].append(slot << 32 | self.generation[slot])
+
+    def update(self, key, ts, length, flags=0):
+        """Comptabilise un paquet ; retourne l'emplacement du flux ou None si la table est pleine."""
+        if self.current_tick is None:
+            self.current_tick = int(ts / self.tick)
+        slot = self.index.get(key)
+        if slot is None:
+            if not self._free:
+                self.dropped += 1
+                return None
+            slot = self._free.pop()
+            self.index[key] = slot
+            self.keys[slot] = key
+            self.first_seen[slot] = ts
+            self.packets[slot] = 0
+            self.bytes[slot] = 0
+            self.flags[slot] = 0
+            self.last_seen[slot] = ts
+            self._schedule(slot, ts + min(self.idle_timeout, self.active_timeout))
+        self.last_seen[slot] = ts
+        self.packets[slot] += 1
+        self.bytes[slot] += length
+        self.flags[slot] |= flags
+        return slot
+
+    def add_batch(self, packets):
+        """Alimente la table avec un lot de paquets décodés (voir ``capture.decode_batch``)."""
+        update = self.update
+        ts = None
+        for ts, src, dst, sport, dport, proto, length, flags, _ in packets:
+            update(pack_key(src, dst, sport, dport, proto), ts, length, flags)
+        if ts is not None:
+            self.advance(ts)
+
+    def _export(self, slot, reason):
+        key = self.keys[slot]
+        del self.index[key]
+        self.keys[slot] = None
+        self.generation[slot] = (self.generation[slot] + 1) & 0xFFFFFFFF
+        self._free.append(slot)
+        if self.on_expire:
+            src, dst, sport, dport, proto = unpack_key(key)
+            first, last = self.first_seen[slot], self.last_seen[slot]
+            self.on_expire({
+                "type": "session",
+                "src_ip": src, "dst_ip": dst, "src_port": sport, "dst_port": dport, "proto": proto,
+                "first_seen": first, "last_seen": last, "duration": last - first,
+                "packets": self.packets[slot], "bytes": self.bytes[slot],
+                "tcp_flags": self.flags[slot], "reason": reason,
+            })
+
+    def _reason(self, slot, now):
+        if self.flags[slot] & (TCP_FIN | TCP_RST):
+            return "closed"
+        if now - self.first_seen[slot] >= self.active_timeout:
+            return "active_timeout"
+        return "idle_timeout"
+
+    def advance(self, now):
+        """Fait tourner la roue jusqu'à ``now`` et exporte les flux expirés.
+
+        Returns:
+            int: Nombre de flux expirés.
+        """
+        target = int(now / self.tick)
+        if self.current_tick is None or target <= self.current_tick:
+            if self.current_tick is None:
+                self.current_tick = target
+            return 0
+        expired = 0
+        steps = min(target - self.current_tick, self.wheel_size)
+        start = self.current_tick
+        self.current_tick = target
+        for step in range(1, steps + 1):
+            bucket_index = (start + step) & (self.wheel_size - 1)
+            bucket, self.wheel[bucket_index] = self.wheel[bucket_index], []
+            for entry in bucket:
+                slot, generation = entry >> 32, entry & 0xFFFFFFFF
+                if self.generation[slot] != generation or self.keys[slot] is None:
+                    continue  # flux déjà exporté, emplacement réutilisé
+                deadline = self._deadline(slot)
+                if deadline <= now:
+                    self._export(slot, self._reason(slot, now))
+                    expired += 1
+                else:
+                    self._schedule(slot, deadline)
+        return expired
+
+    def flush(self):
+        """Exporte tous les flux restants (arrêt de la capture)."""
+        for slot in list(self.index.values()):
+            self._export(slot, "flush")
+        self.wheel = [[] for _ in range(self.wheel_size)]
@@ -1,29 +1,97 @@
 import socket
 
+from .worker_pool import LureWorkerPool
+
 class NetworkManager:
     """Gère les interactions réseau et le déploiement des leurres."""
 
-    def __init__(self):
+    def __init__(self, workers=0, on_event=None, registry=None):
+        """
+        Args:
+            workers (int): Nombre de processus workers partageant les ports des
+                leurres (SO_REUSEPORT). 0 conserve le mode mono-processus.
+            on_event (callable): Fonction appelée pour chaque événement remonté
+                par les workers (connexion, erreur).
+            registry (LureRegistry): Inventaire partagé ; les connexions y sont
+                comptabilisées et les leurres déployés y sont marqués actifs.
+        """
         self.active_lures = []
+        self.registry = registry
+        self.on_event = on_event
+        self.worker_pool = LureWorkerPool(workers, self._handle_event) if workers else None
+
+    def _handle_event(self, event):
+        if self.registry is not None and event["type"] == "connection":
+            self.registry.record_connection(event["port"], event["src_ip"], event["ts"],
+                                            event.get("username"))
+        if self.on_event:
+            self.on_event(event)
+
+    def _register(self, ip, port):
+        if self.registry is None:
+            return
+        lure = self.registry.get_by_port(port)
+        if lure is None:
+            self.registry.add({"type": "network", "name": f"{ip}:{port}", "ip": ip, "port": port})
+        else:
+            self.registry.update(lure["id"], ip=ip, status="active")
 
     def deploy_lure(self, ip="127.0.0.1", port=8080):
-        """Déploie un leurre réseau (exemple : ouvre un port factice)."""
+        """Déploie un leurre réseau (exemple : ouvre un port factice)."""
         try:
+            if self.worker_pool is not None:
+                self.worker_pool.add_lure(ip, port)
+                self.active_lures.append({"ip": ip, "port": port, "socket": None})
+                self._register(ip, port)
+                return {"status": "success", "ip": ip, "port": port, "workers": self.worker_pool.size}
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.bind((ip, port))
             s.listen(1)
             self.active_lures.append({"ip": ip, "port": port, "socket": s})
+            self._register(ip, port)
             return {"status": "success", "ip": ip, "port": port}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
     def list_active_lures(self):
-        """Liste les leurres réseau actifs."""
-        return [{"ip": l["ip"], "port": l["port"]} for l in self.active_lures]
+        """Liste les leurres réseau actifs.
+
+        En mode multi-processus, vérifie aussi la santé des workers (relance
+        ceux qui ne répondent plus) et joint l'état du pool à chaque leurre.
+        """
+        if self.worker_pool is None:
+            return [{"ip": l["ip"], "port": l["port"]} for l in self.active_lures]
+        health = self.worker_pool.health()
+        connections = self.worker_pool.connections
+        return [
+            {
+                "ip": l["ip"],
+                "port": l["port"],
+                "workers": {"alive": health["alive"], "total": health["total"]},
+                "connections": connections.get((l["ip"], l["port"]), 0),
+            }
+            for l in self.active_lures
+        ]
+
+    def restart_workers(self):
+        """Redémarre progressivement les workers sans interrompre les leurres."""
+        if self.worker_pool is None:
+            return {"status": "error", "message": "pool de workers désactivé"}
+        self.worker_pool.restart()
+        return {"status": "workers restarted"}
 
     def close_all_lures(self):
         """Ferme tous les leurres réseau actifs."""
         for lure in self.active_lures:
-            lure["socket"].close()
+            if lure["socket"] is not None:
+                lure["socket"].close()
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+        if self.registry is not None:
+            for lure in self.active_lures:
+                deployed = self.registry.get_by_port(lure["port"])
+                if deployed is not None:
+                    self.registry.update(deployed["id"], status="inactive")
+            self.registry.flush_stats()
         self.active_lures = []
-        return {"status": "all lures closed"}
\ No newline at end of file
+        return {"status": "all lures closed"}
@@ -0,0 +1,140 @@
+import time
+import socket
+import selectors
+
+MARK_BASE = 0x47000000
+
+
+class RedirectionController:
+    """Moteur de verdict en ligne : redirige le trafic des attaquants vers les leurres.
+
+    Les paquets arrivent par NFQUEUE. L'adresse source est lue directement dans
+    les octets de l'en-tête IP et cherchée dans un dict d'adresses binaires ; un
+    paquet d'attaquant reçoit une marque qui encode le port du leurre, et une
+    règle NAT par leurre (voir ``iptables_rules``) effectue la redirection.
+    Aucun décodage complet du paquet n'a lieu sur le chemin critique.
+    """
+
+    def __init__(self, port_map=None, default_ttl=3600.0, queue_num=0, allowlist=None):
+        """
+        Args:
+            port_map (dict): Port de destination -> port du leurre (ex : {22: 2222}).
+            default_ttl (float): Durée de signalement d'un attaquant en secondes
+                (None pour un signalement permanent).
+            queue_num (int): Numéro de la file NFQUEUE.
+            allowlist (PrefixIndex): Plages jamais redirigées (scanners connus,
+                réseaux internes) ; consultée au signalement, pas par paquet.
+        """
+        self.allowlist = allowlist
+        self.port_map = dict(port_map or {})
+        self.default_ttl = default_ttl
+        self.queue_num = queue_num
+        self.flagged = {}
+        self.stats = {"packets": 0, "redirected": 0}
+        self._running = False
+
+    @staticmethod
+    def _pack(ip):
+        family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+        return socket.inet_pton(family, ip)
+
+    def flag(self, ip, ttl=None):
+        """Signale une adresse source comme attaquante.
+
+        Args:
+            ttl (float): Durée du signalement ; ``default_ttl`` si None, permanent si 0.
+
+        Returns:
+            bool: False si l'adresse appartient à la liste d'autorisation.
+        """
+        if self.allowlist is not None and ip in self.allowlist:
+            return False
+        ttl = self.default_ttl if ttl is None else ttl
+        self.flagged[self._pack(ip)] = time.monotonic() + ttl if ttl else 0.0
+        return True
+
+    def unflag(self, ip):
+        self.flagged.pop(self._pack(ip), None)
+
+    def flag_from_detection(self, detection):
+        """Alimente la liste à partir d'un résultat de détecteur portant ``src_ip``."""
+        if detection.get("detected") and detection.get("src_ip"):
+            self.flag(detection["src_ip"])
+
+    def verdict(self, payload):
+        """Calcule la marque à appliquer à un paquet IP brut (0 = pas de redirection)."""
+        version = payload[0] >> 4
+        if version == 4:
+            src = payload[12:16]
+            l4 = (payload[0] & 0x0F) * 4
+            proto = payload[9]
+        elif version == 6:
+            src = payload[8:24]
+            l4 = 40
+            proto = payload[6]
+        else:
+            return 0
+        expires = self.flagged.get(src)
+        if expires is None:
+            return 0
+        if expires and expires < time.monotonic():
+            self.flagged.pop(src, None)
+            return 0
+        if proto not in (6, 17) or len(payload) < l4 + 4:
+            return 0
+        lure_port = self.port_map.get(payload[l4 + 2] << 8 | payload[l4 + 3])
+        if lure_port is None:
+            return 0
+        return MARK_BASE | lure_port
+
+    def handle(self, pkt):
+        """Callback NFQUEUE : marque les paquets des attaquants puis les accepte."""
+        self.stats["packets"] += 1
+        mark = self.verdict(pkt.get_payload())
+        if mark:
+            pkt.set_mark(mark)
+            self.stats["redirected"] += 1
+        pkt.accept()
+
+    def iptables_rules(self, chain="PREROUTING"):
+        """Règles iptables à installer pour brancher le contrôleur.
+
+        ``--queue-bypass`` laisse passer le trafic si le contrôleur est arrêté.
+        """
+        ports = ",".join(str(p) for p in sorted(self.port_map))
+        rules = [
+            f"iptables -t mangle -A {chain} -p tcp -m multiport --dports {ports} "
+            f"-j NFQUEUE --queue-num {self.queue_num} --queue-bypass",
+        ]
+        for lure_port in sorted(set(self.port_map.values())):
+            rules.append(
+                f"iptables -t nat -A {chain} -p tcp -m mark --mark {MARK_BASE | lure_port:#x}/{0xFFFFFFFF:#x} "
+                f"-j REDIRECT --to-ports {lure_port}"
+            )
+        return rules
+
+    def run(self, max_len=4096):
+        """Traite la file NFQUEUE jusqu'à ``stop`` (bloquant, droits root requis).
+
+        À chaque réveil du sélecteur, tous les paquets en attente sont traités
+        d'un bloc par ``run(block=False)``.
+        """
+        from netfilterqueue import NetfilterQueue
+
+        nfqueue = NetfilterQueue()
+        nfqueue.bind(self.queue_num, self.handle, max_len=max_len)
+        sock = socket.fromfd(nfqueue.get_fd(), socket.AF_UNIX, socket.SOCK_STREAM)
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+        self._running = True
+        try:
+            while self._running:
+                if sel.select(timeout=0.5):
+                    nfqueue.run(block=False)
+        finally:
+            sel.close()
+            sock.close()
+            nfqueue.unbind()
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import shutil
+import socket
+import selectors
+import tempfile
+import threading
+import multiprocessing
+
+HEARTBEAT_INTERVAL = 1.0
+MAX_EVENT_SIZE = 4096
+
+
+def _bind_reuseport(ip, port, backlog=128):
+    """Ouvre une socket d'écoute partagée via SO_REUSEPORT."""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    s.bind((ip, port))
+    s.listen(backlog)
+    s.setblocking(False)
+    return s
+
+
+def _worker_main(index, lures, collector_path, stop_event):
+    """Boucle d'un processus worker : accepte les connexions sur les leurres partagés."""
+    events = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def report(event):
+        event["worker"] = index
+        event["pid"] = os.getpid()
+        try:
+            events.sendto(json.dumps(event).encode("utf-8"), collector_path)
+        except OSError:
+            # Le collecteur est saturé ou arrêté : l'événement est perdu, pas le worker
+            pass
+
+    sel = selectors.DefaultSelector()
+    for ip, port in lures:
+        try:
+            sel.register(_bind_reuseport(ip, port), selectors.EVENT_READ, (ip, port))
+        except OSError as e:
+            report({"type": "error", "ip": ip, "port": port, "message": str(e)})
+
+    report({"type": "heartbeat", "ts": time.time()})
+    last_heartbeat = time.monotonic()
+    while not stop_event.is_set():
+        for key, _ in sel.select(timeout=HEARTBEAT_INTERVAL / 2):
+            ip, port = key.data
+            try:
+                conn, peer = key.fileobj.accept()
+            except (BlockingIOError, InterruptedError):
+                continue
+            conn.close()
+            report({"type": "connection", "ip": ip, "port": port,
+                    "src_ip": peer[0], "src_port": peer[1], "ts": time.time()})
+        now = time.monotonic()
+        if now - last_heartbeat >= HEARTBEAT_INTERVAL:
+            report({"type": "heartbeat", "ts": time.time()})
+            last_heartbeat = now
+
+    # Arrêt propre : on vide la file d'attente de chaque socket avant de la
+    # fermer, le noyau répartit ensuite les connexions sur les workers restants.
+    for key in list(sel.get_map().values()):
+        ip, port = key.data
+        while True:
+            try:
+                conn, peer = key.fileobj.accept()
+            except OSError:
+                break
+            conn.close()
+            report({"type": "connection", "ip": ip, "port": port,
+                    "src_ip": peer[0], "src_port": peer[1], "ts": time.time()})
+        key.fileobj.close()
+    sel.close()
+    events.close()
+
+
+class LureWorkerPool:
+    """Pool de processus partageant les ports des leurres via SO_REUSEPORT.
+
+    Chaque worker ouvre sa propre socket d'écoute sur chaque port ; le noyau
+    répartit les connexions entrantes entre eux. Les événements remontent vers
+    un collecteur unique via une socket Unix datagramme.
+    """
+
+    def __init__(self, workers=None, on_event=None):
+        self.size = workers or os.cpu_count() or 1
+        self.on_event = on_event
+        self.lures = []
+        self.workers = {}
+        self.heartbeats = {}
+        self.connections = {}
+        self._ctx = multiprocessing.get_context()
+        self._stop_events = {}
+        self._collector = None
+        self._collector_dir = None
+        self._collector_path = None
+        self._collector_thread = None
+        self._lock = threading.Lock()
+
+    # --- collecteur -------------------------------------------------------
+
+    def _start_collector(self):
+        if self._collector is not None:
+            return
+        self._collector_dir = tempfile.mkdtemp(prefix="ghostnet_pool_")
+        self._collector_path = os.path.join(self._collector_dir, "events.sock")
+        self._collector = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._collector.bind(self._collector_path)
+        self._collector.settimeout(0.2)
+        self._collector_thread = threading.Thread(target=self._collect, name="lure-collector", daemon=True)
+        self._collector_thread.start()
+
+    def _collect(self):
+        sock = self._collector
+        while self._collector is sock:
+            try:
+                data = sock.recv(MAX_EVENT_SIZE)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                event = json.loads(data)
+            except ValueError:
+                continue
+            self._handle_event(event)
+
+    def _handle_event(self, event):
+        with self._lock:
+            self.heartbeats[event.get("worker")] = time.monotonic()
+            if event["type"] == "connection":
+                key = (event["ip"], event["port"])
+                self.connections[key] = self.connections.get(key, 0) + 1
+        if event["type"] != "heartbeat" and self.on_event:
+            self.on_event(event)
+
+    def _stop_collector(self):
+        sock, self._collector = self._collector, None
+        if sock is None:
+            return
+        sock.close()
+        if self._collector_thread:
+            self._collector_thread.join(timeout=1)
+        shutil.rmtree(self._collector_dir, ignore_errors=True)
+        self._collector_thread = None
+
+    # --- workers ----------------------------------------------------------
+
+    def _spawn(self, index):
+        stop_event = self._ctx.Event()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, list(self.lures), self._collector_path, stop_event),
+            name=f"ghostnet-lure-{index}",
+            daemon=True,
+        )
+        process.start()
+        previous = self.workers.get(index), self._stop_events.get(index)
+        self.workers[index] = process
+        self._stop_events[index] = stop_event
+        self.heartbeats[index] = time.monotonic()
+        return previous
+
+    @staticmethod
+    def _terminate(process, stop_event, timeout=5):
+        if process is None:
+            return
+        stop_event.set()
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(1)
+
+    def _stop_worker(self, index, timeout=5):
+        self._terminate(self.workers.pop(index, None), self._stop_events.pop(index, None), timeout)
+        self.heartbeats.pop(index, None)
+
+    def add_lure(self, ip, port):
+        """Ajoute un port partagé et redémarre les workers pour qu'ils l'écoutent."""
+        # Vérifie dans le parent que le port est disponible pour le groupe SO_REUSEPORT.
+        # La socket n'est jamais mise en écoute : elle ne capte aucune connexion.
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            probe.bind((ip, port))
+        finally:
+            probe.close()
+        self.lures.append((ip, port))
+        self._start_collector()
+        if self.workers:
+            self.restart()
+        else:
+            for index in range(self.size):
+                self._spawn(index)
+
+    def restart(self, timeout=5):
+        """Redémarrage progressif : un worker à la fois, les ports restent servis.
+
+        Le remplaçant est démarré avant l'arrêt de l'ancien worker, si bien que
+        le groupe SO_REUSEPORT n'est jamais vide.
+        """
+        for index in sorted(self.workers):
+            process, stop_event = self._spawn(index)
+            self._terminate(process, stop_event, timeout)
+
+    def health(self, max_age=HEARTBEAT_INTERVAL * 3, respawn=True):
+        """Vérifie l'état des workers et relance ceux qui sont morts ou bloqués."""
+        now = time.monotonic()
+        report = {"total": self.size, "alive": 0, "restarted": []}
+        for index in range(self.size):
+            process = self.workers.get(index)
+            stale = now - self.heartbeats.get(index, 0) > max_age
+            if process is not None and process.is_alive() and not stale:
+                report["alive"] += 1
+                continue
+            if respawn and self.lures:
+                process, stop_event = self._spawn(index)
+                self._terminate(process, stop_event, timeout=0.5)
+                report["restarted"].append(index)
+        return report
+
+    def close(self, timeout=5):
+        """Arrête proprement tous les workers puis le collecteur."""
+        for index in list(self.workers):
+            self._stop_worker(index, timeout)
+        self._stop_collector()
+        self.lures = []
+        self.connections = {}
@@ -15,7 +15,10 @@ import shutil
 import pickle
 import argparse
 import datetime
+import sqlite3
 import hashlib
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -24,6 +27,160 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MODELS_DIR = BASE_DIR / "models"
 EXPORTS_DIR = BASE_DIR / "models" / "exported"
 
+# Accès aux modules du projet (ai_engine.model_format) quand le script est lancé directement
+sys.path.insert(0, str(BASE_DIR))
+
+# Format par défaut : tenseurs bruts + en-tête JSON (voir ai_engine/model_format.py)
+MODEL_FORMAT_EXTENSION = ".safetensors"
+
+# Index des modèles (nom, métadonnées, empreintes), dans le répertoire des modèles
+CATALOG_FILE = "catalog.db"
+
+# Taille des blocs lus lors des copies en flux (export, import)
+CHUNK_SIZE = 1024 * 1024
+# Extensions stockées sans compression dans les archives
+STORED_SUFFIXES = {MODEL_FORMAT_EXTENSION, ".npy", ".npz", ".pt", ".h5", ".onnx", ".pb", ".pkl"}
+
+
+def copy_hashed(src, dst) -> Dict[str, Any]:
+    """
+    Copier un flux par blocs en calculant son empreinte au même passage
+    
+    Args:
+        src: Flux binaire source
+        dst: Flux binaire destination
+        
+    Returns:
+        Dictionnaire {"sha256": empreinte hexadécimale, "size": taille en octets}
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        dst.write(chunk)
+        size += len(chunk)
+    return {"sha256": digest.hexdigest(), "size": size}
+
+
+def hash_files(model_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Calculer l'empreinte SHA-256 de chaque fichier d'un modèle (hors metadata.json)
+    
+    Args:
+        model_path: Répertoire du modèle
+        
+    Returns:
+        Dictionnaire {chemin relatif: {"sha256", "size"}}
+    """
+    files = {}
+    for path in sorted(model_path.rglob("*")):
+        if path.is_file() and path.relative_to(model_path).as_posix() != "metadata.json":
+            with open(path, "rb") as src:
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            files[path.relative_to(model_path).as_posix()] = {"sha256": digest.hexdigest(),
+                                                              "size": path.stat().st_size}
+    return files
+
+
+class ModelCatalog:
+    """Index SQLite des modèles, lu en une requête au lieu de parcourir models/"""
+
+    def __init__(self, path: Path):
+        """
+        Ouvrir (ou créer) le catalogue
+        
+        Args:
+            path: Fichier SQLite du catalogue
+        """
+        self.path = path
+        self.created = not path.exists()
+        # Transactions explicites (BEGIN IMMEDIATE) : un seul écrivain à la fois entre processus
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS models (
+                name TEXT PRIMARY KEY,
+                metadata TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Regrouper des écritures (fichiers du modèle et catalogue) : tout ou rien côté catalogue
+        
+        Les transactions imbriquées sont fusionnées dans la plus externe.
+        """
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    def upsert(self, model_name: str, metadata: Dict[str, Any]) -> None:
+        """
+        Enregistrer ou remplacer l'entrée d'un modèle
+        
+        Args:
+            model_name: Nom du modèle
+            metadata: Métadonnées (avec empreintes sous la clé ``files``)
+        """
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO models (name, metadata, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET metadata = excluded.metadata, updated_at = excluded.updated_at",
+                (model_name, json.dumps(metadata), datetime.datetime.now().isoformat()))
+
+    def remove(self, model_name: str) -> None:
+        with self.transaction():
+            self.conn.execute("DELETE FROM models WHERE name = ?", (model_name,))
+
+    def replace_all(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Remplacer tout le contenu du catalogue en une transaction
+        
+        Args:
+            entries: Liste de tuples (nom_modèle, métadonnées)
+        """
+        with self.transaction():
+            self.conn.execute("DELETE FROM models")
+            now = datetime.datetime.now().isoformat()
+            self.conn.executemany("INSERT INTO models (name, metadata, updated_at) VALUES (?, ?, ?)",
+                                  [(name, json.dumps(metadata), now) for name, metadata in entries])
+
+    def list(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Lister les modèles du catalogue
+        
+        Returns:
+            Liste de tuples (nom_modèle, métadonnées), triée par nom
+        """
+        rows = self.conn.execute("SELECT name, metadata FROM models ORDER BY name").fetchall()
+        return [(name, json.loads(metadata)) for name, metadata in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
 
 class ModelManager:
     """Gestionnaire de modèles pour les modèles d'IA GhostNet"""
@@ -40,6 +197,11 @@ class ModelManager:
         # Créer les répertoires s'ils n'existent pas
         MODELS_DIR.mkdir(exist_ok=True)
         EXPORTS_DIR.mkdir(exist_ok=True)
+        
+        # Catalogue des modèles ; construit depuis le disque lors de sa création
+        self.catalog = ModelCatalog(MODELS_DIR / CATALOG_FILE)
+        if self.catalog.created:
+            self.rebuild_catalog()
 
     def log(self, message: str) -> None:
         """
@@ -93,15 +255,15 @@ class ModelManager:
         """
         model_path = self.get_model_path(model_name)
         
-        # Rechercher les fichiers de modèle supportés
-        extensions = [".pkl", ".h5", ".pt", ".onnx", ".pb"]
+        # Rechercher les fichiers de modèle supportés (.pkl : ancien format, lecture seule)
+        extensions = [MODEL_FORMAT_EXTENSION, ".pkl", ".h5", ".pt", ".onnx", ".pb"]
         for ext in extensions:
             model_file = model_path / f"model{ext}"
             if model_file.exists():
                 return model_file
         
-        # Si aucun fichier de modèle n'est trouvé, utiliser .pkl par défaut
-        return model_path / "model.pkl"
+        # Si aucun fichier de modèle n'est trouvé, utiliser le format par défaut
+        return model_path / f"model{MODEL_FORMAT_EXTENSION}"
 
     def get_metadata_file(self, model_name: str) -> Path:
         """
@@ -159,20 +321,34 @@ class ModelManager:
         # Créer le répertoire parent si nécessaire
         metadata_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        # Écriture atomique : le registre de modèles (ai_engine.registry) surveille ce
+        # fichier et ne doit jamais lire une version partielle
+        temp_file = metadata_file.with_name(f".{metadata_file.name}.tmp{os.getpid()}")
+        with self.catalog.transaction():
+            with open(temp_file, "w") as f:
+                json.dump(metadata, f, indent=2)
+            os.replace(temp_file, metadata_file)
+            self.catalog.upsert(model_name, metadata)
 
-    def export_model(self, model_name: str, output_file: Optional[str] = None) -> None:
+    def export_model(self, model_name: str, output_file: Optional[str] = None) -> bool:
         """
-        Exporter un modèle vers un fichier
+        Exporter un modèle vers une archive zip
+        
+        Chaque fichier est lu une seule fois : il est écrit dans l'archive et son
+        empreinte SHA-256 est calculée au même passage. Les empreintes sont
+        enregistrées dans le metadata.json de l'archive (clé ``files``), écrit en
+        dernier. L'archive est construite dans un fichier temporaire renommé à la fin.
         
         Args:
             model_name: Nom du modèle
             output_file: Fichier de sortie (optionnel)
+            
+        Returns:
+            True si l'exportation a réussi, False sinon
         """
         if not self.model_exists(model_name):
             self.error(f"Le modèle '{model_name}' n'existe pas")
-            return
+            return False
         
         model_path = self.get_model_path(model_name)
         metadata = self.load_metadata(model_name)
@@ -187,76 +363,117 @@ class ModelManager:
         # Créer le répertoire parent si nécessaire
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Créer une archive contenant le modèle et ses métadonnées
         self.log(f"Exportation du modèle '{model_name}' vers '{output_file}'")
         
+        temp_file = output_file.with_name(f".{output_file.name}.tmp{os.getpid()}")
         try:
-            # Nous utilisons shutil.make_archive pour créer une archive zip
-            # Comme nous ne pouvons pas utiliser directement make_archive avec un Path,
-            # nous utilisons str() pour convertir le chemin en chaîne
-            output_base = str(output_file.with_suffix(""))
-            shutil.make_archive(output_base, "zip", model_path)
+            files = {}
+            with zipfile.ZipFile(temp_file, "w", allowZip64=True) as archive:
+                for path in sorted(model_path.rglob("*")):
+                    if not path.is_file() or (path.name == "metadata.json" and path.parent == model_path):
+                        continue
+                    arcname = path.relative_to(model_path).as_posix()
+                    info = zipfile.ZipInfo.from_file(path, arcname)
+                    # Les poids binaires se compressent mal : stockés tels quels
+                    info.compress_type = zipfile.ZIP_STORED if path.suffix in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+                    with open(path, "rb") as src, archive.open(info, "w", force_zip64=True) as dst:
+                        files[arcname] = copy_hashed(src, dst)
+                    self.log(f"  {arcname} ({files[arcname]['size']} octets)")
+                
+                metadata["files"] = files
+                metadata["exported_at"] = datetime.datetime.now().isoformat()
+                archive.writestr("metadata.json", json.dumps(metadata, indent=2), zipfile.ZIP_DEFLATED)
+            os.replace(temp_file, output_file)
             
             self.success(f"Modèle exporté avec succès vers '{output_file}'")
+            return True
         except Exception as e:
+            temp_file.unlink(missing_ok=True)
             self.error(f"Erreur lors de l'exportation du modèle: {e}")
+            return False
 
-    def import_model(self, model_name: str, input_file: str) -> None:
+    def import_model(self, model_name: str, input_file: str) -> bool:
         """
-        Importer un modèle depuis un fichier
+        Importer un modèle depuis une archive zip
+        
+        Les fichiers sont extraits en flux vers un répertoire de préparation
+        voisin de la destination, en vérifiant au même passage leur empreinte
+        SHA-256 par rapport au metadata.json de l'archive. Le répertoire préparé
+        remplace ensuite le modèle par renommage : rien n'est écrit deux fois et
+        un import interrompu ou corrompu laisse le modèle existant intact.
         
         Args:
             model_name: Nom du modèle
             input_file: Fichier d'entrée
+            
+        Returns:
+            True si l'importation a réussi, False sinon
         """
         input_path = Path(input_file)
         
         if not input_path.exists():
             self.error(f"Le fichier '{input_file}' n'existe pas")
-            return
+            return False
         
         model_path = self.get_model_path(model_name)
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = model_path.parent / f".{model_path.name}.import-{os.getpid()}"
         
-        # Sauvegarder le modèle existant si nécessaire
-        if model_path.exists():
-            self.log(f"Sauvegarde du modèle existant '{model_name}'")
-            timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-            backup_dir = EXPORTS_DIR / f"{model_name.replace('/', '_')}_{timestamp}_backup"
-            
-            # Copier le modèle existant vers le répertoire de sauvegarde
-            shutil.copytree(model_path, backup_dir)
-            self.log(f"Modèle sauvegardé dans '{backup_dir}'")
-        
-        # Créer le répertoire de destination
-        model_path.mkdir(parents=True, exist_ok=True)
-        
-        # Extraire l'archive
         self.log(f"Importation du modèle depuis '{input_file}' vers '{model_name}'")
         
         try:
-            # Extraire l'archive dans un répertoire temporaire
-            temp_dir = Path(f"/tmp/ghostnet_import_{os.getpid()}")
-            shutil.unpack_archive(input_file, extract_dir=temp_dir)
-            
-            # Copier les fichiers vers le répertoire de destination
-            for item in temp_dir.iterdir():
-                if item.is_file():
-                    shutil.copy2(item, model_path)
-                else:
-                    shutil.copytree(item, model_path / item.name, dirs_exist_ok=True)
-            
-            # Nettoyer le répertoire temporaire
-            shutil.rmtree(temp_dir)
+            with zipfile.ZipFile(input_path) as archive:
+                members = [info for info in archive.infolist() if not info.is_dir()]
+                for info in members:
+                    parts = Path(info.filename).parts
+                    if Path(info.filename).is_absolute() or ".." in parts:
+                        raise ValueError(f"Chemin interdit dans l'archive: '{info.filename}'")
+                
+                names = {info.filename for info in members}
+                metadata = json.loads(archive.read("metadata.json")) if "metadata.json" in names else {}
+                expected = metadata.get("files") or {}
+                if not expected:
+                    self.log("Archive sans empreintes SHA-256 (ancien format) : empreintes calculées à l'import")
+                
+                staging_dir.mkdir()
+                files = {}
+                for info in members:
+                    if info.filename == "metadata.json":
+                        continue
+                    target = staging_dir / info.filename
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with archive.open(info) as src, open(target, "wb") as dst:
+                        files[info.filename] = copy_hashed(src, dst)
+                    if expected and expected.get(info.filename, {}).get("sha256") != files[info.filename]["sha256"]:
+                        raise ValueError(f"Empreinte SHA-256 invalide pour '{info.filename}'")
+                
+                missing = set(expected) - set(files)
+                if missing:
+                    raise ValueError(f"Fichiers absents de l'archive: {', '.join(sorted(missing))}")
             
             # Mettre à jour les métadonnées
-            metadata = self.load_metadata(model_name)
+            metadata["files"] = files
             metadata["imported_at"] = datetime.datetime.now().isoformat()
-            metadata["imported_from"] = input_file
-            self.save_metadata(model_name, metadata)
+            metadata["imported_from"] = str(input_file)
+            with open(staging_dir / "metadata.json", "w") as f:
+                json.dump(metadata, f, indent=2)
+            
+            # Sauvegarder le modèle existant (par renommage, sans copie) puis installer le nouveau
+            with self.catalog.transaction():
+                if model_path.exists():
+                    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+                    backup_dir = EXPORTS_DIR / f"{model_name.replace('/', '_')}_{timestamp}_backup"
+                    os.replace(model_path, backup_dir)
+                    self.log(f"Modèle existant sauvegardé dans '{backup_dir}'")
+                os.replace(staging_dir, model_path)
+                self.catalog.upsert(model_name, metadata)
             
             self.success(f"Modèle importé avec succès")
+            return True
         except Exception as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
             self.error(f"Erreur lors de l'importation du modèle: {e}")
+            return False
 
     def update_metadata(self, model_name: str, metadata: Dict[str, Any]) -> None:
         """
@@ -278,7 +495,16 @@ class ModelManager:
 
     def list_models(self) -> List[Tuple[str, Dict[str, Any]]]:
         """
-        Lister tous les modèles disponibles
+        Lister tous les modèles disponibles (lecture du catalogue)
+        
+        Returns:
+            Liste de tuples (nom_modèle, métadonnées)
+        """
+        return self.catalog.list()
+
+    def scan_models(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Parcourir le répertoire des modèles (exportations et répertoires cachés exclus)
         
         Returns:
             Liste de tuples (nom_modèle, métadonnées)
@@ -288,11 +514,13 @@ class ModelManager:
         for root, dirs, files in os.walk(MODELS_DIR):
             root_path = Path(root)
             
+            # Ni les archives et sauvegardes, ni les répertoires de préparation d'import
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and root_path / d != EXPORTS_DIR)
+            
             # Vérifier si c'est un répertoire de modèle
             if "metadata.json" in files:
                 # Calculer le chemin relatif par rapport au répertoire des modèles
-                rel_path = root_path.relative_to(MODELS_DIR)
-                model_name = str(rel_path)
+                model_name = root_path.relative_to(MODELS_DIR).as_posix()
                 
                 # Charger les métadonnées
                 metadata = self.load_metadata(model_name)
@@ -301,6 +529,28 @@ class ModelManager:
         
         return models
 
+    def rebuild_catalog(self) -> int:
+        """
+        Reconstruire le catalogue depuis le disque (réparation de cohérence)
+        
+        Les empreintes sont recalculées ; un écart avec celles enregistrées
+        dans metadata.json est signalé, le catalogue reflétant le disque.
+        
+        Returns:
+            Nombre de modèles indexés
+        """
+        entries = []
+        for model_name, metadata in self.scan_models():
+            files = hash_files(self.get_model_path(model_name))
+            recorded = metadata.get("files")
+            if recorded is not None and recorded != files:
+                self.error(f"Fichiers du modèle '{model_name}' différents de ceux enregistrés dans metadata.json")
+            entries.append((model_name, dict(metadata, files=files)))
+        
+        self.catalog.replace_all(entries)
+        self.log(f"Catalogue reconstruit: {len(entries)} modèle(s)")
+        return len(entries)
+
     def display_models(self) -> None:
         """
         Afficher la liste des modèles disponibles
@@ -361,11 +611,16 @@ class ModelManager:
         
         # Vérifier la cohérence du modèle
         try:
-            # Pour les modèles pickle, tenter de les charger pour vérifier leur intégrité
-            if model_file.suffix == ".pkl":
-                with open(model_file, "rb") as f:
-                    model = pickle.load(f)
-                self.log(f"Modèle '{model_name}' chargé avec succès")
+            if model_file.suffix == MODEL_FORMAT_EXTENSION:
+                # Validation de l'en-tête (types, formes, positions) sans lire les données
+                from ai_engine.model_format import read_header
+                tensors, _, _ = read_header(str(model_file))
+                self.log(f"Modèle '{model_name}' valide ({len(tensors)} tenseurs)")
+            elif model_file.suffix == ".pkl":
+                # Désérialiser un pickle peut exécuter du code arbitraire : jamais sur un modèle
+                # importé. Convertir les modèles de confiance avec la commande « convert ».
+                self.error(f"Ancien format pickle non vérifiable, utiliser « convert » : '{model_file}'")
+                return False
         except Exception as e:
             self.error(f"Erreur lors du chargement du modèle: {e}")
             return False
@@ -399,16 +654,100 @@ class ModelManager:
         if "version" not in metadata:
             metadata["version"] = "1.0.0"
         
-        # Sauvegarder les métadonnées
-        self.save_metadata(model_name, metadata)
-        
-        # Sauvegarder les données du modèle si fournies
-        if model_data is not None:
-            with open(model_file, "wb") as f:
-                pickle.dump(model_data, f)
+        # Sauvegarder les données du modèle si fournies, puis les métadonnées (avec
+        # empreintes) en dernier : leur écriture publie le modèle
+        with self.catalog.transaction():
+            if model_data is not None:
+                from ai_engine.model_format import save_model, from_object
+                try:
+                    save_model(str(model_path / f"model{MODEL_FORMAT_EXTENSION}"), from_object(model_data))
+                except ValueError as e:
+                    self.error(f"Données du modèle non supportées: {e}")
+                    return
+            
+            metadata["files"] = hash_files(model_path)
+            self.save_metadata(model_name, metadata)
         
         self.success(f"Modèle '{model_name}' créé avec succès")
 
+    def save_checkpoint(self, model_name: str, tensors: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """
+        Enregistrer un point de contrôle d'un modèle appris en continu
+        
+        Le fichier de tenseurs est remplacé atomiquement, puis metadata.json
+        (avec empreintes) et le catalogue sont mis à jour dans la même transaction.
+        
+        Args:
+            model_name: Nom du modèle (créé s'il n'existe pas)
+            tensors: Tenseurs du modèle (nom -> tableau)
+            metadata: Métadonnées du modèle, également stockées dans l'en-tête du fichier
+        """
+        from ai_engine.model_format import save_model
+        model_path = self.get_model_path(model_name)
+        model_path.mkdir(parents=True, exist_ok=True)
+        now = datetime.datetime.now().isoformat()
+        
+        with self.catalog.transaction():
+            save_model(str(model_path / f"model{MODEL_FORMAT_EXTENSION}"), tensors, metadata)
+            current = self.load_metadata(model_name)
+            current.update(metadata)
+            current.setdefault("created_at", now)
+            current.setdefault("version", "1.0.0")
+            current["checkpointed_at"] = now
+            current["files"] = hash_files(model_path)
+            self.save_metadata(model_name, current)
+        
+        self.log(f"Point de contrôle du modèle '{model_name}' enregistré")
+
+    def load_model(self, model_name: str, mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Charger les tenseurs d'un modèle
+        
+        Args:
+            model_name: Nom du modèle
+            mmap: Projeter le fichier en mémoire (chargement immédiat, pages
+                partagées entre processus) plutôt que le lire entièrement
+            
+        Returns:
+            Tuple (tenseurs en lecture seule, métadonnées du fichier)
+        """
+        from ai_engine.model_format import load_model
+        model_file = self.get_model_file(model_name)
+        if model_file.suffix != MODEL_FORMAT_EXTENSION:
+            raise ValueError(f"Format de modèle non chargeable: '{model_file.name}'")
+        return load_model(str(model_file), mmap=mmap)
+
+    def convert_model(self, model_name: str) -> bool:
+        """
+        Convertir un modèle pickle local (de confiance) vers le format de tenseurs
+        
+        Args:
+            model_name: Nom du modèle
+            
+        Returns:
+            True si la conversion a réussi, False sinon
+        """
+        from ai_engine.model_format import save_model, from_object
+        pickle_file = self.get_model_path(model_name) / "model.pkl"
+        if not pickle_file.exists():
+            self.error(f"Aucun modèle pickle à convertir pour '{model_name}'")
+            return False
+        
+        try:
+            with open(pickle_file, "rb") as f:
+                model_data = pickle.load(f)
+            save_model(str(pickle_file.with_suffix(MODEL_FORMAT_EXTENSION)), from_object(model_data))
+        except Exception as e:
+            self.error(f"Erreur lors de la conversion du modèle: {e}")
+            return False
+        
+        pickle_file.unlink()
+        metadata = self.load_metadata(model_name)
+        metadata["files"] = hash_files(self.get_model_path(model_name))
+        self.save_metadata(model_name, metadata)
+        self.success(f"Modèle '{model_name}' converti au format {MODEL_FORMAT_EXTENSION}")
+        return True
+
 
 def main():
     """
@@ -445,7 +784,14 @@ def main():
     create_parser = subparsers.add_parser("create", help="Créer un nouveau modèle")
     create_parser.add_argument("--model", required=True, help="Nom du modèle à créer")
     create_parser.add_argument("--metadata", required=True, help="Fichier JSON contenant les métadonnées")
-    create_parser.add_argument("--data", help="Fichier contenant les données du modèle (optionnel)")
+    create_parser.add_argument("--data", help="Fichier .npy, .npz ou .safetensors contenant les données du modèle (optionnel)")
+    
+    # Commande: convert
+    convert_parser = subparsers.add_parser("convert", help="Convertir un modèle pickle de confiance vers le format de tenseurs")
+    convert_parser.add_argument("--model", required=True, help="Nom du modèle à convertir")
+    
+    # Commande: rebuild-catalog
+    subparsers.add_parser("rebuild-catalog", help="Reconstruire le catalogue des modèles depuis le disque")
     
     # Options globales
     parser.add_argument("--verbose", "-v", action="store_true", help="Mode verbeux")
@@ -489,18 +835,30 @@ def main():
             manager.error(f"Erreur lors du chargement des métadonnées: {e}")
             return
         
-        # Charger les données du modèle si spécifiées
+        # Charger les données du modèle si spécifiées (jamais de pickle : allow_pickle=False)
         model_data = None
         if args.data:
             try:
-                with open(args.data, "rb") as f:
-                    model_data = pickle.load(f)
+                import numpy as np
+                if args.data.endswith(MODEL_FORMAT_EXTENSION):
+                    from ai_engine.model_format import load_model
+                    model_data, _ = load_model(args.data)
+                else:
+                    loaded = np.load(args.data, allow_pickle=False)
+                    model_data = dict(loaded) if hasattr(loaded, "files") else loaded
             except Exception as e:
                 manager.error(f"Erreur lors du chargement des données du modèle: {e}")
                 return
         
         manager.create_model(args.model, metadata, model_data)
     
+    elif args.command == "convert":
+        manager.convert_model(args.model)
+    
+    elif args.command == "rebuild-catalog":
+        count = manager.rebuild_catalog()
+        manager.success(f"Catalogue reconstruit: {count} modèle(s)")
+    
     else:
         parser.print_help()
 
@@ -0,0 +1,65 @@
+import unittest
+
+from detection.alert_aggregator import AlertAggregator, source_of
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAlertAggregator(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.emitted = []
+        self.aggregator = AlertAggregator(self.emitted.append, ttl=30, flush_interval=10, clock=self.clock)
+
+    def test_bruteforce_storm_is_coalesced(self):
+        alert = {"description": "Tentative de connexion SSH échouée"}
+        self.assertTrue(self.aggregator.submit(alert, 1, "203.0.113.7"))
+        for _ in range(999):
+            self.clock.now += 0.01
+            self.assertFalse(self.aggregator.submit(alert, 1, "203.0.113.7"))
+        # Autre source : clé distincte, émise aussitôt
+        self.assertTrue(self.aggregator.submit(alert, 1, "198.51.100.1"))
+        self.assertEqual(len(self.emitted), 2)
+
+        self.clock.now += 10
+        self.assertEqual(self.aggregator.flush(), 1)
+        summary = self.emitted[-1]
+        self.assertTrue(summary["aggregated"])
+        self.assertEqual((summary["count"], summary["repeats"]), (1000, 999))
+        self.assertEqual(summary["first_seen"], 1000.0)
+        self.assertAlmostEqual(summary["last_seen"], 1009.99)
+        self.assertEqual(summary["description"], alert["description"])
+        # Rien de neuf depuis le résumé : pas de nouvelle émission
+        self.clock.now += 10
+        self.assertEqual(self.aggregator.flush(), 0)
+
+    def test_ttl_expiry_and_final_summary(self):
+        self.aggregator.submit({"d": 1}, "ai", "10.0.0.1")
+        self.aggregator.submit({"d": 1}, "ai", "10.0.0.1")
+        self.clock.now += 31
+        self.assertEqual(self.aggregator.flush(), 1)
+        self.assertEqual(len(self.aggregator), 0)
+        # Après expiration, la même alerte repart d'une émission immédiate
+        self.assertTrue(self.aggregator.submit({"d": 1}, "ai", "10.0.0.1"))
+        self.aggregator.submit({"d": 1}, "ai", "10.0.0.1")
+        self.aggregator.stop()
+        self.assertEqual([a.get("count") for a in self.emitted], [None, 2, None, 2])
+
+    def test_bounded_entries_and_source_extraction(self):
+        aggregator = AlertAggregator(self.emitted.append, max_entries=2, clock=self.clock)
+        for source in ("a", "a", "b", "c"):
+            aggregator.submit({}, "r", source)
+        self.assertEqual(len(aggregator), 2)
+        self.assertEqual(self.emitted[2]["source"], "a")
+        self.assertEqual(source_of("Failed password for root from 203.0.113.7 port 22"), "203.0.113.7")
+        self.assertIsNone(source_of("aucune adresse"))
+
+
+if __name__ == "__main__":
+    unittest.main()
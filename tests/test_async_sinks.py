@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from database.database import DatabaseManager
+from database.async_database import AsyncDatabase
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    lock = threading.Lock()
+    active = peak = received = 0
+
+    def do_POST(self):
+        cls = type(self)
+        json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.active -= 1
+            cls.received += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncSinks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "ghostnet.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_database_writes_are_batched_off_loop(self):
+        db = DatabaseManager(self.db_path)
+        calls = []
+        insert = db.insert_alertes
+        db.insert_alertes = lambda rows: calls.append(len(rows)) or insert(rows)
+
+        async def run():
+            base = AsyncDatabase(db, max_pending=100)
+            ids = await asyncio.gather(*(base.insert_alerte("signature", "élevé", f"alerte {i}")
+                                         for i in range(300)))
+            await base.record_attackers([{"src_ip": "203.0.113.7", "type": "signature"}])
+            await base.close()
+            return ids
+
+        ids = asyncio.run(run())
+        self.assertEqual(len(set(ids)), 300)
+        self.assertEqual(sum(calls), 300)
+        # Les insertions en attente pendant une écriture partent ensemble
+        self.assertLess(len(calls), 300)
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM alertes").fetchone()[0], 300)
+        attackers, total = db.get_attackers()
+        self.assertEqual((attackers[0]["ip"], total), ("203.0.113.7", 1))
+
+    @unittest.skipUnless(aiohttp is not None, "aiohttp indisponible")
+    def test_siem_pool_limits_concurrency(self):
+        from integrations.async_siem import AsyncSIEMIntegration
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}/siem"
+
+        async def run():
+            siem = AsyncSIEMIntegration(endpoint, max_concurrency=5)
+            start = time.perf_counter()
+            results = await asyncio.gather(*(siem.send_alert({"n": i}) for i in range(50)))
+            elapsed = time.perf_counter() - start
+            await siem.close()
+            return results, elapsed
+
+        try:
+            results, elapsed = asyncio.run(run())
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertTrue(all(r["status"] == 200 for r in results))
+        self.assertEqual(_SlowHandler.received, 50)
+        self.assertLessEqual(_SlowHandler.peak, 5)
+        # 50 requêtes de 10 ms, 5 à la fois : bien moins que 0,5 s en série
+        self.assertLess(elapsed, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from compare import compare
+
+
+def report(**values):
+    return {"results": {name: {"value": value, "unit": "", "higher_is_better": not name.endswith("bytes")}
+                        for name, value in values.items()}}
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_direction_aware_regressions(self):
+        baseline = report(lines_per_s=1000.0, peak_bytes=100.0, inserts_per_s=50.0)
+        current = report(lines_per_s=850.0, peak_bytes=80.0, inserts_per_s=52.0)
+        rows = {row["name"]: row["status"] for row in compare(baseline, current, threshold=0.10)}
+        self.assertEqual(rows, {"lines_per_s": "regression", "peak_bytes": "improvement", "inserts_per_s": "ok"})
+
+
+if __name__ == "__main__":
+    unittest.main()
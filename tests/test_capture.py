@@ -0,0 +1,44 @@
+import os
+import struct
+import tempfile
+import unittest
+from network_manager.capture import CaptureStage, decode_batch, read_pcap, write_pcap, LINKTYPE_ETHERNET
+
+
+def tcp_frame(src, dst, sport, dport, flags=0x02, payload=b""):
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, 0, 0, 5 << 4, flags, 65535, 0, 0)
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 40 + len(payload), 0, 0, 64, 6, 0,
+                     bytes(map(int, src.split("."))), bytes(map(int, dst.split("."))))
+    return b"\x00" * 12 + b"\x08\x00" + ip + tcp + payload
+
+
+class TestCapture(unittest.TestCase):
+    def test_decode_tcp_frame(self):
+        frame = tcp_frame("10.0.0.1", "192.168.1.10", 40000, 22, 0x18, b"Failed password")
+        packets = decode_batch(LINKTYPE_ETHERNET, [(1.0, frame), (1.0, b"\x00" * 10)])
+        self.assertEqual(len(packets), 1)
+        ts, src, dst, sport, dport, proto, length, flags, payload = packets[0]
+        self.assertEqual((src, dst, sport, dport, proto), ("10.0.0.1", "192.168.1.10", 40000, 22, 6))
+        self.assertEqual(flags, 0x18)
+        self.assertEqual(payload, b"Failed password")
+
+    def test_replay_pcap_builds_flows_and_detections(self):
+        frames = [(100.0 + i, tcp_frame("10.0.0.1", "192.168.1.10", 40000, 22, 0x18, b"x")) for i in range(3)]
+        frames += [(101.0 + port / 1000, tcp_frame("10.0.0.2", "192.168.1.10", 50000, port)) for port in range(1, 31)]
+        frames.append((110.0, tcp_frame("10.0.0.3", "192.168.1.10", 40001, 22, 0x18, b"Failed password for root")))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "capture.pcap")
+            write_pcap(path, frames)
+            batches = list(read_pcap(path, batch_size=8))
+            self.assertEqual(sum(len(b) for _, b in batches), len(frames))
+            stage = CaptureStage(window=60)
+            flows = stage.replay(path)
+        self.assertEqual(stage.packets, len(frames))
+        self.assertEqual(len(flows), 32)
+        ssh = [f for f in flows if f.key[0] == "10.0.0.1"][0]
+        self.assertEqual((ssh.packets, ssh.bytes, ssh.flags), (3, 123, 0x18))
+        types = sorted((d["type"], d["src_ip"]) for d in stage.detections)
+        self.assertEqual(types, [("anomaly", "10.0.0.2"), ("signature", "10.0.0.3")])
+
+if __name__ == "__main__":
+    unittest.main()
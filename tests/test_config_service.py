@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from config.service import ConfigService, validate_core_config
+
+
+class TestConfigService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "config.json")
+        self.write({"alert_threshold": 5, "log_level": "INFO", "lures": {"max": 3}})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def test_snapshot_swap_validation_and_subscribers(self):
+        service = ConfigService(self.path, [validate_core_config])
+        snapshot = service.snapshot
+        with self.assertRaises(TypeError):
+            snapshot["alert_threshold"] = 1
+        with self.assertRaises(TypeError):
+            snapshot["lures"]["max"] = 1
+        self.assertFalse(service.check())
+
+        calls, lure_calls = [], []
+        service.subscribe(lambda new, old: calls.append((old["alert_threshold"], new["alert_threshold"])))
+        service.subscribe(lambda new, old: lure_calls.append(new["lures"]), sections=["lures"])
+
+        self.write({"alert_threshold": 8, "log_level": "INFO", "lures": {"max": 3}})
+        self.assertTrue(service.check())
+        self.assertEqual(calls, [(5, 8)])
+        self.assertEqual(lure_calls, [])
+        self.assertEqual(snapshot["alert_threshold"], 5)  # l'ancien instantané est inchangé
+
+        self.write({"alert_threshold": -1, "log_level": "INFO"})
+        self.assertFalse(service.check())
+        self.assertIn("alert_threshold", service.last_error)
+        self.assertEqual(service.get("alert_threshold"), 8)
+
+        self.write({"alert_threshold": 8, "log_level": "DEBUG", "lures": {"max": 10}})
+        service.check()
+        self.assertEqual(lure_calls, [{"max": 10}])
+        self.assertEqual(json.loads(json.dumps(service.snapshot))["lures"], {"max": 10})
+
+    def test_watch_applies_changes_in_background(self):
+        service = ConfigService(self.path, poll_interval=0.05).watch()
+        try:
+            self.write({"alert_threshold": 42})
+            deadline = time.time() + 2
+            while service.get("alert_threshold") != 42 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            service.stop()
+        self.assertEqual(service.get("alert_threshold"), 42)
+        self.assertEqual(service.version, 2)
+
+    def test_load_config_sees_saved_changes_and_is_mutable(self):
+        from utils import load_config, save_config
+        config = load_config(self.path)
+        self.assertEqual(config["lures"]["max"], 3)
+        config["lures"]["max"] = 4
+        self.assertEqual(save_config(self.path, config), {"status": "ok"})
+        reloaded = load_config(self.path)
+        self.assertEqual(reloaded["lures"]["max"], 4)
+        reloaded["alert_threshold"] = 7
+
+
+if __name__ == "__main__":
+    unittest.main()
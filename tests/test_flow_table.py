@@ -0,0 +1,45 @@
+import unittest
+from network_manager.flow_table import FlowTable, pack_key, unpack_key
+
+
+class TestFlowTable(unittest.TestCase):
+    def setUp(self):
+        self.sessions = []
+        self.table = FlowTable(capacity=4, idle_timeout=10, active_timeout=30, on_expire=self.sessions.append)
+
+    def test_key_roundtrip(self):
+        for key in [("10.0.0.1", "10.0.0.2", 1234, 22, 6), ("2001:db8::1", "2001:db8::2", 53, 5353, 17)]:
+            self.assertEqual(unpack_key(pack_key(*key)), key)
+
+    def test_idle_timeout(self):
+        key = pack_key("10.0.0.1", "10.0.0.2", 1234, 22, 6)
+        self.table.update(key, 100.0, 60)
+        self.table.update(key, 105.0, 40)
+        self.assertEqual(self.table.advance(114.0), 0)
+        self.assertEqual(self.table.advance(116.0), 1)
+        session = self.sessions[0]
+        self.assertEqual((session["packets"], session["bytes"], session["reason"]), (2, 100, "idle_timeout"))
+        self.assertEqual(session["duration"], 5.0)
+        self.assertEqual(len(self.table), 0)
+
+    def test_active_timeout_and_closed(self):
+        active = pack_key("10.0.0.1", "10.0.0.2", 1234, 22, 6)
+        closing = pack_key("10.0.0.3", "10.0.0.2", 4321, 80, 6)
+        self.table.update(closing, 100.0, 40, flags=0x01)
+        for t in range(100, 140, 5):
+            self.table.update(active, float(t), 40)
+            self.table.advance(float(t))
+        reasons = [s["reason"] for s in self.sessions]
+        self.assertEqual(reasons, ["closed", "active_timeout"])
+
+    def test_capacity_is_fixed(self):
+        for port in range(6):
+            self.table.update(pack_key("10.0.0.1", "10.0.0.2", port, 22, 6), 100.0, 40)
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.dropped, 2)
+        self.table.advance(200.0)
+        self.assertEqual(len(self.sessions), 4)
+        self.assertIsNotNone(self.table.update(pack_key("10.0.0.9", "10.0.0.2", 1, 22, 6), 201.0, 40))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from utils.geoip import MMDBReader, GeoEnricher, write_mmdb
+from database.database import DatabaseManager
+
+CITY = [
+    ("203.0.113.0/24", {"country": {"iso_code": "FR", "names": {"en": "France"}},
+                        "city": {"names": {"en": "Paris"}},
+                        "location": {"latitude": 48.85, "longitude": 2.35}}),
+    ("203.0.113.128/25", {"country": {"iso_code": "DE", "names": {"en": "Germany"}},
+                          "city": {"names": {"en": "Berlin"}},
+                          "location": {"latitude": 52.52, "longitude": 13.4}}),
+    ("2001:db8::/32", {"country": {"iso_code": "JP", "names": {"en": "Japan"}}}),
+]
+ASN = [("203.0.113.0/24", {"autonomous_system_number": 64500, "autonomous_system_organization": "Example AS"})]
+
+
+class TestGeoIP(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.city_db = os.path.join(self.tmp.name, "city.mmdb")
+        self.asn_db = os.path.join(self.tmp.name, "asn.mmdb")
+        write_mmdb(self.city_db, CITY, "GeoLite2-City")
+        write_mmdb(self.asn_db, ASN, "GeoLite2-ASN")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reader_longest_prefix(self):
+        reader = MMDBReader(self.city_db)
+        self.assertEqual(reader.metadata["database_type"], "GeoLite2-City")
+        self.assertEqual(reader.get("203.0.113.5")["city"]["names"]["en"], "Paris")
+        self.assertEqual(reader.get("203.0.113.200")["country"]["iso_code"], "DE")
+        self.assertEqual(reader.get("2001:db8::1")["country"]["iso_code"], "JP")
+        self.assertIsNone(reader.get("198.51.100.1"))
+        reader.close()
+
+    def test_enricher_cache_and_attacker_record(self):
+        enricher = GeoEnricher(self.city_db, self.asn_db, cache_size=2)
+        geo = enricher.lookup("203.0.113.5")
+        self.assertEqual(geo["country"], "France")
+        self.assertEqual(geo["coordinates"], [48.85, 2.35])
+        self.assertEqual(geo["asn"], 64500)
+        enricher.lookup("203.0.113.5")
+        self.assertEqual((enricher.hits, enricher.misses), (1, 1))
+        self.assertEqual(enricher.lookup("198.51.100.1")["country"], "Unknown")
+
+        db = DatabaseManager(os.path.join(self.tmp.name, "ghostnet.db"))
+        detections = [{"src_ip": "203.0.113.200", "type": "port_scan", "severity": "moyen"},
+                      {"src_ip": "203.0.113.200", "type": "ssh_bruteforce", "severity": "élevé"}]
+        self.assertEqual(db.record_attackers(detections, enricher), 1)
+        calls = (enricher.hits, enricher.misses)
+        db.record_attackers([{"src_ip": "203.0.113.200", "type": "port_scan", "severity": "faible"}], enricher)
+        self.assertEqual((enricher.hits, enricher.misses), calls)  # fiche existante : pas de nouvelle résolution
+        attackers, total = db.get_attackers()
+        self.assertEqual(total, 1)
+        self.assertEqual(attackers[0]["attacks"], 3)
+        self.assertEqual(attackers[0]["types"], ["port_scan", "ssh_bruteforce"])
+        self.assertEqual(attackers[0]["severity"], "élevé")
+        self.assertEqual(attackers[0]["geo"]["city"], "Berlin")
+        enricher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
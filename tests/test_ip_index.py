@@ -0,0 +1,61 @@
+import ipaddress
+import os
+import random
+import tempfile
+import unittest
+from utils.ip_index import PrefixIndex
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def test_longest_prefix_match(self):
+        index = PrefixIndex()
+        index.load_text([
+            "# liste interne",
+            "10.0.0.0/8 interne",
+            "10.1.0.0/16 dmz",
+            "10.1.2.3 scanner ; hôte unique",
+            "2001:db8::/32 doc6",
+            "",
+        ])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.lookup("10.200.0.1"), "interne")
+        self.assertEqual(index.lookup("10.1.9.9"), "dmz")
+        self.assertEqual(index.lookup("10.1.2.3"), "scanner")
+        self.assertEqual(index.lookup("2001:db8:1::1"), "doc6")
+        self.assertIsNone(index.lookup("192.168.1.1"))
+        self.assertNotIn("2001:db9::1", index)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.idx")
+            index.save(path)
+            mapped = PrefixIndex.load(path)
+            self.assertEqual(mapped.lookup("10.1.2.3"), "scanner")
+            self.assertEqual(mapped.lookup("2001:db8:1::1"), "doc6")
+            self.assertIsNone(mapped.lookup("::1"))
+            mapped.close()
+
+    def test_matches_bruteforce_and_snapshot(self):
+        rng = random.Random(1)
+        networks = []
+        index = PrefixIndex()
+        for i in range(500):
+            net = ipaddress.ip_network((rng.getrandbits(32), rng.randint(4, 32)), strict=False)
+            networks.append((net, i))
+            index.add(str(net), i)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "feed.idx")
+            index.save(path)
+            mapped = PrefixIndex.load(path)
+            for _ in range(2000):
+                ip = ipaddress.ip_address(rng.getrandbits(32))
+                matches = [(n.prefixlen, v) for n, v in networks if ip in n]
+                expected = None
+                if matches:
+                    # Plus long préfixe ; à préfixe égal, la dernière insertion l'emporte
+                    best_len = max(m[0] for m in matches)
+                    expected = [v for length, v in matches if length == best_len][-1]
+                self.assertEqual(index.lookup(str(ip)), expected)
+                self.assertEqual(mapped.lookup(str(ip)), expected)
+            mapped.close()
+
+if __name__ == "__main__":
+    unittest.main()
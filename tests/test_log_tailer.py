@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from detection.log_tailer import LogTailer
+from utils import inotify
+
+
+class TestLogTailer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, "auth.log")
+        self.checkpoint = os.path.join(self.tmp.name, "offsets.json")
+        self.lines = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text, mode="a"):
+        with open(self.log, mode) as f:
+            f.write(text)
+
+    def tailer(self, **kwargs):
+        return LogTailer([self.log], lambda batch: self.lines.extend(line for _, line in batch),
+                         checkpoint_path=self.checkpoint, **kwargs)
+
+    def test_batches_rotation_truncation_and_resume(self):
+        self.write("".join(f"line {i}\n" for i in range(25)) + "partial")
+        batches = []
+        tailer = LogTailer([self.log], batches.append, checkpoint_path=self.checkpoint,
+                           batch_size=10, chunk_size=64)
+        tailer.poll()
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+
+        # Rotation : la ligne partielle de l'ancien fichier est livrée, puis le nouveau est lu
+        os.rename(self.log, self.log + ".1")
+        self.write("after rotation\n")
+        tailer.poll()
+        self.assertEqual([line for batch in batches[3:] for _, line in batch], ["partial", "after rotation"])
+        self.assertEqual(tailer.stats["rotations"], 1)
+
+        self.write("x\n", mode="w")
+        tailer.poll()
+        self.assertEqual(tailer.stats["truncations"], 1)
+        self.assertEqual(batches[-1][-1][1], "x")
+        tailer.close()
+
+        # Reprise : seules les lignes écrites pendant l'arrêt sont relues
+        self.write("while stopped\n")
+        resumed = self.tailer()
+        resumed.poll()
+        self.assertEqual(self.lines, ["while stopped"])
+        resumed.close()
+
+    def test_resume_finishes_file_rotated_while_stopped(self):
+        self.write("a\nb\n")
+        tailer = self.tailer()
+        tailer.poll()
+        tailer.close()
+        self.write("c\n")
+        os.rename(self.log, self.log + ".1")
+        self.write("d\n", mode="w")
+        resumed = self.tailer()
+        resumed.poll()
+        self.assertEqual(self.lines, ["a", "b", "c", "d"])
+        resumed.close()
+
+    @unittest.skipUnless(inotify.available(), "inotify indisponible")
+    def test_run_follows_appends(self):
+        self.write("")
+        tailer = self.tailer(poll_interval=0.5)
+        thread = threading.Thread(target=tailer.run)
+        thread.start()
+        try:
+            time.sleep(0.1)
+            self.write("Failed password for root\n")
+            deadline = time.time() + 2
+            while not self.lines and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            tailer.stop()
+            thread.join()
+            tailer.close()
+        self.assertEqual(self.lines, ["Failed password for root"])
+
+
+if __name__ == "__main__":
+    unittest.main()
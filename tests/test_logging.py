@@ -0,0 +1,61 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from utils.log import setup_logger, stop_logging, SamplingFilter
+
+
+class ThreadRecorder:
+    """Argument de log qui note le thread dans lequel il est formaté."""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread()
+        return "formatted"
+
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ghostnet.log")
+
+    def tearDown(self):
+        stop_logging()
+        self.tmp.cleanup()
+
+    def test_json_lines_sampling_and_deferred_formatting(self):
+        logger = setup_logger("ghostnet.test", log_file=self.path, sample_every=10)
+        arg = ThreadRecorder()
+        for i in range(100):
+            logger.info("event %s", i)
+        logger.warning("alert %s", arg, extra={"src_ip": "10.0.0.1"})
+        logger.debug("ignored %s", "x")
+        stop_logging()
+
+        with open(self.path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        infos = [e for e in entries if e["level"] == "INFO"]
+        self.assertEqual([e["msg"] for e in infos], [f"event {i}" for i in range(0, 100, 10)])
+        self.assertEqual(infos[0]["sampled"], 10)
+        self.assertEqual(entries[-1]["msg"], "alert formatted")
+        self.assertEqual(entries[-1]["src_ip"], "10.0.0.1")
+        self.assertIsNot(arg.thread, threading.current_thread())
+
+    def test_sampling_counts_each_template_separately(self):
+        sampler = SamplingFilter(every=3)
+
+        def record(msg, level=logging.INFO):
+            return logging.LogRecord("ghostnet", level, "", 0, msg, (), None)
+
+        kept = [sampler.filter(record("frequent")) for _ in range(6)]
+        self.assertEqual(kept, [True, False, False, True, False, False])
+        self.assertTrue(sampler.filter(record("rare")))
+        self.assertTrue(all(sampler.filter(record("frequent", logging.WARNING)) for _ in range(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 from lure_generator.lure_generator import LureGenerator
+from lure_generator.content import ContentCache, render, template_for
 
 class TestLureGenerator(unittest.TestCase):
     def test_generate_file_lure(self):
@@ -13,5 +16,26 @@ class TestLureGenerator(unittest.TestCase):
         result = lg.generate_service_lure(12345)
         self.assertEqual(result["port"], 12345)
 
+    def test_templated_file_lure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            lg = LureGenerator(ContentCache(os.path.join(tmp, "cache")))
+            result = lg.generate_file_lure("prod.env", output_dir=os.path.join(tmp, "out"))
+            self.assertIn("DB_PASSWORD=", result["content"])
+            with open(os.path.join(tmp, "out", "prod.env"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), result["content"])
+
+    def test_bulk_generation_is_deterministic(self):
+        names = [f"clients_{i}.csv" for i in range(100)] + ["id_rsa", "app.conf"]
+        with tempfile.TemporaryDirectory() as tmp:
+            lg = LureGenerator(ContentCache(os.path.join(tmp, "cache"), seed=42))
+            paths = lg.generate_file_lures(names, os.path.join(tmp, "out"), workers=2)
+            self.assertEqual(len(paths), len(names))
+            with open(paths[0], encoding="utf-8") as f:
+                self.assertEqual(f.read(), render("csv", names[0], seed=42))
+            # L'index est persisté : un second cache retrouve les mêmes empreintes sans régénérer
+            digests = ContentCache(os.path.join(tmp, "cache"), seed=42).bulk(
+                [(template_for(n), n) for n in names])
+            self.assertEqual([l["digest"] for l in lg.list_lures()], digests)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
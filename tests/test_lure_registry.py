@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from database.lure_registry import LureRegistry
+from lure_generator.lure_generator import LureGenerator
+
+
+class TestLureRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "ghostnet.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_indexes_and_stats(self):
+        registry = LureRegistry(self.db_path)
+        lure = registry.add({"type": "service", "name": "SSH", "service": "ssh", "port": 2222})
+        self.assertEqual(lure["id"], "lure-001")
+        self.assertIs(registry.get("lure-001"), registry.get_by_port(2222))
+        self.assertEqual(len(registry.list("service")), 1)
+        registry.record_connection(2222, "10.0.0.1")
+        registry.record_connection(2222, "10.0.0.1")
+        registry.record_connection(2222, "10.0.0.2")
+        self.assertIsNone(registry.record_connection(9999, "10.0.0.3"))
+        stats = registry.get_stats("lure-001")
+        self.assertEqual(stats["connections"], 3)
+        self.assertEqual(stats["unique_ips"], 2)
+        registry.close()
+
+    def test_persistence_and_honeytoken_reload(self):
+        registry = LureRegistry(self.db_path)
+        lg = LureGenerator(registry=registry)
+        lure = lg.generate_service_lure(2222)
+        registry.record_connection(2222, "10.0.0.1")
+        registry.close()
+
+        reloaded = LureRegistry(self.db_path)
+        self.assertEqual(reloaded.get(lure["id"])["port"], 2222)
+        self.assertEqual(reloaded.get_stats(lure["id"])["connections"], 1)
+        self.assertEqual(reloaded.next_id(), "lure-002")
+        lg = LureGenerator(registry=reloaded)
+        password = lure["configuration"]["credentials"][0]["password"]
+        self.assertEqual(lg.honeytokens.lookup(password)["lure_id"], lure["id"])
+        self.assertTrue(reloaded.remove(lure["id"]))
+        self.assertIsNone(reloaded.get_by_port(2222))
+        reloaded.close()
+
+if __name__ == "__main__":
+    unittest.main()
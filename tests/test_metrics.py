@@ -0,0 +1,67 @@
+import threading
+import unittest
+from utils.metrics import MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def test_per_thread_counters_and_prometheus_output(self):
+        registry = MetricsRegistry()
+        events = registry.counter("ghostnet_events_total", "Événements", ["result"])
+        active = registry.gauge("ghostnet_active_lures", "Leurres actifs")
+        latency = registry.histogram("ghostnet_stage_seconds", "Durée", ["stage"], buckets=(0.01, 0.1, 1.0))
+
+        def work():
+            for _ in range(1000):
+                events.labels("signature").inc()
+                latency.labels("signature").observe(0.05)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        active.set(3)
+        latency.labels("ai").observe(2.0)
+
+        self.assertIs(registry.counter("ghostnet_events_total", "Événements", ["result"]), events)
+        self.assertIs(registry.get("ghostnet_events_total"), events)
+        self.assertEqual(events.labels(result="signature").value, 4000)
+        text = registry.render()
+        self.assertIn('# TYPE ghostnet_stage_seconds histogram', text)
+        self.assertIn('ghostnet_events_total{result="signature"} 4000', text)
+        self.assertIn('ghostnet_active_lures 3', text)
+        self.assertIn('ghostnet_stage_seconds_bucket{stage="signature",le="0.01"} 0', text)
+        self.assertIn('ghostnet_stage_seconds_bucket{stage="signature",le="0.1"} 4000', text)
+        self.assertIn('ghostnet_stage_seconds_bucket{stage="ai",le="+Inf"} 1', text)
+        self.assertIn('ghostnet_stage_seconds_count{stage="signature"} 4000', text)
+
+    def test_quantiles(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", buckets=(0.001, 0.01, 0.1, 1.0))
+        for i in range(100):
+            latency.observe(0.005 if i < 98 else 0.5)
+        self.assertTrue(0.001 < latency.quantile(0.5) <= 0.01)
+        self.assertTrue(0.1 < latency.quantile(0.99) <= 1.0)
+        summary = registry.summary()["latency_seconds"]
+        self.assertEqual(summary["count"], 100)
+
+    def test_finished_threads_are_folded_and_redefinition_rejected(self):
+        registry = MetricsRegistry()
+        events = registry.counter("ghostnet_events_total", "Événements")
+        for _ in range(50):
+            thread = threading.Thread(target=lambda: events.inc(2))
+            thread.start()
+            thread.join()
+        events.inc()
+        self.assertEqual(events.value, 101)
+        # Seule la cellule du thread principal reste enregistrée
+        self.assertLessEqual(len(events._default._shards), 2)
+        with self.assertRaises(ValueError):
+            registry.counter("ghostnet_events_total", "Événements", ["result"])
+        with self.assertRaises(ValueError):
+            registry.histogram("ghostnet_events_total")
+        self.assertIs(registry.counter("ghostnet_events_total"), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import json
+import struct
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy indisponible")
+class TestModelFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "model.safetensors")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_roundtrip_memory_mapped(self):
+        from ai_engine.model_format import save_model, load_model
+        weights = np.arange(12, dtype=np.float32).reshape(3, 4)
+        save_model(self.path, {"w": weights, "b": np.array([1, 2], dtype=np.int64), "vide": np.zeros(0)},
+                   metadata={"features": ["a", "b"]})
+        tensors, metadata = load_model(self.path)
+        self.assertEqual(metadata, {"features": ["a", "b"]})
+        np.testing.assert_array_equal(tensors["w"], weights)
+        self.assertEqual(tensors["b"].dtype, np.int64)
+        self.assertEqual(tensors["vide"].shape, (0,))
+        self.assertFalse(tensors["w"].flags.writeable)
+        copied, _ = load_model(self.path, mmap=False)
+        np.testing.assert_array_equal(copied["w"], weights)
+
+    def test_rejects_inconsistent_header(self):
+        from ai_engine.model_format import save_model, read_header, ModelFormatError, from_object
+        save_model(self.path, {"w": np.ones(4, dtype=np.float64)})
+        with open(self.path, "rb") as f:
+            (length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(length))
+        header["w"]["data_offsets"] = [0, 4096]
+        encoded = json.dumps(header).encode()
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<Q", len(encoded)) + encoded + b"\0" * 32)
+        with self.assertRaises(ModelFormatError):
+            read_header(self.path)
+        with self.assertRaises(ModelFormatError):
+            from_object({"classes": ["a", "b"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
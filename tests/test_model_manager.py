@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import shutil
+import zipfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
+
+import model_manager
+
+
+class TestModelManagerArchives(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        models = self.tmp / "models"
+        self.patches = [mock.patch.object(model_manager, "MODELS_DIR", models),
+                        mock.patch.object(model_manager, "EXPORTS_DIR", models / "exported")]
+        for patch in self.patches:
+            patch.start()
+        models.mkdir()
+        self.manager = model_manager.ModelManager()
+        self.manager.success = lambda message: None
+        self.errors = []
+        self.manager.error = self.errors.append
+        self.manager.create_model("anomaly/flow", {"type": "test", "version": "1.0.0"})
+        model_path = self.manager.get_model_path("anomaly/flow")
+        (model_path / "model.safetensors").write_bytes(os.urandom(3 * model_manager.CHUNK_SIZE + 17))
+        (model_path / "vocab").mkdir()
+        (model_path / "vocab" / "tokens.txt").write_text("root\nadmin\n")
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_export_import_roundtrip_with_hashes(self):
+        archive_path = self.tmp / "flow.zip"
+        self.assertTrue(self.manager.export_model("anomaly/flow", str(archive_path)))
+        with zipfile.ZipFile(archive_path) as archive:
+            metadata = json.loads(archive.read("metadata.json"))
+            self.assertEqual(archive.getinfo("model.safetensors").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(set(metadata["files"]), {"model.safetensors", "vocab/tokens.txt"})
+
+        self.assertTrue(self.manager.import_model("anomaly/copy", str(archive_path)))
+        source = self.manager.get_model_path("anomaly/flow")
+        copy = self.manager.get_model_path("anomaly/copy")
+        self.assertEqual((copy / "model.safetensors").read_bytes(), (source / "model.safetensors").read_bytes())
+        imported = self.manager.load_metadata("anomaly/copy")
+        self.assertEqual(imported["files"], metadata["files"])
+        self.assertEqual(imported["version"], "1.0.0")
+        self.assertEqual([p.name for p in copy.parent.iterdir() if p.name.startswith(".")], [])
+
+    def test_corrupted_archive_leaves_model_intact(self):
+        archive_path = self.tmp / "flow.zip"
+        self.manager.export_model("anomaly/flow", str(archive_path))
+        with zipfile.ZipFile(archive_path) as archive:
+            entries = {name: archive.read(name) for name in archive.namelist()}
+        metadata = json.loads(entries["metadata.json"])
+        metadata["files"]["vocab/tokens.txt"]["sha256"] = "0" * 64
+        entries["metadata.json"] = json.dumps(metadata).encode()
+        tampered = self.tmp / "tampered.zip"
+        with zipfile.ZipFile(tampered, "w") as archive:
+            for name, data in entries.items():
+                archive.writestr(name, data)
+
+        before = (self.manager.get_model_path("anomaly/flow") / "model.safetensors").read_bytes()
+        self.assertFalse(self.manager.import_model("anomaly/flow", str(tampered)))
+        self.assertIn("SHA-256", self.errors[-1])
+        model_path = self.manager.get_model_path("anomaly/flow")
+        self.assertEqual((model_path / "model.safetensors").read_bytes(), before)
+        self.assertEqual([p.name for p in model_path.parent.iterdir()], ["flow"])
+
+        with zipfile.ZipFile(self.tmp / "evil.zip", "w") as archive:
+            archive.writestr("../../evil.txt", "x")
+        self.assertFalse(self.manager.import_model("anomaly/evil", str(self.tmp / "evil.zip")))
+        self.assertFalse((self.tmp / "evil.txt").exists())
+
+    def test_catalog_tracks_changes_and_rebuilds(self):
+        self.manager.create_model("nlp/intent", {"type": "test"})
+        self.manager.update_metadata("nlp/intent", {"description": "Intentions"})
+        archive_path = self.tmp / "flow.zip"
+        self.manager.export_model("anomaly/flow", str(archive_path))
+        self.manager.import_model("anomaly/copy", str(archive_path))
+        models = dict(self.manager.list_models())
+        self.assertEqual(list(models), ["anomaly/copy", "anomaly/flow", "nlp/intent"])
+        self.assertEqual(models["nlp/intent"]["description"], "Intentions")
+        self.assertIn("model.safetensors", models["anomaly/copy"]["files"])
+
+        # Un second gestionnaire lit le même catalogue sans parcourir le disque
+        other = model_manager.ModelManager()
+        self.assertEqual(other.list_models(), self.manager.list_models())
+
+        # Modification hors gestionnaire : la reconstruction resynchronise le catalogue
+        shutil.rmtree(self.manager.get_model_path("nlp"))
+        self.assertIn("nlp/intent", dict(self.manager.list_models()))
+        self.assertEqual(self.manager.rebuild_catalog(), 2)
+        self.assertEqual([name for name, _ in self.manager.list_models()], ["anomaly/copy", "anomaly/flow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from ai_engine import AIEngine, ModelRegistry, register_scorer
+
+
+class Weights(list):
+    """Tenseur factice : une liste dont la taille mémoire est fixée."""
+    nbytes = 100
+
+
+def fake_loader(path):
+    with open(os.path.join(path, "metadata.json")) as f:
+        metadata = json.load(f)
+    if metadata.get("broken"):
+        raise ValueError("version invalide")
+    return {"w": Weights([metadata["bias"]])}, metadata
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name, **metadata):
+        path = os.path.join(self.tmp, name)
+        os.makedirs(path, exist_ok=True)
+        tmp = os.path.join(path, ".metadata.tmp")
+        with open(tmp, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp, os.path.join(path, "metadata.json"))
+
+    def test_lazy_load_and_lru_budget(self):
+        for name in ("a", "b", "c"):
+            self.write(name, version="1", bias=1)
+        calls = []
+        registry = ModelRegistry(self.tmp, memory_budget=200,
+                                 loader=lambda path: calls.append(path) or fake_loader(path))
+        self.assertEqual(registry.loaded(), [])
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")
+        self.assertEqual(len(calls), 2)
+        registry.get("c")
+        # b est le moins récemment utilisé : il sort pour respecter le budget
+        self.assertEqual([name for name, _ in registry.loaded()], ["a", "c"])
+        self.assertEqual(registry.evictions, 1)
+        with self.assertRaises(KeyError):
+            registry.get("absent")
+
+    def test_hot_swap_keeps_in_flight_reference(self):
+        self.write("m", version="1", bias=10, type="test")
+        registry = ModelRegistry(self.tmp, loader=fake_loader)
+        old = registry.get("m")
+        swaps = []
+        registry.subscribe(lambda new, previous: swaps.append((previous.version, new.version)))
+
+        self.write("m", version="1.1", broken=True)
+        self.assertEqual(registry.check(), [])
+        self.assertIs(registry.get("m"), old)
+
+        self.write("m", version="2", bias=20, type="test")
+        self.assertEqual(registry.check(), ["m"])
+        self.assertEqual(swaps, [("1", "2")])
+        self.assertEqual(old.tensors["w"], [10])
+        self.assertEqual(registry.get("m").tensors["w"], [20])
+
+    def test_engine_scores_with_registered_model(self):
+        self.write("m", version="3", bias=90, type="test-biais")
+        register_scorer("test-biais", lambda model, event: model.tensors["w"][0])
+        registry = ModelRegistry(self.tmp, loader=fake_loader)
+        engine = AIEngine(registry, "m")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(engine.score_event({"log": "x"})))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(r["score"] == 90 and r["niveau"] == "critique" for r in results))
+        self.assertEqual(results[0]["model"], {"name": "m", "version": "3"})
+        self.assertIsNone(AIEngine(registry, "absent").current_model())
+
+
+if __name__ == "__main__":
+    unittest.main()
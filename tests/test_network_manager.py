@@ -0,0 +1,54 @@
+import socket
+import time
+import unittest
+from network_manager.network_manager import NetworkManager
+
+
+def free_port():
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+class TestNetworkManager(unittest.TestCase):
+    def test_deploy_single_process(self):
+        nm = NetworkManager()
+        port = free_port()
+        result = nm.deploy_lure("127.0.0.1", port)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(nm.list_active_lures(), [{"ip": "127.0.0.1", "port": port}])
+        nm.close_all_lures()
+        self.assertEqual(nm.list_active_lures(), [])
+
+    def test_worker_pool_reports_connections(self):
+        events = []
+        nm = NetworkManager(workers=2, on_event=events.append)
+        port = free_port()
+        try:
+            result = nm.deploy_lure("127.0.0.1", port)
+            self.assertEqual(result["status"], "success")
+            self.assertEqual(result["workers"], 2)
+            for _ in range(3):
+                for _ in range(50):
+                    try:
+                        socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                        break
+                    except ConnectionRefusedError:
+                        time.sleep(0.05)
+            deadline = time.time() + 5
+            while len(events) < 3 and time.time() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(len(events), 3)
+            self.assertEqual(events[0]["type"], "connection")
+            self.assertEqual(events[0]["port"], port)
+            lures = nm.list_active_lures()
+            self.assertEqual(lures[0]["connections"], 3)
+            self.assertEqual(lures[0]["workers"]["total"], 2)
+        finally:
+            nm.close_all_lures()
+        self.assertEqual(nm.worker_pool.workers, {})
+
+if __name__ == "__main__":
+    unittest.main()
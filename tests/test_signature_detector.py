@@ -1,5 +1,6 @@
 import unittest
 from detection.signature_detector import SignatureDetector
+from lure_generator.lure_generator import LureGenerator
 
 class TestSignatureDetector(unittest.TestCase):
     def test_detect_known_signature(self):
@@ -15,5 +16,18 @@ class TestSignatureDetector(unittest.TestCase):
         result = detector.analyze(log)
         self.assertFalse(result["detected"])
 
+    def test_detect_honeytoken_reuse(self):
+        lg = LureGenerator()
+        lure = lg.generate_service_lure(2222)
+        password = lure["configuration"]["credentials"][0]["password"]
+        detector = SignatureDetector(lg.honeytokens)
+        result = detector.analyze(f"Accepted password {password} for admin from 10.0.0.5")
+        self.assertTrue(result["detected"])
+        self.assertEqual(result["type"], "honeytoken")
+        self.assertEqual(result["lure_id"], lure["id"])
+        key_line = "aws s3 ls --access-key " + lure["configuration"]["api_key"]
+        self.assertEqual(detector.analyze(key_line)["type"], "honeytoken")
+        self.assertFalse(detector.analyze("Connexion réussie AAAAAAAAAAAAAAAAAAAA")["detected"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from utils.sketches import HyperLogLog, CountMinSketch, TopK, TimeBuckets
+from database.lure_registry import LureRegistry, LureStats
+
+
+def ip(i):
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+class TestSketches(unittest.TestCase):
+    def test_hyperloglog_accuracy_and_merge(self):
+        a, b = HyperLogLog(12), HyperLogLog(12)
+        for i in range(30000):
+            a.add(ip(i))
+        for i in range(20000, 50000):
+            b.add(ip(i))
+        self.assertLess(abs(a.count() - 30000) / 30000, 0.05)
+        small = HyperLogLog(12)
+        for value in ("10.0.0.1", "10.0.0.2", "10.0.0.1"):
+            small.add(value)
+        self.assertEqual(len(small), 2)
+        # Fusion = union, sans double comptage de la partie commune
+        union = HyperLogLog.from_bytes(a.to_bytes()).merge(b)
+        self.assertLess(abs(union.count() - 50000) / 50000, 0.05)
+        with self.assertRaises(ValueError):
+            a.merge(HyperLogLog(10))
+
+    def test_count_min_never_underestimates(self):
+        cms = CountMinSketch(256, 4)
+        exact = {}
+        rng = random.Random(1)
+        for _ in range(5000):
+            value = rng.randrange(2000)
+            exact[value] = exact.get(value, 0) + 1
+            cms.add(value)
+        for value, count in exact.items():
+            self.assertGreaterEqual(cms.estimate(value), count)
+        copy = CountMinSketch.from_bytes(cms.to_bytes())
+        self.assertEqual(copy.merge(cms).estimate(0), 2 * cms.estimate(0))
+        self.assertEqual(copy.total, 10000)
+
+    def test_topk_heavy_hitters_across_workers(self):
+        rng = random.Random(2)
+        workers = [TopK(5), TopK(5)]
+        for n in range(40000):
+            heavy = rng.random() < 0.3
+            value = f"heavy{rng.randrange(3)}" if heavy else ip(rng.randrange(20000))
+            workers[n % 2].add(value)
+        merged = TopK.from_bytes(workers[0].to_bytes()).merge(workers[1])
+        top = [value for value, _ in merged.top(3)]
+        self.assertEqual(sorted(top), ["heavy0", "heavy1", "heavy2"])
+        self.assertGreaterEqual(merged.top(1)[0][1], 3500)
+
+    def test_time_buckets_window(self):
+        buckets = TimeBuckets(lambda: HyperLogLog(10), width=60, count=3)
+        for minute in range(5):
+            for i in range(100):
+                buckets.get(minute * 60 + 1).add(f"{minute}-{i}")
+        self.assertEqual(len(buckets.buckets), 3)
+        self.assertAlmostEqual(len(buckets.window(60, now=4 * 60 + 30)), 200, delta=10)
+        self.assertAlmostEqual(len(buckets.window(600, now=4 * 60 + 30)), 300, delta=15)
+
+
+class TestLureStatsSketches(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "ghostnet.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stats_persist_merge_and_attackers(self):
+        registry = LureRegistry(self.db_path)
+        lure = registry.add({"type": "service", "name": "SSH", "port": 2222})
+        for i in range(1000):
+            registry.record_connection(2222, ip(i % 250), username="root" if i % 2 else "admin")
+        registry.record_connection(2222, "203.0.113.7")
+        other = LureStats()
+        for i in range(200, 400):
+            other.connections += 1
+            other.record(ip(i), 1.0)
+        registry.merge_stats(lure["id"], other)
+        stats = registry.get_stats(lure["id"])
+        self.assertEqual(stats["connections"], 1201)
+        self.assertLess(abs(stats["unique_ips"] - 401), 12)
+        attackers = registry.attacker_stats()
+        self.assertEqual(attackers["top_ports"][0], (2222, 1001))
+        self.assertEqual({name for name, _ in attackers["top_usernames"]}, {"root", "admin"})
+        registry.close()
+
+        reloaded = LureRegistry(self.db_path)
+        again = reloaded.get_stats(lure["id"])
+        self.assertEqual(again["unique_ips"], stats["unique_ips"])
+        self.assertEqual(again["top_ips"], stats["top_ips"])
+        reloaded.close()
+
+    def test_legacy_ip_list_is_migrated(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE lure_stats (lure_id TEXT PRIMARY KEY, connections INTEGER, ips TEXT, "
+                     "last_connection REAL)")
+        conn.execute("INSERT INTO lure_stats VALUES ('lure-001', 3, '[\"10.0.0.1\", \"10.0.0.2\"]', NULL)")
+        conn.execute("CREATE TABLE lures (id TEXT PRIMARY KEY, type TEXT, port INTEGER, data TEXT)")
+        conn.execute("INSERT INTO lures VALUES ('lure-001', 'service', 2222, "
+                     "'{\"id\": \"lure-001\", \"type\": \"service\", \"port\": 2222}')")
+        conn.commit()
+        conn.close()
+        registry = LureRegistry(self.db_path)
+        self.assertEqual(registry.get_stats("lure-001")["unique_ips"], 2)
+        registry.close()
+        reloaded = LureRegistry(self.db_path)
+        self.assertEqual(reloaded.get_stats("lure-001")["unique_ips"], 2)
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
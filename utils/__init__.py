@@ -1 +1,5 @@
-from .utils import setup_logger, load_config, save_config
\ No newline at end of file
+from .utils import load_config, save_config
+from .log import setup_logger, stop_logging
+from .sketches import BloomFilter, HyperLogLog, CountMinSketch, TopK, TimeBuckets
+from .ip_index import PrefixIndex
+from .geoip import GeoEnricher, MMDBReader
@@ -0,0 +1,314 @@
+import os
+import mmap
+import json
+import time
+import struct
+from collections import OrderedDict
+
+from .ip_index import parse_ip, parse_cidr
+
+METADATA_MARKER = b"\xab\xcd\xefMaxMind.com"
+DATA_SEPARATOR = 16
+
+UNKNOWN_GEO = {
+    "country": "Unknown",
+    "country_code": None,
+    "city": "Unknown",
+    "coordinates": [0, 0],
+    "asn": None,
+    "as_org": None,
+}
+
+_double = struct.Struct(">d").unpack_from
+_float = struct.Struct(">f").unpack_from
+
+
+class MMDBReader:
+    """Lecteur pur Python des bases au format MaxMind DB (GeoLite2, DB-IP...).
+
+    Le fichier est ouvert par mmap : seules les pages de l'arbre parcourues et
+    les enregistrements décodés sont lus, aucune requête réseau n'est émise.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = self._map.rfind(METADATA_MARKER)
+        if start == -1:
+            self._map.close()
+            raise ValueError(f"Base MMDB invalide (métadonnées absentes) : {path}")
+        start += len(METADATA_MARKER)
+        self.metadata, _ = self._decode(start, start)
+        self.node_count = self.metadata["node_count"]
+        self.record_size = self.metadata["record_size"]
+        self.ip_version = self.metadata["ip_version"]
+        if self.record_size not in (24, 28, 32):
+            raise ValueError(f"Taille d'enregistrement non supportée : {self.record_size}")
+        self.node_bytes = self.record_size // 4
+        self.tree_size = self.node_count * self.node_bytes
+        self.data_start = self.tree_size + DATA_SEPARATOR
+        # Les IPv4 d'une base IPv6 sont rangées sous ::/96 : on saute ces 96 bits une fois
+        self._ipv4_start = 0
+        if self.ip_version == 6:
+            node = 0
+            for _ in range(96):
+                if node >= self.node_count:
+                    break
+                node = self._record(node, 0)
+            self._ipv4_start = node
+
+    def _record(self, node, bit):
+        data, base = self._map, node * self.node_bytes
+        if self.record_size == 24:
+            offset = base + bit * 3
+            return int.from_bytes(data[offset:offset + 3], "big")
+        if self.record_size == 28:
+            if bit:
+                return ((data[base + 3] & 0x0F) << 24) | int.from_bytes(data[base + 4:base + 7], "big")
+            return ((data[base + 3] & 0xF0) << 20) | int.from_bytes(data[base:base + 3], "big")
+        offset = base + bit * 4
+        return int.from_bytes(data[offset:offset + 4], "big")
+
+    def _decode(self, offset, base):
+        """Décode la valeur à ``offset`` ; ``base`` est l'origine des pointeurs."""
+        data = self._map
+        ctrl = data[offset]
+        offset += 1
+        type_ = ctrl >> 5
+        if type_ == 1:
+            size = (ctrl >> 3) & 0x3
+            if size == 0:
+                pointer = ((ctrl & 0x7) << 8) | data[offset]
+            elif size == 1:
+                pointer = (((ctrl & 0x7) << 16) | int.from_bytes(data[offset:offset + 2], "big")) + 2048
+            elif size == 2:
+                pointer = (((ctrl & 0x7) << 24) | int.from_bytes(data[offset:offset + 3], "big")) + 526336
+            else:
+                pointer = int.from_bytes(data[offset:offset + 4], "big")
+            value, _ = self._decode(base + pointer, base)
+            return value, offset + size + 1
+        if type_ == 0:
+            type_ = 7 + data[offset]
+            offset += 1
+        size = ctrl & 0x1F
+        if size >= 29:
+            extra = size - 28
+            raw = int.from_bytes(data[offset:offset + extra], "big")
+            size = (29, 285, 65821)[extra - 1] + raw
+            offset += extra
+
+        if type_ == 2:
+            return data[offset:offset + size].decode("utf-8"), offset + size
+        if type_ == 7:
+            result = {}
+            for _ in range(size):
+                key, offset = self._decode(offset, base)
+                result[key], offset = self._decode(offset, base)
+            return result, offset
+        if type_ == 11:
+            result = []
+            for _ in range(size):
+                item, offset = self._decode(offset, base)
+                result.append(item)
+            return result, offset
+        if type_ in (5, 6, 9, 10):
+            return int.from_bytes(data[offset:offset + size], "big"), offset + size
+        if type_ == 8:
+            return int.from_bytes(data[offset:offset + size], "big", signed=size == 4), offset + size
+        if type_ == 3:
+            return _double(data, offset)[0], offset + 8
+        if type_ == 15:
+            return _float(data, offset)[0], offset + 4
+        if type_ == 14:
+            return bool(size), offset
+        if type_ == 4:
+            return bytes(data[offset:offset + size]), offset + size
+        raise ValueError(f"Type MMDB inconnu : {type_}")
+
+    def get(self, ip):
+        """Retourne l'enregistrement associé à ``ip``, ou None."""
+        family, addr = parse_ip(ip)
+        if family == 4:
+            node, bits = self._ipv4_start, 32
+        elif self.ip_version == 6:
+            node, bits = 0, 128
+        else:
+            return None
+        node_count = self.node_count
+        for i in range(bits - 1, -1, -1):
+            if node >= node_count:
+                break
+            node = self._record(node, (addr >> i) & 1)
+        if node <= node_count:
+            return None
+        value, _ = self._decode(self.data_start + node - node_count - DATA_SEPARATOR, self.data_start)
+        return value
+
+    def close(self):
+        self._map.close()
+
+
+def _encode_ctrl(type_, size):
+    head = b""
+    if type_ > 7:
+        head, type_ = bytes([type_ - 7]), 0
+    if size < 29:
+        return bytes([type_ << 5 | size]) + head
+    if size < 285:
+        return bytes([type_ << 5 | 29]) + head + bytes([size - 29])
+    if size < 65821:
+        return bytes([type_ << 5 | 30]) + head + (size - 285).to_bytes(2, "big")
+    return bytes([type_ << 5 | 31]) + head + (size - 65821).to_bytes(3, "big")
+
+
+def _encode(value):
+    if isinstance(value, bool):
+        return _encode_ctrl(14, int(value))
+    if isinstance(value, str):
+        raw = value.encode("utf-8")
+        return _encode_ctrl(2, len(raw)) + raw
+    if isinstance(value, dict):
+        return _encode_ctrl(7, len(value)) + b"".join(_encode(str(k)) + _encode(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return _encode_ctrl(11, len(value)) + b"".join(_encode(v) for v in value)
+    if isinstance(value, float):
+        return _encode_ctrl(3, 8) + struct.pack(">d", value)
+    if isinstance(value, int):
+        raw = value.to_bytes((value.bit_length() + 7) // 8, "big") if value > 0 else b""
+        return _encode_ctrl(6 if value < 1 << 32 else 9, len(raw)) + raw
+    if isinstance(value, bytes):
+        return _encode_ctrl(4, len(value)) + value
+    raise TypeError(f"Type non encodable en MMDB : {type(value).__name__}")
+
+
+def write_mmdb(path, networks, database_type="GhostNet-GeoIP", ip_version=6):
+    """Écrit une base MMDB (enregistrements de 32 bits) à partir de (cidr, dict).
+
+    Permet de produire une base locale à partir d'exports CSV ou de jeux de test.
+    """
+    tree = [[None, None]]
+    data, data_offsets = bytearray(), {}
+    entries = []
+    for cidr, record in networks:
+        family, prefix, length = parse_cidr(cidr)
+        if ip_version == 6 and family == 4:
+            prefix, length = prefix, length + 96
+            bits = 128
+        else:
+            bits = 32 if family == 4 else 128
+        key = json.dumps(record, sort_keys=True)
+        if key not in data_offsets:
+            data_offsets[key] = len(data)
+            data += _encode(record)
+        entries.append((length, prefix, bits, data_offsets[key]))
+
+    # Les préfixes courts d'abord : un préfixe plus long scinde ensuite la feuille héritée
+    for length, prefix, bits, offset in sorted(entries, key=lambda e: e[0]):
+        node = 0
+        for depth in range(length):
+            bit = (prefix >> (bits - 1 - depth)) & 1
+            if depth == length - 1:
+                tree[node][bit] = ("data", offset)
+                break
+            child = tree[node][bit]
+            if not isinstance(child, int):
+                tree.append([child, child])
+                child = tree[node][bit] = len(tree) - 1
+            node = child
+
+    node_count = len(tree)
+
+    def record(value):
+        if value is None:
+            return node_count
+        if isinstance(value, tuple):
+            return node_count + DATA_SEPARATOR + value[1]
+        return value
+
+    metadata = {
+        "node_count": node_count,
+        "record_size": 32,
+        "ip_version": ip_version,
+        "database_type": database_type,
+        "languages": ["en"],
+        "binary_format_major_version": 2,
+        "binary_format_minor_version": 0,
+        "build_epoch": int(time.time()),
+        "description": {"en": database_type},
+    }
+    with open(path, "wb") as f:
+        for left, right in tree:
+            f.write(struct.pack(">II", record(left), record(right)))
+        f.write(bytes(DATA_SEPARATOR))
+        f.write(data)
+        f.write(METADATA_MARKER)
+        f.write(_encode(metadata))
+
+
+class GeoEnricher:
+    """Résolution hors ligne IP -> pays, ville et ASN, avec un cache LRU.
+
+    Les adresses des attaquants actifs reviennent en boucle : le cache évite de
+    reparcourir l'arbre et de redécoder l'enregistrement pour chaque alerte.
+    """
+
+    def __init__(self, city_db=None, asn_db=None, cache_size=65536):
+        """
+        Args:
+            city_db (str): Base MMDB de type City ou Country.
+            asn_db (str): Base MMDB de type ASN.
+            cache_size (int): Nombre d'adresses conservées dans le cache.
+        """
+        self.city = MMDBReader(city_db) if city_db and os.path.exists(city_db) else None
+        self.asn = MMDBReader(asn_db) if asn_db and os.path.exists(asn_db) else None
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def available(self):
+        return self.city is not None or self.asn is not None
+
+    def _resolve(self, ip):
+        geo = dict(UNKNOWN_GEO)
+        try:
+            city = self.city.get(ip) if self.city else None
+            asn = self.asn.get(ip) if self.asn else None
+        except (OSError, ValueError):
+            return geo
+        if city:
+            country = city.get("country") or city.get("registered_country") or {}
+            geo["country"] = country.get("names", {}).get("en", geo["country"])
+            geo["country_code"] = country.get("iso_code")
+            geo["city"] = city.get("city", {}).get("names", {}).get("en", geo["city"])
+            location = city.get("location", {})
+            if "latitude" in location:
+                geo["coordinates"] = [location["latitude"], location["longitude"]]
+        if asn:
+            geo["asn"] = asn.get("autonomous_system_number")
+            geo["as_org"] = asn.get("autonomous_system_organization")
+        return geo
+
+    def lookup(self, ip):
+        """Retourne les informations géographiques d'une adresse (copie partagée, ne pas modifier)."""
+        cache = self._cache
+        geo = cache.get(ip)
+        if geo is not None:
+            cache.move_to_end(ip)
+            self.hits += 1
+            return geo
+        self.misses += 1
+        geo = cache[ip] = self._resolve(ip)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return geo
+
+    def enrich_batch(self, ips):
+        """Résout un lot d'adresses (chaque adresse distincte une seule fois)."""
+        return {ip: self.lookup(ip) for ip in set(ips)}
+
+    def close(self):
+        for reader in (self.city, self.asn):
+            if reader is not None:
+                reader.close()
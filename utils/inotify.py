@@ -0,0 +1,100 @@
+import os
+import ctypes
+import ctypes.util
+import select
+import struct
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_event = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True) if name else None
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            _libc = False
+        else:
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            _libc = libc
+    return _libc
+
+
+def available():
+    """Indique si inotify est utilisable (Linux avec une libc qui l'expose)."""
+    try:
+        return bool(_load_libc())
+    except OSError:
+        return False
+
+
+class Inotify:
+    """Accès minimal à inotify via ctypes, sans dépendance externe."""
+
+    def __init__(self):
+        libc = _load_libc()
+        if not libc:
+            raise OSError("inotify indisponible sur ce système")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self.watches = {}
+
+    def add_watch(self, path, mask):
+        """Surveille ``path`` ; retourne le descripteur de surveillance."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self.watches[wd] = path
+        return wd
+
+    def rm_watch(self, wd):
+        self.watches.pop(wd, None)
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout=None):
+        """Attend des événements au plus ``timeout`` secondes.
+
+        Returns:
+            list: Tuples (chemin surveillé, masque, nom de l'entrée ou None).
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _event.size <= len(data):
+            wd, mask, _, length = _event.unpack_from(data, offset)
+            offset += _event.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((self.watches.get(wd), mask, os.fsdecode(name) if name else None))
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+        return events
+
+    def close(self):
+        os.close(self.fd)
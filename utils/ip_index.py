@@ -0,0 +1,242 @@
+import json
+import mmap
+import socket
+import struct
+
+MAGIC = b"GNPX"
+_HEADER = struct.Struct("<4sIII")
+_NODE4 = struct.Struct("<IBiii")
+_NODE6 = struct.Struct("<QQBiii")
+_BITS = {4: 32, 6: 128}
+
+
+def parse_ip(ip):
+    """Convertit une adresse texte en (famille, entier)."""
+    if ":" in ip:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+    return 4, int.from_bytes(socket.inet_aton(ip), "big")
+
+
+def parse_cidr(cidr):
+    """Convertit ``a.b.c.d/len`` (ou une adresse seule) en (famille, réseau, longueur)."""
+    ip, _, length = cidr.strip().partition("/")
+    family, value = parse_ip(ip)
+    bits = _BITS[family]
+    length = int(length) if length else bits
+    if not 0 <= length <= bits:
+        raise ValueError(f"Longueur de préfixe invalide : {cidr}")
+    mask = ((1 << length) - 1) << (bits - length)
+    return family, value & mask, length
+
+
+class _Trie:
+    """Arbre Patricia (radix compressé) stocké en colonnes pour une famille d'adresses."""
+    __slots__ = ("bits", "prefix", "length", "left", "right", "value")
+
+    def __init__(self, bits):
+        self.bits = bits
+        # Nœud 0 : racine de longueur 0, ancêtre de tous les préfixes
+        self.prefix, self.length = [0], [0]
+        self.left, self.right, self.value = [-1], [-1], [-1]
+
+    def _new(self, prefix, length, value=-1):
+        self.prefix.append(prefix)
+        self.length.append(length)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.value.append(value)
+        return len(self.prefix) - 1
+
+    def _bit(self, value, i):
+        return (value >> (self.bits - 1 - i)) & 1
+
+    def _set_child(self, node, bit, child):
+        (self.right if bit else self.left)[node] = child
+
+    def insert(self, prefix, length, value):
+        bits = self.bits
+        node, parent, side = 0, -1, 0
+        while True:
+            node_len = self.length[node]
+            m = min(length, node_len)
+            diff = (prefix ^ self.prefix[node]) >> (bits - m) if m else 0
+            common = m - diff.bit_length()
+            if common < node_len:
+                # Le préfixe diverge au milieu de ce nœud : on le scinde
+                split_prefix = prefix & (((1 << common) - 1) << (bits - common)) if common else 0
+                if common == length:
+                    split = self._new(split_prefix, common, value)
+                else:
+                    split = self._new(split_prefix, common)
+                    leaf = self._new(prefix, length, value)
+                    self._set_child(split, self._bit(prefix, common), leaf)
+                self._set_child(split, self._bit(self.prefix[node], common), node)
+                self._set_child(parent, side, split)
+                return
+            if length == node_len:
+                self.value[node] = value
+                return
+            side = self._bit(prefix, node_len)
+            child = (self.right if side else self.left)[node]
+            if child == -1:
+                self._set_child(node, side, self._new(prefix, length, value))
+                return
+            parent, node = node, child
+
+    def lookup(self, addr):
+        bits = self.bits
+        prefix, length, left, right, value = self.prefix, self.length, self.left, self.right, self.value
+        node, best = 0, -1
+        while node != -1:
+            node_len = length[node]
+            if (addr ^ prefix[node]) >> (bits - node_len):
+                break
+            if value[node] != -1:
+                best = value[node]
+            if node_len == bits:
+                break
+            node = right[node] if (addr >> (bits - 1 - node_len)) & 1 else left[node]
+        return best
+
+
+class PrefixIndex:
+    """Index de préfixes IPv4/IPv6 avec recherche du plus long préfixe.
+
+    Répond à « cette adresse appartient-elle à l'un de ces 500k CIDR ? » en
+    parcourant au plus la profondeur de l'arbre compressé, indépendamment du
+    nombre de préfixes. ``save`` produit un instantané plat que ``load`` ouvre
+    par mmap, sans reconstruire l'arbre.
+    """
+
+    def __init__(self):
+        self._tries = {4: _Trie(32), 6: _Trie(128)}
+        self._values = []
+        self._value_ids = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _value_id(self, value):
+        try:
+            key = (type(value), value)
+            hash(key)
+        except TypeError:
+            key = json.dumps(value, sort_keys=True)
+        vid = self._value_ids.get(key)
+        if vid is None:
+            vid = self._value_ids[key] = len(self._values)
+            self._values.append(value)
+        return vid
+
+    def add(self, cidr, value=True):
+        """Ajoute un préfixe associé à une valeur (étiquette, source de réputation...)."""
+        family, prefix, length = parse_cidr(cidr)
+        self._tries[family].insert(prefix, length, self._value_id(value))
+        self.count += 1
+
+    def load_text(self, lines, value=True):
+        """Charge en masse un flux texte : un CIDR par ligne, ``#`` et ``;`` pour les commentaires.
+
+        Un second champ sur la ligne, s'il est présent, sert d'étiquette.
+
+        Returns:
+            int: Nombre de préfixes chargés.
+        """
+        if isinstance(lines, str):
+            with open(lines, "r", encoding="utf-8") as f:
+                return self.load_text(f, value)
+        loaded = 0
+        for line in lines:
+            line = line.split("#", 1)[0].split(";", 1)[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            self.add(fields[0], fields[1] if len(fields) > 1 else value)
+            loaded += 1
+        return loaded
+
+    def lookup(self, ip):
+        """Retourne la valeur du plus long préfixe contenant ``ip``, ou None."""
+        family, addr = parse_ip(ip)
+        vid = self._tries[family].lookup(addr)
+        return self._values[vid] if vid != -1 else None
+
+    def __contains__(self, ip):
+        return self.lookup(ip) is not None
+
+    def save(self, path):
+        """Écrit un instantané binaire plat, chargeable par ``PrefixIndex.load``."""
+        t4, t6 = self._tries[4], self._tries[6]
+        values = json.dumps(self._values).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(t4.prefix), len(t6.prefix), len(values)))
+            for i in range(len(t4.prefix)):
+                f.write(_NODE4.pack(t4.prefix[i], t4.length[i], t4.left[i], t4.right[i], t4.value[i]))
+            for i in range(len(t6.prefix)):
+                f.write(_NODE6.pack(t6.prefix[i] >> 64, t6.prefix[i] & 0xFFFFFFFFFFFFFFFF,
+                                    t6.length[i], t6.left[i], t6.right[i], t6.value[i]))
+            f.write(values)
+
+    @staticmethod
+    def load(path):
+        """Ouvre un instantané par mmap ; les nœuds sont lus à la demande."""
+        return MappedPrefixIndex(path)
+
+
+class MappedPrefixIndex:
+    """Index de préfixes en lecture seule, servi directement depuis un fichier mmap.
+
+    Le chargement ne lit que l'en-tête et la table des valeurs : le démarrage
+    prend quelques millisecondes, et plusieurs processus partagent les pages.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n4, self.n6, values_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Instantané d'index IP invalide : {path}")
+        self.off4 = _HEADER.size
+        self.off6 = self.off4 + self.n4 * _NODE4.size
+        values_off = self.off6 + self.n6 * _NODE6.size
+        self._values = json.loads(self._map[values_off:values_off + values_len])
+
+    def _lookup4(self, addr):
+        unpack, size, base, data = _NODE4.unpack_from, _NODE4.size, self.off4, self._map
+        node, best = 0, -1
+        while node != -1:
+            prefix, length, left, right, value = unpack(data, base + node * size)
+            if (addr ^ prefix) >> (32 - length):
+                break
+            if value != -1:
+                best = value
+            if length == 32:
+                break
+            node = right if (addr >> (31 - length)) & 1 else left
+        return best
+
+    def _lookup6(self, addr):
+        unpack, size, base, data = _NODE6.unpack_from, _NODE6.size, self.off6, self._map
+        node, best = 0, -1
+        while node != -1:
+            hi, lo, length, left, right, value = unpack(data, base + node * size)
+            if (addr ^ (hi << 64 | lo)) >> (128 - length):
+                break
+            if value != -1:
+                best = value
+            if length == 128:
+                break
+            node = right if (addr >> (127 - length)) & 1 else left
+        return best
+
+    def lookup(self, ip):
+        family, addr = parse_ip(ip)
+        vid = self._lookup4(addr) if family == 4 else self._lookup6(addr)
+        return self._values[vid] if vid != -1 else None
+
+    def __contains__(self, ip):
+        return self.lookup(ip) is not None
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,121 @@
+import json
+import queue
+import atexit
+import logging
+import datetime
+import threading
+import logging.handlers
+
+# Attributs standard d'un LogRecord : tout le reste provient de ``extra=``
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listeners = {}
+_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """Formate chaque enregistrement en une ligne JSON (horodatage ISO, niveau, logger, message)."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Ne laisse passer qu'un message sur ``every`` pour chaque modèle de message.
+
+    Seuls les niveaux inférieurs ou égaux à ``max_level`` sont échantillonnés :
+    avertissements et erreurs passent toujours. Le compteur est tenu par modèle
+    (le ``msg`` avant substitution des arguments), si bien qu'un message rare
+    n'est jamais masqué par un message fréquent. Les enregistrements retenus
+    portent ``sampled`` = ``every``.
+    """
+
+    def __init__(self, every=100, max_level=logging.INFO):
+        super().__init__()
+        self.every = every
+        self.max_level = max_level
+        self.counts = {}
+
+    def filter(self, record):
+        if self.every <= 1 or record.levelno > self.max_level:
+            return True
+        # Compteur approximatif sous contention : quelques messages de plus ou de moins
+        count = self.counts.get(record.msg, 0)
+        self.counts[record.msg] = count + 1
+        if count % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler qui ne formate pas le message dans le thread appelant.
+
+    ``QueueHandler.prepare`` substitue les arguments avant la mise en file ;
+    ici l'enregistrement est transmis tel quel et le formatage a lieu dans le
+    thread du ``QueueListener``. Les arguments doivent donc être immuables
+    (chaînes, nombres) ou ne plus être modifiés après l'appel.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logger(name="ghostnet", level=logging.INFO, log_file=None, json_lines=True, sample_every=1):
+    """Configure et retourne un logger dont les sorties sont écrites en arrière-plan.
+
+    Le thread appelant ne fait que créer l'enregistrement et le déposer dans une
+    file ; un ``QueueListener`` se charge du formatage et des écritures (console
+    et, si ``log_file`` est fourni, fichier).
+
+    Args:
+        json_lines (bool): Sortie JSON lines plutôt que texte.
+        sample_every (int): Échantillonnage des messages INFO et DEBUG (1 = tous).
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    with _lock:
+        if name in _listeners:
+            return logger
+        for handler in [h for h in logger.handlers if isinstance(h, DeferredQueueHandler)]:
+            logger.removeHandler(handler)  # file d'un listener déjà arrêté
+        formatter = JSONFormatter() if json_lines else logging.Formatter(
+            "[%(asctime)s] %(levelname)s - %(message)s")
+        handlers = [logging.StreamHandler()]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        if sample_every > 1:
+            queue_handler.addFilter(SamplingFilter(sample_every))
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+        _listeners[name] = listener
+    return logger
+
+
+def stop_logging():
+    """Vide les files et arrête les threads d'écriture (appelé à la sortie)."""
+    with _lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+
+
+atexit.register(stop_logging)
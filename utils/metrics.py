@@ -0,0 +1,293 @@
+import time
+import bisect
+import weakref
+import threading
+
+# Bornes par défaut des histogrammes de latence, en secondes (100 µs à 10 s)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Sharded:
+    """Accumulation par thread : chaque thread écrit dans sa propre cellule, sans verrou.
+
+    Une cellule est enregistrée (sous verrou) une seule fois par thread. Quand
+    le thread se termine, ses valeurs sont reportées dans un total des threads
+    terminés et sa cellule est libérée : le nombre de cellules suit le nombre de
+    threads vivants, pas le nombre de threads ayant un jour écrit.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = {}
+        self._retired = [0] * size
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0] * self._size
+            # Jeton propre au thread : libéré avec ses données locales à la fin du thread
+            token = self._local.token = _Token()
+            with self._lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(token, self._retire, shard)
+            return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            if self._shards.pop(id(shard), None) is not None:
+                for i, value in enumerate(shard):
+                    self._retired[i] += value
+
+    def _sum(self):
+        with self._lock:
+            shards = list(self._shards.values())
+            totals = list(self._retired)
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _Token:
+    __slots__ = ("__weakref__",)
+
+
+class Counter(_Sharded):
+    """Compteur monotone."""
+    kind = "counter"
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1):
+        self._shard()[0] += amount
+
+    @property
+    def value(self):
+        return self._sum()[0]
+
+    def samples(self, name, names, values):
+        yield name, _format_labels(names, values), self.value
+
+
+class Gauge:
+    """Valeur instantanée (dernière écriture), ou calculée à la lecture par ``set_function``."""
+    kind = "gauge"
+
+    def __init__(self):
+        self._value = 0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        self._function = function
+
+    @property
+    def value(self):
+        return self._function() if self._function is not None else self._value
+
+    def samples(self, name, names, values):
+        yield name, _format_labels(names, values), self.value
+
+
+class Histogram(_Sharded):
+    """Histogramme à bornes fixes ; chaque cellule contient les compteurs par case puis la somme."""
+    kind = "histogram"
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(len(self.buckets) + 2)
+
+    def observe(self, value):
+        shard = self._shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        """Gestionnaire de contexte mesurant la durée du bloc."""
+        return _Timer(self)
+
+    def snapshot(self):
+        """Retourne (compteurs par case non cumulés, nombre, somme)."""
+        totals = self._sum()
+        counts = totals[:-1]
+        return counts, sum(counts), totals[-1]
+
+    def quantile(self, q):
+        """Estimation d'un quantile par interpolation linéaire dans la case concernée."""
+        counts, total, _ = self.snapshot()
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def samples(self, name, names, values):
+        counts, total, value_sum = self.snapshot()
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            yield f"{name}_bucket", _format_labels(names, values, ("le", _format_value(bound))), cumulative
+        yield f"{name}_sum", _format_labels(names, values), value_sum
+        yield f"{name}_count", _format_labels(names, values), total
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Metric:
+    """Famille de séries d'un même nom, déclinées par valeurs d'étiquettes."""
+
+    def __init__(self, name, help_text, factory, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+        self.kind = factory().kind
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values, **kwargs):
+        """Retourne la série correspondant aux valeurs d'étiquettes (créée au besoin)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} attend les étiquettes {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def __getattr__(self, attr):
+        # Métrique sans étiquette : inc/set/observe/time s'appliquent directement
+        if attr.startswith("_") or "_default" not in self.__dict__:
+            raise AttributeError(attr)
+        return getattr(self._default, attr)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            for name, labels, value in child.samples(self.name, self.labelnames, values):
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registre des métriques d'un processus, exportables au format texte Prometheus."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get(self, name, help_text, factory, labelnames):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = Metric(name, help_text, factory, labelnames)
+                    return metric
+        # Un même nom ne peut désigner qu'une seule définition (type et étiquettes)
+        kind = factory().kind
+        if metric.kind != kind or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Métrique {name} déjà enregistrée comme {metric.kind} {metric.labelnames}, "
+                             f"redéfinie comme {kind} {tuple(labelnames)}")
+        return metric
+
+    def counter(self, name, help_text="", labelnames=()):
+        return self._get(name, help_text, Counter, labelnames)
+
+    def gauge(self, name, help_text="", labelnames=()):
+        return self._get(name, help_text, Gauge, labelnames)
+
+    def histogram(self, name, help_text="", labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get(name, help_text, lambda: Histogram(buckets), labelnames)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def uptime(self):
+        return time.time() - self.started_at
+
+    def render(self):
+        """Exporte toutes les métriques au format texte Prometheus (version 0.0.4)."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Résumé lisible : valeurs des compteurs et jauges, p50/p99 des histogrammes."""
+        result = {}
+        for name, metric in sorted(self._metrics.items()):
+            for values, child in sorted(metric._children.items()):
+                key = name + _format_labels(metric.labelnames, values)
+                if metric.kind == "histogram":
+                    _, count, total = child.snapshot()
+                    result[key] = {"count": count, "sum": total,
+                                   "p50": child.quantile(0.5), "p99": child.quantile(0.99)}
+                else:
+                    result[key] = child.value
+        return result
+
+
+REGISTRY = MetricsRegistry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import time
+import heapq
+import socket
+import pstats
+import cProfile
+import itertools
+import threading
+
+
+class SlowEventReservoir:
+    """Conserve les ``size`` événements les plus lents, avec leurs temps par étape.
+
+    Un tas minimal garde le seuil d'entrée en tête : un événement plus rapide
+    que le plus lent des retenus est écarté sans prendre de verrou.
+    """
+
+    def __init__(self, size=50):
+        self.size = size
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def offer(self, duration, record):
+        heap = self._heap
+        if len(heap) >= self.size and duration <= heap[0][0]:
+            return False
+        with self._lock:
+            entry = (duration, next(self._seq), record)
+            if len(heap) < self.size:
+                heapq.heappush(heap, entry)
+            elif duration > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                return False
+        return True
+
+    def slowest(self):
+        """Événements retenus, du plus lent au plus rapide."""
+        with self._lock:
+            entries = sorted(self._heap, reverse=True)
+        return [dict(record, duration=duration) for duration, _, record in entries]
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+
+
+class ProfilerControl:
+    """Capture de profil à la demande, pour une durée fixe, sans redémarrage.
+
+    Deux modes :
+
+    - ``sampling`` : un thread échantillonne les piles de tous les threads
+      (``sys._current_frames``) et écrit un fichier de piles repliées
+      (format « folded », lisible par les outils de flamegraph) ;
+    - ``cprofile`` : les appels passés par ``call`` sont exécutés sous
+      cProfile (un profileur par thread), fusionnés en un fichier pstats.
+
+    La capture s'arrête d'elle-même après ``duration`` secondes.
+    """
+
+    def __init__(self, output_dir="logs/profiles"):
+        self.output_dir = output_dir
+        self.mode = None
+        self.path = None
+        self.started_at = None
+        self.deadline = None
+        self.last_capture = None
+        self._profiles = {}
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        return self.mode is not None
+
+    def start(self, duration=30.0, mode="sampling", interval=0.005):
+        """Démarre une capture ; retourne son état, ou lève RuntimeError si une capture est en cours."""
+        if mode not in ("sampling", "cprofile"):
+            raise ValueError(f"Mode de profilage inconnu : {mode}")
+        with self._lock:
+            if self.mode is not None:
+                raise RuntimeError("Une capture de profil est déjà en cours")
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            suffix = "folded" if mode == "sampling" else "prof"
+            self.path = os.path.join(self.output_dir, f"profile-{stamp}-{mode}.{suffix}")
+            self._profiles, self._samples = {}, {}
+            self._stop.clear()
+            self.started_at = time.time()
+            self.deadline = time.monotonic() + duration
+            self.mode = mode
+            target = self._sample_loop if mode == "sampling" else self._wait_loop
+            self._thread = threading.Thread(target=target, args=(interval,), name="ghostnet-profiler", daemon=True)
+            self._thread.start()
+        return self.status()
+
+    def stop(self):
+        """Arrête la capture en cours et attend l'écriture du fichier."""
+        thread = self._thread
+        self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        return self.last_capture
+
+    def status(self):
+        return {
+            "active": self.active,
+            "mode": self.mode,
+            "path": self.path if self.active else None,
+            "remaining": max(0.0, self.deadline - time.monotonic()) if self.active else 0.0,
+            "last_capture": self.last_capture,
+        }
+
+    def call(self, function, *args, **kwargs):
+        """Exécute ``function`` sous cProfile si une capture ``cprofile`` est active."""
+        if self.mode != "cprofile":
+            return function(*args, **kwargs)
+        ident = threading.get_ident()
+        profile = self._profiles.get(ident)
+        if profile is None:
+            profile = self._profiles.setdefault(ident, cProfile.Profile())
+        return profile.runcall(function, *args, **kwargs)
+
+    def _remaining(self):
+        return self.deadline - time.monotonic()
+
+    def _wait_loop(self, interval):
+        self._stop.wait(max(0.0, self._remaining()))
+        self._finish()
+
+    def _sample_loop(self, interval):
+        own = threading.get_ident()
+        samples = self._samples
+        while not self._stop.is_set() and self._remaining() > 0:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                samples[key] = samples.get(key, 0) + 1
+            self._stop.wait(interval)
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            mode, path = self.mode, self.path
+            # Plus aucun nouvel appel n'est profilé ; un appel en cours se termine normalement
+            self.mode = None
+            if mode == "sampling":
+                with open(path, "w", encoding="utf-8") as f:
+                    for stack, count in sorted(self._samples.items(), key=lambda item: -item[1]):
+                        f.write(f"{stack} {count}\n")
+                samples = sum(self._samples.values())
+            else:
+                profiles = [p for p in self._profiles.values() if p.getstats()]
+                if profiles:
+                    stats = pstats.Stats(profiles[0])
+                    for profile in profiles[1:]:
+                        stats.add(profile)
+                    stats.dump_stats(path)
+                else:
+                    open(path, "wb").close()
+                samples = len(profiles)
+            self.last_capture = {"mode": mode, "path": path, "started_at": self.started_at,
+                                 "duration": time.time() - self.started_at, "samples": samples}
+            self._profiles, self._samples = {}, {}
+            self._thread = None
+
+
+SLOW_EVENTS = SlowEventReservoir()
+PROFILER = ProfilerControl()
+
+# Sources de temps par règle (nom -> fonction retournant une liste), enregistrées par les pipelines
+_RULE_SOURCES = {}
+
+
+def register_rule_source(name, function):
+    """Expose dans ``report`` les temps par règle d'un détecteur (ex. ``SignatureDetector.rule_stats``)."""
+    _RULE_SOURCES[name] = function
+
+
+def report(limit=None):
+    """État de l'instrumentation : capture en cours, événements les plus lents et temps par règle."""
+    slowest = SLOW_EVENTS.slowest()
+    return {
+        "profiler": PROFILER.status(),
+        "slowest_events": slowest[:limit] if limit else slowest,
+        "rules": {name: function() for name, function in _RULE_SOURCES.items()},
+    }
+
+
+# Canal de contrôle : l'instrumentation vit dans le processus de traitement (core.py) ;
+# l'API, processus distinct, lui transmet ses commandes par ce socket Unix.
+CONTROL_SOCKET = "logs/ghostnet-control.sock"
+MAX_DURATION = 300
+
+
+def handle_command(command):
+    """Exécute une commande {"op": "report" | "start" | "stop", ...} ; retourne (code HTTP, corps)."""
+    op = command.get("op")
+    if op == "report":
+        try:
+            limit = max(1, int(command.get("limit", 20)))
+        except (TypeError, ValueError):
+            return 400, {"error": "limit doit être un entier"}
+        return 200, report(limit=limit)
+    if op == "start":
+        try:
+            duration = float(command.get("duration", 30))
+        except (TypeError, ValueError):
+            return 400, {"error": "duration doit être un nombre"}
+        if not 1 <= duration <= MAX_DURATION:
+            return 400, {"error": f"duration doit être comprise entre 1 et {MAX_DURATION} secondes"}
+        try:
+            return 202, PROFILER.start(duration=duration, mode=command.get("mode", "sampling"))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except RuntimeError as e:
+            return 409, {"error": str(e)}
+    if op == "stop":
+        return 200, {"last_capture": PROFILER.stop()}
+    return 400, {"error": f"Commande inconnue : {op}"}
+
+
+class ControlServer:
+    """Socket Unix du processus de traitement : une commande JSON par connexion, une réponse JSON.
+
+    Le socket n'est accessible qu'à l'utilisateur du processus (mode 0600).
+    """
+
+    def __init__(self, path=CONTROL_SOCKET, handler=handle_command):
+        self.path = path
+        self.handler = handler
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            # Socket laissé par un processus précédent
+            os.unlink(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        os.chmod(self.path, 0o600)
+        sock.listen(8)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, name="ghostnet-control", daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(5)
+                    with conn.makefile("rb") as f:
+                        command = json.loads(f.readline() or b"{}")
+                    status, body = self.handler(command)
+                except Exception as e:
+                    status, body = 500, {"error": str(e)}
+                try:
+                    conn.sendall(json.dumps({"status": status, "body": body}).encode("utf-8") + b"\n")
+                except OSError:
+                    pass
+
+    def stop(self):
+        if self._sock is not None:
+            try:
+                # Réveille accept() dans le thread du serveur (close seul ne suffit pas)
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+            self._thread.join()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def send_command(command, path=CONTROL_SOCKET, timeout=10.0):
+    """Transmet une commande au processus de traitement ; retourne (code HTTP, corps).
+
+    Lève OSError si aucun processus n'écoute sur ``path``.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(command).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            response = json.loads(f.readline())
+    return response["status"], response["body"]
@@ -1,30 +1,28 @@
-import logging
+import os
 import json
 
-def setup_logger(name="ghostnet", level=logging.INFO):
-    """Configure et retourne un logger."""
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('[%(asctime)s] %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    logger.setLevel(level)
-    return logger
-
 def load_config(path):
-    """Charge un fichier de configuration JSON."""
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        return {"error": str(e)}
+    """Charge la configuration depuis un fichier JSON (copie modifiable).
+
+    Le fichier n'est relu que s'il a changé depuis la dernière lecture (voir
+    config.service) ; une modification par ``save_config`` est donc vue aussitôt.
+    """
+    from config.service import get_config_service
+
+    service = get_config_service(path)
+    service.check()
+    if service.version == 0 and service.last_error:
+        return {"error": service.last_error}
+    return service.snapshot.thaw()
 
 def save_config(path, config):
     """Sauvegarde la configuration dans un fichier JSON."""
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=4)
+        # Remplacement atomique : le service de configuration ne lit jamais un fichier à moitié écrit
+        os.replace(tmp, path)
         return {"status": "ok"}
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file